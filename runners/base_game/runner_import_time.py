@@ -0,0 +1,21 @@
+import subprocess
+import sys
+import time
+
+from project_path import ABS_PATH_PROJECT
+
+NUMBER_OF_RUNS = 5
+STATEMENTS = {
+    "rules engine": "from wizard.base_game.game import Game; from wizard.base_game.player.player import RandomPlayer",
+    "DQN agent": "from wizard.rl_pipeline.agents.DQNAgent import DQNAgent",
+    "simulation storage": "from wizard.simulation.exhaustive.use_cases.simulation_result_storage import "
+    "SimulationResultStorage",
+}
+
+for label, statement in STATEMENTS.items():
+    durations = []
+    for _ in range(NUMBER_OF_RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], cwd=ABS_PATH_PROJECT, check=True)
+        durations.append(time.perf_counter() - start)
+    print(f"{label}: best of {NUMBER_OF_RUNS} fresh interpreters {min(durations) * 1000:.0f} ms")
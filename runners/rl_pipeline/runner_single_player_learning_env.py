@@ -1,9 +1,11 @@
 from config.common import NUMBER_OF_PLAYERS
 from wizard.base_game.player.player import RandomPlayer
+from wizard.base_game.random_streams import stream_generator
 from wizard.rl_pipeline.agents.DQNAgent import DQNAgent
 from wizard.rl_pipeline.env.single_player_learning_env import SinglePlayerLearningEnv
 from wizard.rl_pipeline.models.multi_step_ann import MultiStepANN, ANNSpecification
 
+SEED = 0
 
 players = [RandomPlayer(i) for i in range(NUMBER_OF_PLAYERS)]
 env = SinglePlayerLearningEnv(players=players, starting_player=players[0], learning_player=players[0])
@@ -13,10 +15,10 @@ model = MultiStepANN(
     strategy_ann_specification=ANNSpecification(hidden_layers_size=[10, 10], output_size=10),
     q_ann_specification=ANNSpecification(hidden_layers_size=[20, 20]),
 )
-agent = DQNAgent(model)
+agent = DQNAgent(model, rng=stream_generator(SEED, 0))
 results = []
 terminal = False
-state = env.reset()[0]
+state = env.reset(seed=SEED)[0]
 results.append(state)
 while not terminal:
     action = agent.select_action(state)
@@ -0,0 +1,9 @@
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG
+from wizard.simulation.exhaustive.use_cases.strategy_index import (
+    StrategyIndex,
+    StrategyTableStorage,
+)
+
+# Workers using StatisticalPlayer then memory-map this table instead of reading the surveyed results
+strategy_table_path = StrategyTableStorage().save(StrategyIndex(DEFAULT_GAME_CONFIG).compile())
+print(f"Strategy table written to {strategy_table_path}")
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from config.common import BASE_COLORS, NUMBER_OF_CARDS_PER_PLAYER, NUMBER_OF_PLAYERS
+from wizard.base_game.batch_game import BatchGame, CardPlayPolicyNotVectorized
+from wizard.base_game.count_points import CountPoints
+from wizard.base_game.deck import Deck
+from wizard.base_game.game import Game
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG, GameConfig
+from wizard.base_game.player.card_play_policy import (
+    DefinedCardPlayPolicy,
+    HighestCardPlayPolicy,
+    LowestCardPlayPolicy,
+)
+from wizard.base_game.player.player import Player
+from wizard.base_game.player.prediction_policy import RandomPredictionPolicy
+
+NUMBER_OF_GAMES = 200
+
+
+class TestBatchGame:
+    @pytest.mark.parametrize(
+        "card_play_policies",
+        [
+            pytest.param([HighestCardPlayPolicy] * NUMBER_OF_PLAYERS, id="highest"),
+            pytest.param([LowestCardPlayPolicy] * NUMBER_OF_PLAYERS, id="lowest"),
+            pytest.param([HighestCardPlayPolicy, LowestCardPlayPolicy] * NUMBER_OF_PLAYERS, id="mixed"),
+        ],
+    )
+    @pytest.mark.parametrize(
+        "config",
+        [
+            pytest.param(DEFAULT_GAME_CONFIG, id="default_config"),
+            pytest.param(
+                GameConfig(number_of_players=4, number_of_cards_per_player=5, trump_color=BASE_COLORS[2]),
+                id="other_config",
+            ),
+        ],
+    )
+    def test_results_match_game_for_same_decks(self, card_play_policies, config):
+        card_play_policies = (card_play_policies * config.number_of_players)[: config.number_of_players]
+        decks = [Deck() for _ in range(NUMBER_OF_GAMES)]
+        starting_players = np.arange(NUMBER_OF_GAMES) % config.number_of_players
+
+        batch_game = BatchGame(number_of_games=NUMBER_OF_GAMES, card_play_policies=card_play_policies, config=config)
+        batch_game.initialize_from_decks(decks=decks, starting_players=starting_players)
+
+        expected_predictions, expected_turns_won, expected_scores = [], [], []
+        for deck, starting_player in zip(decks, starting_players):
+            players = [
+                Player(identifier=i, prediction_policy=RandomPredictionPolicy, card_play_policy=card_play_policy)
+                for i, card_play_policy in enumerate(card_play_policies)
+            ]
+            game = Game(config=config)
+            game.initialize_game(
+                deck=deck, players=players, starting_player=players[starting_player], deterministic=True
+            )
+            game.request_predictions()
+            game.play_game()
+            expected_predictions.append([game.state.predictions[player] for player in players])
+            expected_turns_won.append([game.state.number_of_turns_won[player] for player in players])
+            scores = CountPoints().execute(game.state.predictions, game.state.number_of_turns_won)
+            expected_scores.append([scores[player.identifier] for player in players])
+
+        batch_game.set_predictions(np.array(expected_predictions))
+        batch_game.play_game()
+
+        np.testing.assert_array_equal(batch_game.number_of_turns_won, expected_turns_won)
+        np.testing.assert_array_equal(batch_game.scores(), expected_scores)
+
+    def test_random_deal_and_play_respect_rules(self):
+        batch_game = BatchGame(
+            number_of_games=NUMBER_OF_GAMES,
+            card_play_policies=[HighestCardPlayPolicy] * NUMBER_OF_PLAYERS,
+            rng=np.random.default_rng(0),
+        )
+        batch_game.deal()
+        batch_game.request_random_predictions()
+        batch_game.play_game()
+
+        assert (batch_game.number_of_turns_won.sum(axis=1) == NUMBER_OF_CARDS_PER_PLAYER).all()
+        assert not batch_game.cards_in_hand.any()
+        assert ((batch_game.predictions >= 0) & (batch_game.predictions <= NUMBER_OF_CARDS_PER_PLAYER)).all()
+        last_predictions = batch_game.predictions[
+            np.arange(NUMBER_OF_GAMES), (batch_game.initial_starting_players - 1) % NUMBER_OF_PLAYERS
+        ]
+        forbidden_predictions = NUMBER_OF_CARDS_PER_PLAYER - (batch_game.predictions.sum(axis=1) - last_predictions)
+        assert (last_predictions[forbidden_predictions > 0] != forbidden_predictions[forbidden_predictions > 0]).all()
+
+    def test_not_vectorized_policy_raises(self):
+        with pytest.raises(CardPlayPolicyNotVectorized):
+            BatchGame(number_of_games=1, card_play_policies=[DefinedCardPlayPolicy] * NUMBER_OF_PLAYERS)
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from config.common import BASE_COLORS, JESTER_NAME, MAGICIAN_NAME
+from wizard.base_game.bitboard import (
+    FULL_DECK_MASK,
+    CardNotInMask,
+    add_card_to_mask,
+    cards_to_mask,
+    mask_to_card_ids,
+    merge_masks,
+    number_of_cards,
+    playable_mask,
+    remove_card_from_mask,
+)
+from wizard.base_game.card import Card
+from wizard.base_game.card_id import COLOR_INDEX, NO_COLOR_INDEX
+from wizard.base_game.deck import Deck
+from wizard.base_game.game import Game
+from wizard.base_game.game_config import GameConfig
+from wizard.base_game.player.player import RandomPlayer
+
+
+class TestBitboard:
+    def test_mask_holds_duplicated_special_cards(self):
+        magician_id = Card(special_card=MAGICIAN_NAME).id
+        mask = cards_to_mask([magician_id, magician_id])
+        assert number_of_cards(mask) == 2
+        assert mask_to_card_ids(remove_card_from_mask(mask, magician_id)) == [magician_id]
+
+    def test_remove_card_not_in_mask_raises(self):
+        with pytest.raises(CardNotInMask):
+            remove_card_from_mask(0, Card(special_card=JESTER_NAME).id)
+
+    def test_full_deck_mask_contains_every_card(self):
+        deck = Deck(shuffle=False)
+        deck_mask = cards_to_mask(card.id for card in deck.cards)
+        assert deck_mask == FULL_DECK_MASK
+        assert sorted(mask_to_card_ids(deck_mask)) == sorted(card.id for card in deck.cards)
+
+    def test_playable_mask_follows_lead_color(self):
+        jester = Card(special_card=JESTER_NAME)
+        lead_card = Card(number=3, color=BASE_COLORS[1])
+        other_card = Card(number=12, color=BASE_COLORS[2])
+        hand_mask = cards_to_mask([jester.id, lead_card.id, other_card.id])
+
+        assert playable_mask(hand_mask, NO_COLOR_INDEX) == hand_mask
+        assert playable_mask(hand_mask, COLOR_INDEX[BASE_COLORS[1]]) == cards_to_mask([jester.id, lead_card.id])
+        assert playable_mask(hand_mask, COLOR_INDEX[BASE_COLORS[3]]) == hand_mask
+        other_card_mask = add_card_to_mask(0, other_card.id)
+        assert playable_mask(other_card_mask, COLOR_INDEX[BASE_COLORS[1]]) == other_card_mask
+
+    def test_merged_mask_counts_special_cards_held_by_both(self):
+        jester_id = Card(special_card=JESTER_NAME).id
+        colored_card_id = Card(number=5, color=BASE_COLORS[0]).id
+        mask = cards_to_mask([jester_id, colored_card_id])
+
+        assert merge_masks(mask, cards_to_mask([jester_id])) == cards_to_mask([jester_id, jester_id, colored_card_id])
+        assert merge_masks(mask, mask) == cards_to_mask([jester_id, jester_id, colored_card_id])
+
+    @pytest.mark.parametrize("seed", [pytest.param(seed, id=f"seed_{seed}") for seed in range(5)])
+    def test_deck_and_remaining_masks_follow_dealing(self, seed: int):
+        config = GameConfig(number_of_players=4, number_of_cards_per_player=6)
+        players = [RandomPlayer(identifier=i, rng=np.random.default_rng(i)) for i in range(config.number_of_players)]
+        deck = Deck(rng=np.random.default_rng(seed))
+        game = Game(rng=np.random.default_rng(seed), config=config)
+        game.initialize_game(deck=deck, players=players)
+
+        assert deck.mask == cards_to_mask(card.id for card in deck.cards)
+        assert game.remaining_cards_mask == cards_to_mask(card.id for player in players for card in player.cards)
+        assert merge_masks(deck.mask, game.remaining_cards_mask) == FULL_DECK_MASK ^ cards_to_mask(
+            [game.definition.trump_card_removed.id]
+        )
+
+    def test_deck_mask_follows_removal_and_filtering(self):
+        deck = Deck(rng=np.random.default_rng(0))
+        jester = Card(special_card=JESTER_NAME)
+        removed_cards = [jester, jester, Card(number=1, color=BASE_COLORS[0])]
+        deck.remove_cards(removed_cards)
+
+        assert deck.mask == cards_to_mask(card.id for card in deck.cards)
+        assert deck.mask == FULL_DECK_MASK ^ cards_to_mask(card.id for card in removed_cards)
+        filtered_cards = deck.filtered_cards([BASE_COLORS[0]], keep_joker_duplicates=False)
+        assert filtered_cards.count(Card(special_card=MAGICIAN_NAME)) == 1
+        assert jester not in filtered_cards
+        assert [card for card in filtered_cards if card.color] == [
+            card for card in deck.cards if card.color == BASE_COLORS[0]
+        ]
@@ -1,3 +1,5 @@
+import pytest
+
 from config.common import BASE_COLORS, JESTER_NAME, MAGICIAN_NAME, TRUMP_COLOR
 from wizard.base_game.card import Card
 
@@ -22,3 +24,9 @@ class TestCard:
         assert Card.from_representation(Card(number=13, color=BASE_COLORS[1]).representation) == Card(
             number=13, color=BASE_COLORS[1]
         )
+
+    def test_cards_are_interned_and_immutable(self):
+        assert Card(number=13, color=TRUMP_COLOR) is Card.from_representation(f"13 {TRUMP_COLOR}")
+        assert Card(special_card=JESTER_NAME) is Card.from_id(Card(special_card=JESTER_NAME).id)
+        with pytest.raises(AttributeError):
+            Card(number=13, color=TRUMP_COLOR).number = 12
@@ -0,0 +1,51 @@
+import pytest
+
+from config.common import BASE_COLORS, JESTER_NAME, MAGICIAN_NAME, TRUMP_COLOR
+from wizard.base_game.card import Card
+from wizard.base_game.card_id import trick_winner_position
+
+
+class TestCardId:
+    def test_from_id_is_inverse_of_id(self):
+        for identifier in range(54):
+            assert Card.from_id(identifier).id == identifier
+
+    @pytest.mark.parametrize(
+        "cards, expected_winner_position",
+        [
+            pytest.param(
+                [Card(special_card=JESTER_NAME), Card(special_card=JESTER_NAME)],
+                0,
+                id="only_jesters",
+            ),
+            pytest.param(
+                [
+                    Card(number=13, color=BASE_COLORS[1]),
+                    Card(special_card=MAGICIAN_NAME),
+                    Card(special_card=MAGICIAN_NAME),
+                ],
+                1,
+                id="first_magician",
+            ),
+            pytest.param(
+                [
+                    Card(special_card=JESTER_NAME),
+                    Card(number=2, color=BASE_COLORS[2]),
+                    Card(number=9, color=BASE_COLORS[1]),
+                ],
+                1,
+                id="lead_color_after_jester",
+            ),
+            pytest.param(
+                [
+                    Card(number=13, color=BASE_COLORS[1]),
+                    Card(number=1, color=TRUMP_COLOR),
+                    Card(number=2, color=TRUMP_COLOR),
+                ],
+                2,
+                id="highest_trump",
+            ),
+        ],
+    )
+    def test_trick_winner_position_is_correct(self, cards: list[Card], expected_winner_position: int):
+        assert trick_winner_position([card.id for card in cards]) == expected_winner_position
@@ -0,0 +1,48 @@
+from config.common import NUMBER_OF_CARDS_PER_PLAYER, NUMBER_OF_PLAYERS
+from wizard.base_game.deck import Deck
+from wizard.base_game.game import Game
+from wizard.base_game.player.player import MaxRandomPlayer
+
+
+class TestGame:
+    @staticmethod
+    def _initialize_game() -> Game:
+        players = [MaxRandomPlayer(identifier=i) for i in range(NUMBER_OF_PLAYERS)]
+        game = Game()
+        game.initialize_game(deck=Deck(), players=players, starting_player=players[0])
+        game.request_predictions()
+        return game
+
+    @staticmethod
+    def _played_cards(game: Game) -> list[list[str]]:
+        return [
+            [played_card.card.representation for played_card in turn_history]
+            for turn_history in game.state.previous_turns_history
+        ]
+
+    def test_restore_brings_back_state_and_hands_of_snapshot(self):
+        game = self._initialize_game()
+        game.get_to_next_play_afterstate_for_given_player(game.next_player_playing)
+        hands = {player: player.cards.copy() for player in game.definition.players}
+        turn_history = game.state.round_specifics.turn_history.copy()
+        snapshot = game.snapshot()
+
+        game.play_game()
+        assert all(not player.cards for player in game.definition.players)
+
+        game.restore(snapshot)
+        assert {player: player.cards for player in game.definition.players} == hands
+        assert game.state.round_specifics.turn_history == turn_history
+        assert sum(game.state.number_of_turns_won.values()) == len(game.state.previous_turns_history)
+
+    def test_snapshot_can_be_restored_several_times(self):
+        game = self._initialize_game()
+        snapshot = game.snapshot()
+
+        game.play_game()
+        first_outcome = (self._played_cards(game), game.state.number_of_turns_won.copy())
+        for _ in range(2):
+            game.restore(snapshot)
+            game.play_game()
+            assert (self._played_cards(game), game.state.number_of_turns_won) == first_outcome
+        assert len(game.state.previous_turns_history) == NUMBER_OF_CARDS_PER_PLAYER
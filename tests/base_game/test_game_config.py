@@ -0,0 +1,38 @@
+import pytest
+
+from config.common import BASE_COLORS
+from wizard.base_game.deck import Deck
+from wizard.base_game.game import Game
+from wizard.base_game.game_config import GameConfig, InvalidGameConfig
+from wizard.base_game.player.player import RandomPlayer
+
+
+class TestGameConfig:
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            pytest.param({"trump_color": "PURPLE"}, id="unknown_trump_color"),
+            pytest.param({"number_of_players": 0}, id="no_player"),
+            pytest.param({"number_of_players": 6, "number_of_cards_per_player": 10}, id="not_enough_cards"),
+        ],
+    )
+    def test_invalid_config_raises(self, kwargs: dict):
+        with pytest.raises(InvalidGameConfig):
+            GameConfig(**kwargs)
+
+    def test_games_with_different_configs_run_side_by_side(self):
+        configs = [
+            GameConfig(number_of_players=3, number_of_cards_per_player=2),
+            GameConfig(number_of_players=5, number_of_cards_per_player=7, trump_color=BASE_COLORS[3]),
+        ]
+        for config in configs:
+            players = [RandomPlayer(identifier=i) for i in range(config.number_of_players)]
+            game = Game(config=config)
+            game.initialize_game(deck=Deck(), players=players)
+            assert game.definition.trump_card_removed.color == config.trump_color
+            assert all(len(player.cards) == config.number_of_cards_per_player for player in players)
+
+            game.request_predictions()
+            game.play_game()
+            assert len(game.state.previous_turns_history) == config.number_of_cards_per_player
+            assert sum(game.state.number_of_turns_won.values()) == config.number_of_cards_per_player
@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+from project_path import ABS_PATH_PROJECT
+
+HEAVY_MODULES = ["torch", "pandas", "gymnasium", "wizard.simulation.exhaustive.use_cases.simulation_result_storage"]
+
+
+def _modules_loaded_after_import(statement: str) -> list[str]:
+    output = subprocess.run(
+        [sys.executable, "-c", f"import sys\n{statement}\nprint(*sorted(sys.modules), sep=',')"],
+        cwd=ABS_PATH_PROJECT,
+        env={**os.environ, "PYTHONPATH": ABS_PATH_PROJECT},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return output.strip().split(",")
+
+
+class TestLazyImports:
+    def test_rules_engine_does_not_load_heavy_backends(self):
+        loaded_modules = _modules_loaded_after_import(
+            "from wizard.base_game.game import Game\nfrom wizard.base_game.player.player import RandomPlayer"
+        )
+        assert [module for module in HEAVY_MODULES if module in loaded_modules] == []
@@ -0,0 +1,39 @@
+import numpy as np
+
+from config.common import NUMBER_OF_PLAYERS
+from wizard.base_game.deck import Deck
+from wizard.base_game.game import Game
+from wizard.base_game.player.player import RandomPlayer
+from wizard.base_game.random_streams import spawn_generators, stream_generator
+
+SEED = 42
+
+
+def _play_seeded_game(rng: np.random.Generator) -> tuple:
+    players = [RandomPlayer(identifier=i, rng=rng) for i in range(NUMBER_OF_PLAYERS)]
+    game = Game(rng=rng)
+    game.initialize_game(deck=Deck(rng=rng), players=players)
+    game.request_predictions()
+    game.play_game()
+    return (
+        game.definition.trump_card_removed,
+        game.definition.initial_starting_player.identifier,
+        tuple(game.state.predictions[player] for player in players),
+        tuple(tuple(played_card.card for played_card in turn) for turn in game.state.previous_turns_history),
+    )
+
+
+class TestRandomStreams:
+    def test_stream_generator_matches_spawned_generators(self):
+        spawned_draws = [rng.integers(1_000_000, size=5).tolist() for rng in spawn_generators(SEED, 4)]
+        stream_draws = [stream_generator(SEED, index).integers(1_000_000, size=5).tolist() for index in range(4)]
+        assert stream_draws == spawned_draws
+
+    def test_streams_are_independent_of_consumption_order(self):
+        in_order = [_play_seeded_game(stream_generator(SEED, index)) for index in range(6)]
+        reversed_order = [_play_seeded_game(stream_generator(SEED, index)) for index in reversed(range(6))]
+        assert in_order == reversed_order[::-1]
+
+    def test_different_streams_give_different_games(self):
+        games = {_play_seeded_game(stream_generator(SEED, index)) for index in range(20)}
+        assert len(games) > 1
@@ -0,0 +1,28 @@
+from typing import Callable
+
+import numpy as np
+import pytest
+
+from wizard.base_game.deck import Deck
+from wizard.base_game.game import Game
+from wizard.base_game.game_config import GameConfig
+from wizard.base_game.player.player import RandomPlayer
+
+
+@pytest.fixture
+def mid_deal_game() -> Callable[[GameConfig, int, int], Game]:
+    """Game of random players seeded by seed, once number_of_cards_played cards of the deal are played"""
+
+    def _mid_deal_game(config: GameConfig, seed: int, number_of_cards_played: int) -> Game:
+        players = [
+            RandomPlayer(identifier=i, rng=np.random.default_rng(10 * seed + i))
+            for i in range(config.number_of_players)
+        ]
+        game = Game(rng=np.random.default_rng(seed), config=config)
+        game.initialize_game(deck=Deck(rng=np.random.default_rng(seed)), players=players)
+        game.request_predictions()
+        for _ in range(number_of_cards_played):
+            game.play_next_card()
+        return game
+
+    return _mid_deal_game
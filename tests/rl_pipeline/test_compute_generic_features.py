@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from wizard.base_game.deck import Deck
+from wizard.base_game.game import Game
+from wizard.base_game.game_config import GameConfig
+from wizard.base_game.player.player import RandomPlayer
+from wizard.rl_pipeline.env.single_player_learning_env import SinglePlayerLearningEnv
+from wizard.rl_pipeline.features.compute_generic_features import ComputeGenericFeatures
+from wizard.rl_pipeline.features.used_features import (
+    NUMBER_OF_SEATS_WITH_PREDICTION_FEATURE,
+    UnsupportedNumberOfPlayers,
+    prediction_feature_name,
+)
+
+
+def _game_with_predictions(config: GameConfig) -> Game:
+    players = [RandomPlayer(identifier=i, rng=np.random.default_rng(i)) for i in range(config.number_of_players)]
+    game = Game(rng=np.random.default_rng(0), config=config)
+    game.initialize_game(deck=Deck(rng=np.random.default_rng(0)), players=players)
+    for seat, player in enumerate(game.initial_ordered_list_players):
+        game.set_prediction_for_given_player(player, prediction=seat)
+    return game
+
+
+class TestComputeGenericFeatures:
+    def test_prediction_features_follow_the_seats(self):
+        game = _game_with_predictions(GameConfig(number_of_players=NUMBER_OF_SEATS_WITH_PREDICTION_FEATURE))
+
+        objective_context = ComputeGenericFeatures(game, game.definition.players[0]).execute().generic_objective_context
+
+        assert [
+            getattr(objective_context, prediction_feature_name(seat))
+            for seat in range(NUMBER_OF_SEATS_WITH_PREDICTION_FEATURE)
+        ] == list(range(NUMBER_OF_SEATS_WITH_PREDICTION_FEATURE))
+
+    @pytest.mark.parametrize(
+        "number_of_players",
+        [
+            pytest.param(NUMBER_OF_SEATS_WITH_PREDICTION_FEATURE - 1, id="fewer_players"),
+            pytest.param(NUMBER_OF_SEATS_WITH_PREDICTION_FEATURE + 1, id="more_players"),
+        ],
+    )
+    def test_unsupported_number_of_players_is_rejected(self, number_of_players: int):
+        config = GameConfig(number_of_players=number_of_players, number_of_cards_per_player=3)
+        game = _game_with_predictions(config)
+
+        with pytest.raises(UnsupportedNumberOfPlayers):
+            ComputeGenericFeatures(game, game.definition.players[0])
+        with pytest.raises(UnsupportedNumberOfPlayers):
+            SinglePlayerLearningEnv(game.definition.players, game.definition.players[0], config=config)
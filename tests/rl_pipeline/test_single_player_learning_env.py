@@ -0,0 +1,27 @@
+from config.common import NUMBER_OF_PLAYERS
+from wizard.base_game.player.player import RandomPlayer
+from wizard.rl_pipeline.env.single_player_learning_env import SinglePlayerLearningEnv
+
+SEED = 7
+
+
+def _env() -> SinglePlayerLearningEnv:
+    players = [RandomPlayer(identifier=i) for i in range(NUMBER_OF_PLAYERS)]
+    return SinglePlayerLearningEnv(players=players, learning_player=players[-1], starting_player=players[0])
+
+
+class TestSinglePlayerLearningEnv:
+    def test_reset_with_seed_seeds_every_player(self):
+        first_env, second_env = _env(), _env()
+
+        assert first_env.reset(seed=SEED)[0] == second_env.reset(seed=SEED)[0]
+        first_draws = [player.rng.integers(1_000_000) for player in first_env._players]
+        assert [player.rng.integers(1_000_000) for player in second_env._players] == first_draws
+        assert len(set(first_draws)) == len(first_draws)
+
+    def test_consecutive_resets_draw_new_player_streams(self):
+        env = _env()
+        env.reset(seed=SEED)
+        first_draws = [player.rng.integers(1_000_000) for player in env._players]
+        env.reset()
+        assert [player.rng.integers(1_000_000) for player in env._players] != first_draws
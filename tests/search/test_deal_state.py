@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from config.common import BASE_COLORS
+from wizard.base_game.bitboard import COLOR_MASKS, cards_to_mask
+from wizard.base_game.card import Card
+from wizard.base_game.game_config import GameConfig
+from wizard.search.deal_state import DealState, InformationSet
+
+CONFIG = GameConfig(number_of_players=4, number_of_cards_per_player=5)
+
+
+class TestDealState:
+    @pytest.mark.parametrize("seed", [pytest.param(seed, id=f"seed_{seed}") for seed in range(20)])
+    def test_plays_like_game_and_undoes_back(self, mid_deal_game, seed: int):
+        game = mid_deal_game(CONFIG, seed, number_of_cards_played=seed % 9)
+        deal_state = DealState.from_game(game)
+        initial_deal_state = deal_state.copy()
+        rng = np.random.default_rng(seed)
+
+        number_of_cards_played = 0
+        while not deal_state.is_terminal:
+            player = game.next_player_playing
+            legal_card_ids = deal_state.legal_card_ids()
+            assert sorted(legal_card_ids) == sorted(
+                {card.id for card in player.card_play_policy(player).playable_cards()}
+            )
+            card_id = legal_card_ids[rng.integers(len(legal_card_ids))]
+            game.play_next_card(Card.from_id(card_id))
+            deal_state.play(card_id)
+            number_of_cards_played += 1
+        assert deal_state.tricks_won == [game.state.number_of_turns_won[player] for player in game.definition.players]
+
+        for _ in range(number_of_cards_played):
+            deal_state.undo()
+        assert deal_state.hand_masks == initial_deal_state.hand_masks
+        assert (deal_state.leader, deal_state.trick_card_ids, deal_state.tricks_won) == (
+            initial_deal_state.leader,
+            initial_deal_state.trick_card_ids,
+            initial_deal_state.tricks_won,
+        )
+
+
+class TestInformationSet:
+    def test_determinizations_deal_unseen_cards_only(self, mid_deal_game):
+        game = mid_deal_game(CONFIG, seed=0, number_of_cards_played=6)
+        observer = game.next_player_playing
+        information_set = InformationSet.from_game(game, observer)
+        played_card_ids = [
+            played_card.card.id
+            for turn in game.state.previous_turns_history + [game.state.round_specifics.turn_history]
+            for played_card in turn
+        ]
+        seen_mask = cards_to_mask(
+            played_card_ids + [game.definition.trump_card_removed.id] + [card.id for card in observer.cards]
+        )
+        rng = np.random.default_rng(0)
+
+        for _ in range(100):
+            deal_state = information_set.determinize(rng)
+            assert [hand_mask.bit_count() for hand_mask in deal_state.hand_masks] == [
+                len(player.cards) for player in game.definition.players
+            ]
+            assert deal_state.hand_masks[information_set.observer] == observer.hand_mask
+            other_hand_masks = [
+                hand_mask for seat, hand_mask in enumerate(deal_state.hand_masks) if seat != information_set.observer
+            ]
+            assert not any(hand_mask & seen_mask for hand_mask in other_hand_masks)
+            union_mask = 0
+            for hand_mask in other_hand_masks:
+                assert not hand_mask & union_mask
+                union_mask |= hand_mask
+
+    def test_determinizations_respect_colors_known_to_not_be_in_hand(self, mid_deal_game):
+        game = mid_deal_game(CONFIG, seed=1, number_of_cards_played=1)
+        observer = game.next_player_playing
+        constrained_player = next(player for player in game.definition.players if player is not observer)
+        constrained_player.colors_known_to_not_be_in_hand = BASE_COLORS[:3]
+        information_set = InformationSet.from_game(game, observer)
+        forbidden_mask = COLOR_MASKS[0] | COLOR_MASKS[1] | COLOR_MASKS[2]
+        rng = np.random.default_rng(0)
+
+        for _ in range(100):
+            deal_state = information_set.determinize(rng)
+            assert not deal_state.hand_masks[game.definition.players.index(constrained_player)] & forbidden_mask
@@ -0,0 +1,68 @@
+from typing import Callable
+
+import pytest
+
+from wizard.base_game.count_points import CountPoints
+from wizard.base_game.game_config import GameConfig
+from wizard.search.deal_state import DealState
+from wizard.search.double_dummy import DoubleDummySolver
+
+CONFIG = GameConfig(number_of_players=3, number_of_cards_per_player=4)
+
+
+def _minimax(deal_state: DealState, seat: int, value_of_tricks_won: Callable[[int], int]) -> int:
+    if deal_state.is_terminal:
+        return value_of_tricks_won(deal_state.tricks_won[seat])
+    values = []
+    for card_id in deal_state.legal_card_ids():
+        deal_state.play(card_id)
+        values.append(_minimax(deal_state, seat, value_of_tricks_won))
+        deal_state.undo()
+    return max(values) if deal_state.next_player == seat else min(values)
+
+
+class TestDoubleDummySolver:
+    @pytest.mark.parametrize("seed", [pytest.param(seed, id=f"seed_{seed}") for seed in range(10)])
+    def test_values_are_those_of_plain_minimax(self, mid_deal_game, seed: int):
+        game = mid_deal_game(CONFIG, seed, number_of_cards_played=seed % 5)
+        deal_state = DealState.from_game(game)
+        solver = DoubleDummySolver.from_game(game)
+
+        for seat, prediction in enumerate(deal_state.predictions):
+            assert solver.forced_tricks(seat) == _minimax(deal_state, seat, lambda tricks_won: tricks_won)
+            assert solver.forced_score(seat) == _minimax(
+                deal_state,
+                seat,
+                lambda tricks_won: CountPoints.count_points_single_prediction(prediction, tricks_won),
+            )
+
+    def test_seats_cannot_force_more_tricks_than_there_are(self, mid_deal_game):
+        config = GameConfig(number_of_players=4, number_of_cards_per_player=5)
+        for seed in range(5):
+            forced_tricks = DoubleDummySolver.from_game(mid_deal_game(config, seed, 3)).forced_tricks_by_seat()
+            assert sum(forced_tricks) <= config.number_of_cards_per_player
+
+    def test_values_of_a_finished_deal_are_its_results(self, mid_deal_game):
+        game = mid_deal_game(
+            CONFIG, seed=0, number_of_cards_played=CONFIG.number_of_players * CONFIG.number_of_cards_per_player
+        )
+        solver = DoubleDummySolver.from_game(game)
+
+        for seat, player in enumerate(game.definition.players):
+            assert solver.forced_tricks(seat) == game.state.number_of_turns_won[player]
+            assert solver.forced_score(seat) == CountPoints.count_points_single_prediction(
+                game.state.predictions[player], game.state.number_of_turns_won[player]
+            )
+
+    def test_solving_leaves_the_deal_state_as_given(self, mid_deal_game):
+        deal_state = DealState.from_game(mid_deal_game(CONFIG, seed=0, number_of_cards_played=2))
+        initial_deal_state = deal_state.copy()
+
+        DoubleDummySolver(deal_state).forced_tricks_by_seat()
+
+        assert (deal_state.hand_masks, deal_state.leader, deal_state.trick_card_ids, deal_state.tricks_won) == (
+            initial_deal_state.hand_masks,
+            initial_deal_state.leader,
+            initial_deal_state.trick_card_ids,
+            initial_deal_state.tricks_won,
+        )
@@ -0,0 +1,106 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from config.common import BASE_COLORS
+from wizard.base_game.bitboard import COLOR_MASKS
+from wizard.base_game.game import Game
+from wizard.base_game.game_config import GameConfig
+from wizard.base_game.played_card import PlayedCard
+from wizard.search.hidden_hand_sampler import HiddenHandSampler, NoConsistentDeal
+
+CONFIG = GameConfig(number_of_players=4, number_of_cards_per_player=5)
+NUMBER_OF_DEALS = 1000
+NUMBER_OF_UNIFORMITY_DEALS = 30_000
+
+
+def _played_cards(game: Game) -> List[PlayedCard]:
+    return [
+        played_card
+        for turn in game.state.previous_turns_history + [game.state.round_specifics.turn_history]
+        for played_card in turn
+    ]
+
+
+class TestHiddenHandSampler:
+    def test_deals_are_drawn_among_unseen_cards_in_one_call(self, mid_deal_game):
+        game = mid_deal_game(CONFIG, seed=0, number_of_cards_played=6)
+        observer = game.next_player_playing
+        sampler = HiddenHandSampler.from_game(game, observer)
+
+        deals = sampler.sample(np.random.default_rng(0), NUMBER_OF_DEALS)
+        hand_masks = sampler.hand_masks(deals).tolist()
+
+        assert deals.shape == (
+            NUMBER_OF_DEALS,
+            sum(len(player.cards) for player in game.definition.players) - len(observer.cards),
+        )
+        for deal, deal_hand_masks in zip(deals, hand_masks):
+            assert len(set(deal.tolist())) == len(deal)
+            assert all((sampler.unseen_mask >> int(slot)) & 1 for slot in deal)
+            assert [hand_mask.bit_count() for hand_mask in deal_hand_masks] == [
+                0 if player is observer else len(player.cards) for player in game.definition.players
+            ]
+
+    def test_deals_respect_colors_known_to_not_be_in_hand(self, mid_deal_game):
+        game = mid_deal_game(CONFIG, seed=1, number_of_cards_played=1)
+        observer = game.next_player_playing
+        constrained_seat = next(seat for seat, player in enumerate(game.definition.players) if player is not observer)
+        game.definition.players[constrained_seat].colors_known_to_not_be_in_hand = BASE_COLORS[:3]
+        sampler = HiddenHandSampler.from_game(game, observer)
+
+        hand_masks = sampler.hand_masks(sampler.sample(np.random.default_rng(0), NUMBER_OF_DEALS))
+
+        assert not any(
+            int(hand_mask) & (COLOR_MASKS[0] | COLOR_MASKS[1] | COLOR_MASKS[2])
+            for hand_mask in hand_masks[:, constrained_seat]
+        )
+
+    @pytest.mark.parametrize("seed", [pytest.param(seed, id=f"seed_{seed}") for seed in range(5)])
+    def test_following_the_deal_is_building_the_sampler_again(self, mid_deal_game, seed: int):
+        game = mid_deal_game(CONFIG, seed, number_of_cards_played=1)
+        observer = game.definition.players[0]
+        sampler = HiddenHandSampler.from_game(game, observer)
+        players = game.definition.players
+
+        for _ in range(3 * seed + 5):
+            game.play_next_card()
+        for played_card in _played_cards(game)[1:]:
+            sampler.card_played(players.index(played_card.player), played_card.card.id)
+
+        rebuilt_sampler = HiddenHandSampler.from_game(game, observer)
+        assert sampler.unseen_mask == rebuilt_sampler.unseen_mask
+        assert sampler.hand_sizes == rebuilt_sampler.hand_sizes
+        assert sampler.void_color_indexes == rebuilt_sampler.void_color_indexes
+
+    def test_deals_are_uniform_among_consistent_deals(self):
+        # One unseen card of each of the colors 0, 1 and 2, seat 1 being out of color 0 and seat 2 out of color 2:
+        # the three consistent deals are equally likely
+        slots = [COLOR_MASKS[color_index] & -COLOR_MASKS[color_index] for color_index in range(3)]
+        sampler = HiddenHandSampler(
+            observer=0,
+            hand_sizes=[0, 1, 1],
+            unseen_mask=sum(slots),
+            void_color_indexes=[[], [0], [2]],
+            trick_card_ids=[],
+        )
+        deals = sampler.sample(np.random.default_rng(0), NUMBER_OF_UNIFORMITY_DEALS)
+
+        consistent_deals = [[slots[1], slots[0]], [slots[2], slots[0]], [slots[2], slots[1]]]
+        frequencies = [
+            np.all(deals == [slot.bit_length() - 1 for slot in deal], axis=1).mean() for deal in consistent_deals
+        ]
+        assert sum(frequencies) == pytest.approx(1)
+        np.testing.assert_allclose(frequencies, 1 / 3, atol=0.01)
+
+    def test_impossible_constraints_raise(self):
+        sampler = HiddenHandSampler(
+            observer=0,
+            hand_sizes=[1, 1],
+            unseen_mask=COLOR_MASKS[0] | COLOR_MASKS[1],
+            void_color_indexes=[[], [0, 1]],
+            trick_card_ids=[],
+        )
+        with pytest.raises(NoConsistentDeal):
+            sampler.sample(np.random.default_rng(0), 1)
@@ -0,0 +1,59 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from wizard.base_game.deck import Deck
+from wizard.base_game.game import Game
+from wizard.base_game.game_config import GameConfig
+from wizard.base_game.player.card_play_policy import ISMCTSCardPlayPolicy
+from wizard.base_game.player.player import Player, RandomPlayer
+from wizard.base_game.player.prediction_policy import RandomPredictionPolicy
+from wizard.search.ismcts import InformationSetMCTS, SearchBudgetMissing, player_search
+
+CONFIG = GameConfig(number_of_players=2, number_of_cards_per_player=3)
+NUMBER_OF_ITERATIONS = 300
+
+
+def _game_with_searching_player(seed: int) -> Game:
+    players = [
+        RandomPlayer(identifier=i, rng=np.random.default_rng(10 * seed + i)) for i in range(CONFIG.number_of_players)
+    ]
+    players[0] = Player(
+        identifier=0,
+        prediction_policy=RandomPredictionPolicy,
+        card_play_policy=partial(ISMCTSCardPlayPolicy, time_budget=None, number_of_iterations=NUMBER_OF_ITERATIONS),
+        rng=np.random.default_rng(seed),
+    )
+    game = Game(rng=np.random.default_rng(seed), config=CONFIG)
+    game.initialize_game(deck=Deck(rng=np.random.default_rng(seed)), players=players, starting_player=players[0])
+    game.request_predictions()
+    return game
+
+
+class TestISMCTSCardPlayPolicy:
+    @pytest.mark.parametrize("seed", [pytest.param(seed, id=f"seed_{seed}") for seed in range(3)])
+    def test_plays_legal_cards_until_the_end_of_the_deal(self, seed: int):
+        game = _game_with_searching_player(seed)
+        game.play_game()
+        assert sum(game.state.number_of_turns_won.values()) == CONFIG.number_of_cards_per_player
+
+    def test_tree_is_reused_between_moves_of_the_deal(self):
+        game = _game_with_searching_player(seed=0)
+        searching_player = game.definition.players[0]
+        game.get_to_next_play_afterstate_for_given_player(searching_player)
+        # Every reply of the other players to the card played has been explored by the first search
+        expected_root = player_search(searching_player).root
+        for played_card in game.state.previous_turns_history[0]:
+            expected_root = expected_root.children[played_card.card.id]
+        number_of_visits = expected_root.number_of_visits
+
+        game.get_to_next_play_afterstate_for_given_player(searching_player)
+
+        assert player_search(searching_player).root is expected_root
+        assert expected_root.number_of_visits == number_of_visits + NUMBER_OF_ITERATIONS
+
+    def test_search_needs_a_budget(self):
+        game = _game_with_searching_player(seed=0)
+        with pytest.raises(SearchBudgetMissing):
+            InformationSetMCTS(rng=np.random.default_rng(0)).search(game, game.definition.players[0])
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from wizard.simulation.exhaustive.use_cases.adaptive_trials import is_settled
+
+Z_SCORE = 2.576
+TOLERANCE = 0.5
+
+
+class TestIsSettled:
+    @pytest.mark.parametrize(
+        "scores, expected",
+        [
+            pytest.param(np.array([[30.0, 20.0, 30.0, 20.0], [-10.0, -20.0, -10.0, -20.0]]), True, id="clear_best"),
+            pytest.param(np.array([[20.0, 20.0, 20.0], [20.0, 20.0, 20.0]]), True, id="equivalent_strategies"),
+            pytest.param(np.array([[30.0, -10.0, 30.0, -10.0], [-10.0, 30.0, -10.0, 30.0]]), False, id="close_call"),
+            pytest.param(np.array([[30.0], [-10.0]]), False, id="single_trial"),
+        ],
+    )
+    def test_is_settled(self, scores: np.ndarray, expected: bool):
+        assert is_settled(scores, z_score=Z_SCORE, tolerance=TOLERANCE) == expected
+
+    def test_close_call_settles_with_more_trials(self):
+        # The best strategy is ahead by 1 point on average, by 4 or -2 points from one trial to the next
+        best = np.full(2000, 20.0)
+        scores = np.stack([best, best - 1.0 + np.tile([-3.0, 3.0], 1000)])
+        assert not is_settled(scores[:, :10], z_score=Z_SCORE, tolerance=TOLERANCE)
+        assert is_settled(scores, z_score=Z_SCORE, tolerance=TOLERANCE)
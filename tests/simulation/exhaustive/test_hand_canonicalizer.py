@@ -0,0 +1,116 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from config.common import BASE_COLORS, JESTER_NAME, MAGICIAN_NAME, TRUMP_COLOR
+from wizard.base_game.card import Card
+from wizard.base_game.deck import Deck
+from wizard.base_game.game_config import GameConfig
+from wizard.base_game.player.player import DefinedStrategyPlayer
+from wizard.simulation.exhaustive.use_cases.hand_canonicalizer import (
+    MAX_CANONICALIZED_NUMBER_OF_CARDS,
+    NO_CLASS,
+    TooManyCardsToCanonicalize,
+    get_hand_canonicalizer,
+)
+from wizard.simulation.exhaustive.use_cases.hand_combinations import (
+    HandCombinationsTwoCards,
+)
+from wizard.simulation.exhaustive.use_cases.simulator import (
+    SimulatorWithOneLearningPlayer,
+)
+
+OTHER_COLORS = [color for color in BASE_COLORS if color != TRUMP_COLOR]
+
+
+def _relabel(cards, permutation):
+    colors = dict(zip(OTHER_COLORS, permutation))
+    return [
+        Card(color=colors.get(card.color, card.color), number=card.number) if card.number else card for card in cards
+    ]
+
+
+def _brute_force_number_of_classes(number_of_cards: int) -> int:
+    distinct_hands = {
+        tuple(sorted(card.id for card in hand)) for hand in itertools.combinations(Deck().cards, number_of_cards)
+    }
+    return len(
+        {
+            min(
+                tuple(sorted(card.id for card in _relabel([Card.from_id(i) for i in hand], permutation)))
+                for permutation in itertools.permutations(OTHER_COLORS)
+            )
+            for hand in distinct_hands
+        }
+    )
+
+
+class TestHandCanonicalizer:
+    @pytest.mark.parametrize(
+        "number_of_cards",
+        [pytest.param(1, id="one_card"), pytest.param(2, id="two_cards"), pytest.param(3, id="three_cards")],
+    )
+    def test_number_of_classes_matches_brute_force(self, number_of_cards: int):
+        assert get_hand_canonicalizer(number_of_cards).number_of_classes == _brute_force_number_of_classes(
+            number_of_cards
+        )
+
+    def test_two_card_classes_are_the_two_card_combinations(self):
+        canonicalizer = get_hand_canonicalizer(2)
+        assert {tuple(hand) for hand in canonicalizer.representatives.tolist()} == {
+            tuple(sorted(card.id for card in hand))
+            for hand in HandCombinationsTwoCards().build_all_possible_hand_combinations()
+        }
+
+    def test_class_is_invariant_under_non_trump_color_relabelling(self):
+        canonicalizer = get_hand_canonicalizer(4)
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            cards = list(rng.choice(Deck().cards, size=4, replace=False))
+            class_id = canonicalizer.class_id(cards)
+            canonical_cards = canonicalizer.canonical_cards(cards)
+            for permutation in itertools.permutations(OTHER_COLORS):
+                relabelled_cards = _relabel(cards, permutation)
+                assert canonicalizer.class_id(relabelled_cards) == class_id
+                assert sorted(canonicalizer.canonical_cards(relabelled_cards)) == sorted(canonical_cards)
+
+    def test_canonical_cards_keep_positions_and_fixed_points(self):
+        cards = [
+            Card(color=BASE_COLORS[3], number=4),
+            Card(special_card=MAGICIAN_NAME),
+            Card(color=BASE_COLORS[2], number=7),
+            Card(color=BASE_COLORS[3], number=1),
+        ]
+        assert get_hand_canonicalizer(4).canonical_cards(cards) == [
+            Card(color=OTHER_COLORS[0], number=4),
+            Card(special_card=MAGICIAN_NAME),
+            Card(color=OTHER_COLORS[1], number=7),
+            Card(color=OTHER_COLORS[0], number=1),
+        ]
+
+    def test_impossible_hands_have_no_class(self):
+        canonicalizer = get_hand_canonicalizer(3)
+        assert canonicalizer.class_id([Card(special_card=JESTER_NAME)] * 3) == NO_CLASS
+        assert (
+            canonicalizer.class_id([Card(color=TRUMP_COLOR, number=1)] * 2 + [Card(special_card=JESTER_NAME)])
+            == NO_CLASS
+        )
+
+    def test_larger_hands_are_not_canonicalized(self):
+        with pytest.raises(TooManyCardsToCanonicalize):
+            get_hand_canonicalizer(MAX_CANONICALIZED_NUMBER_OF_CARDS + 1)
+
+    def test_three_card_hands_can_be_simulated(self):
+        config = GameConfig(number_of_players=2, number_of_cards_per_player=3)
+        players = [DefinedStrategyPlayer(identifier=i) for i in range(config.number_of_players)]
+        simulator = SimulatorWithOneLearningPlayer(
+            players=players,
+            learning_player=players[0],
+            initial_deck=Deck(shuffle=False),
+            number_trial_each_combination=2,
+            seed=0,
+            config=config,
+        )
+        for combination_results in itertools.islice(simulator.iterate_combination_results(), 20):
+            assert (combination_results.number_of_turns_won.sum(axis=1) == 3).all()
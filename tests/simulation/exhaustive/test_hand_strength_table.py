@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from config.common import TRUMP_COLOR
+from wizard.base_game.card import Card
+from wizard.base_game.card_id import JESTER_ID, MAGICIAN_ID
+from wizard.base_game.count_points import CountPoints
+from wizard.base_game.deck import Deck
+from wizard.base_game.game import Game
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG
+from wizard.base_game.player.player import ExpectedScorePlayer
+from wizard.simulation.exhaustive.use_cases import hand_strength_table
+from wizard.simulation.exhaustive.use_cases.hand_strength_table import (
+    HandStrengthTable,
+    HandStrengthTableNotFound,
+    HandStrengthTableStorage,
+    InvalidHandStrengthTable,
+)
+
+NUMBER_OF_DEALS_PER_HAND = 20
+TWO_MAGICIANS = [Card.from_id(MAGICIAN_ID), Card.from_id(MAGICIAN_ID)]
+TWO_JESTERS = [Card.from_id(JESTER_ID), Card.from_id(JESTER_ID)]
+
+
+@pytest.fixture(scope="module")
+def table() -> HandStrengthTable:
+    return HandStrengthTable.build(number_of_deals_per_hand=NUMBER_OF_DEALS_PER_HAND, rng=np.random.default_rng(0))
+
+
+class TestHandStrengthTable:
+    def test_every_hand_and_position_has_a_trick_distribution(self, table: HandStrengthTable):
+        np.testing.assert_allclose(table.trick_distributions.sum(axis=2), 1.0)
+
+    @pytest.mark.parametrize(
+        "cards, expected_distribution",
+        [
+            pytest.param(TWO_MAGICIANS, [0.0, 0.0, 1.0], id="both_magicians_win"),
+            pytest.param(TWO_JESTERS, [1.0, 0.0, 0.0], id="both_jesters_lose"),
+        ],
+    )
+    def test_hands_of_known_outcome(self, table: HandStrengthTable, cards, expected_distribution):
+        for position in range(DEFAULT_GAME_CONFIG.number_of_players):
+            np.testing.assert_array_equal(table.trick_distribution(cards, position), expected_distribution)
+
+    def test_expected_scores_weight_count_points_by_the_trick_distribution(self, table: HandStrengthTable):
+        cards = [Card(color=TRUMP_COLOR, number=13), Card.from_id(JESTER_ID)]
+        distribution = table.trick_distribution(cards, position=1)
+
+        expected_scores = table.expected_scores(cards, position=1)
+
+        for prediction, expected_score in enumerate(expected_scores):
+            assert expected_score == pytest.approx(
+                sum(
+                    probability * CountPoints.count_points_single_prediction(prediction, number_of_tricks_won)
+                    for number_of_tricks_won, probability in enumerate(distribution)
+                )
+            )
+
+    def test_table_must_match_the_configuration(self):
+        with pytest.raises(InvalidHandStrengthTable):
+            HandStrengthTable(DEFAULT_GAME_CONFIG, trick_distributions=np.zeros((1, 1, 1)))
+
+
+class TestHandStrengthTableStorage:
+    def test_stored_table_is_memory_mapped(self, table: HandStrengthTable, tmp_path, monkeypatch):
+        monkeypatch.setattr(HandStrengthTableStorage, "BASE_PATH", f"{tmp_path}/")
+        HandStrengthTableStorage().save(table)
+
+        loaded_table = HandStrengthTableStorage().load(DEFAULT_GAME_CONFIG)
+
+        assert isinstance(loaded_table.trick_distributions, np.memmap)
+        np.testing.assert_array_equal(loaded_table.trick_distributions, table.trick_distributions)
+
+    def test_missing_table_is_not_found(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(HandStrengthTableStorage, "BASE_PATH", f"{tmp_path}/")
+        assert HandStrengthTableStorage().load(DEFAULT_GAME_CONFIG) is None
+
+    def test_missing_table_is_not_built_on_demand(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(HandStrengthTableStorage, "BASE_PATH", f"{tmp_path}/")
+        hand_strength_table.get_hand_strength_table.cache_clear()
+        with pytest.raises(HandStrengthTableNotFound):
+            hand_strength_table.get_hand_strength_table(DEFAULT_GAME_CONFIG)
+
+
+class TestExpectedScorePredictionPolicy:
+    @pytest.fixture(autouse=True)
+    def stored_table(self, table: HandStrengthTable, tmp_path, monkeypatch):
+        monkeypatch.setattr(HandStrengthTableStorage, "BASE_PATH", f"{tmp_path}/")
+        HandStrengthTableStorage().save(table)
+        hand_strength_table.get_hand_strength_table.cache_clear()
+        yield
+        hand_strength_table.get_hand_strength_table.cache_clear()
+
+    @pytest.mark.parametrize("seed", [pytest.param(seed, id=f"seed_{seed}") for seed in range(10)])
+    def test_predictions_maximize_expected_score_without_the_forbidden_one(self, table: HandStrengthTable, seed: int):
+        players = [ExpectedScorePlayer(identifier=i, rng=np.random.default_rng(i)) for i in range(3)]
+        game = Game(rng=np.random.default_rng(seed))
+        game.initialize_game(deck=Deck(rng=np.random.default_rng(seed)), players=players)
+
+        game.request_predictions()
+
+        for player in game.definition.players:
+            expected_scores = table.expected_scores(player.cards, player.position)
+            allowed_predictions = [
+                prediction
+                for prediction in range(DEFAULT_GAME_CONFIG.number_of_cards_per_player + 1)
+                if player is not game.initial_ordered_list_players[-1]
+                or sum(game.state.predictions.values()) - game.state.predictions[player] + prediction
+                != DEFAULT_GAME_CONFIG.number_of_cards_per_player
+            ]
+            assert game.state.predictions[player] in allowed_predictions
+            assert expected_scores[game.state.predictions[player]] == max(
+                expected_scores[prediction] for prediction in allowed_predictions
+            )
@@ -0,0 +1,64 @@
+import itertools
+from fractions import Fraction
+
+import pytest
+
+from config.common import TRUMP_COLOR
+from wizard.base_game.card import Card
+from wizard.base_game.card_id import trick_winner_position
+from wizard.base_game.deck import Deck
+from wizard.simulation.exhaustive.use_cases.opponent_deals import OpponentDeals
+
+
+def _learning_player_wins_trick(learning_player_card: Card, opponent_cards: tuple[Card, ...]) -> bool:
+    return trick_winner_position([learning_player_card.id] + [card.id for card in opponent_cards]) == 0
+
+
+def _brute_force_probability_of_winning(learning_player_card: Card, number_of_opponents: int) -> Fraction:
+    deck = Deck(shuffle=False)
+    deck.remove_cards([learning_player_card])
+    number_of_wins, number_of_deals = 0, 0
+    for removed_trump_index in [index for index, card in enumerate(deck.cards) if card.color == TRUMP_COLOR]:
+        remaining_cards = deck.cards[:removed_trump_index] + deck.cards[removed_trump_index + 1 :]
+        for opponent_cards in itertools.permutations(remaining_cards, number_of_opponents):
+            number_of_wins += _learning_player_wins_trick(learning_player_card, opponent_cards)
+            number_of_deals += 1
+    return Fraction(number_of_wins, number_of_deals)
+
+
+class TestOpponentDeals:
+    @pytest.mark.parametrize(
+        "learning_player_cards",
+        [
+            pytest.param(["5 BLUE", "9 GREEN"], id="two_colors"),
+            pytest.param(["5 RED", "9 RED"], id="two_trumps"),
+            pytest.param(["Magician", "Magician"], id="two_magicians"),
+        ],
+    )
+    def test_probabilities_sum_to_one(self, learning_player_cards: list[str]):
+        opponent_deals = OpponentDeals(
+            learning_player_cards=[Card.from_representation(card) for card in learning_player_cards],
+            number_of_opponents=2,
+            number_of_cards_per_player=2,
+        ).enumerate()
+        assert sum(opponent_deal.probability for opponent_deal in opponent_deals) == pytest.approx(1)
+
+    @pytest.mark.parametrize(
+        "learning_player_card",
+        [
+            pytest.param("5 BLUE", id="color"),
+            pytest.param("7 RED", id="trump"),
+            pytest.param("Jester", id="jester"),
+        ],
+    )
+    def test_distribution_matches_brute_force_deals(self, learning_player_card: str):
+        card = Card.from_representation(learning_player_card)
+        opponent_deals = OpponentDeals(
+            learning_player_cards=[card], number_of_opponents=2, number_of_cards_per_player=1
+        ).enumerate()
+        probability_of_winning = sum(
+            opponent_deal.probability
+            for opponent_deal in opponent_deals
+            if _learning_player_wins_trick(card, tuple(hand[0] for hand in opponent_deal.hands))
+        )
+        assert probability_of_winning == pytest.approx(float(_brute_force_probability_of_winning(card, 2)))
@@ -0,0 +1,115 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from wizard.base_game.card import Card
+from wizard.base_game.deck import Deck
+from wizard.base_game.game import Game
+from wizard.base_game.game_config import GameConfig
+from wizard.base_game.player.player import DefinedStrategyPlayer
+from wizard.simulation.exhaustive.use_cases.playing_orders import PlayingOrdersEvaluator
+
+NUMBER_OF_DEALS = 5
+
+
+def _deal_games(config: GameConfig, seed: int):
+    rng = np.random.default_rng(seed)
+    games = []
+    for _ in range(NUMBER_OF_DEALS):
+        players = [DefinedStrategyPlayer(identifier=i, rng=rng) for i in range(config.number_of_players)]
+        game = Game(rng=rng, config=config)
+        game.initialize_game(deck=Deck(rng=rng), players=players)
+        games.append(game)
+    return games
+
+
+def _replay_every_playing_order(game: Game) -> list:
+    players = game.definition.players
+    tricks_won = []
+    for playing_order in itertools.product(*(itertools.permutations(player.initial_cards) for player in players)):
+        for player, card_play_priority in zip(players, playing_order):
+            player.provide_strategy(set_card_play_priority=list(card_play_priority))
+        game.reset_game()
+        game.play_game()
+        tricks_won.append([game.state.number_of_turns_won[player] for player in players])
+    return tricks_won
+
+
+CONFIGS = [
+    pytest.param(GameConfig(), id="default_config"),
+    pytest.param(GameConfig(number_of_players=4, number_of_cards_per_player=3, trump_color="GREEN"), id="4p3c"),
+    pytest.param(GameConfig(number_of_players=2, number_of_cards_per_player=1), id="2p1c"),
+]
+
+
+class TestPlayingOrdersEvaluator:
+    @pytest.mark.parametrize("config", CONFIGS)
+    def test_tricks_won_match_game_replays(self, config: GameConfig):
+        games = _deal_games(config, seed=11)
+        hands = np.array([[[card.id for card in player.cards] for player in game.definition.players] for game in games])
+        starting_players = np.array(
+            [game.definition.players.index(game.definition.initial_starting_player) for game in games]
+        )
+
+        tricks_won = PlayingOrdersEvaluator(config=config).tricks_won(hands=hands, starting_players=starting_players)
+
+        assert tricks_won.tolist() == [_replay_every_playing_order(game) for game in games]
+
+    def test_combinations_follow_product_of_permutations(self):
+        config = GameConfig(number_of_players=2, number_of_cards_per_player=3)
+        evaluator = PlayingOrdersEvaluator(config=config)
+        permutations = list(itertools.permutations(range(config.number_of_cards_per_player)))
+        expected = list(itertools.product(permutations, repeat=config.number_of_players))
+        assert [
+            tuple(tuple(evaluator.permutations[index]) for index in permutation_indexes)
+            for permutation_indexes in evaluator.permutation_indexes
+        ] == expected
+
+    @pytest.mark.parametrize("config", CONFIGS)
+    def test_tricks_won_by_class_match_tricks_won(self, config: GameConfig):
+        games = _deal_games(config, seed=5)
+        hands = np.array([[[card.id for card in player.cards] for player in game.definition.players] for game in games])
+        starting_players = np.arange(NUMBER_OF_DEALS) % config.number_of_players
+        evaluator = PlayingOrdersEvaluator(config=config)
+
+        assert np.array_equal(
+            evaluator.tricks_won_by_class(hands=hands, starting_players=starting_players),
+            evaluator.tricks_won(hands=hands, starting_players=starting_players),
+        )
+
+    def test_playing_order_classes_partition_the_combinations(self):
+        config = GameConfig(number_of_players=3, number_of_cards_per_player=3)
+        evaluator = PlayingOrdersEvaluator(config=config)
+        hands = [[card.id for card in player.cards] for player in _deal_games(config, seed=3)[0].definition.players]
+
+        playing_order_classes = evaluator.playing_order_classes(hands=hands, starting_player=0)
+
+        combinations = [
+            combination
+            for playing_order_class in playing_order_classes
+            for combination in itertools.product(*playing_order_class.permutation_indexes_per_player)
+        ]
+        assert sorted(combinations) == [tuple(indexes) for indexes in evaluator.permutation_indexes.tolist()]
+
+    def test_forced_plays_are_played_once(self):
+        # The first player only holds blue cards, the others must follow with their only blue card
+        hands = [
+            [Card(color="BLUE", number=1).id, Card(color="BLUE", number=2).id],
+            [Card(color="BLUE", number=3).id, Card(color="GREEN", number=4).id],
+            [Card(color="BLUE", number=5).id, Card(color="YELLOW", number=6).id],
+        ]
+        evaluator = PlayingOrdersEvaluator()
+
+        playing_order_classes = evaluator.playing_order_classes(hands=hands, starting_player=0)
+
+        # Only the card led by the first player differs, whatever the priorities of the others are
+        assert [
+            playing_order_class.permutation_indexes_per_player for playing_order_class in playing_order_classes
+        ] == [
+            ((0,), (0, 1), (0, 1)),
+            ((1,), (0, 1), (0, 1)),
+        ]
+        assert all(
+            playing_order_class.number_of_turns_won == (0, 0, 2) for playing_order_class in playing_order_classes
+        )
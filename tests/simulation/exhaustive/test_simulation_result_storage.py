@@ -0,0 +1,152 @@
+import json
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+from wizard.base_game.deck import Deck
+from wizard.base_game.game_config import GameConfig
+from wizard.base_game.player.player import DefinedStrategyPlayer
+from wizard.simulation.exhaustive.simulation_result import SimulationResultMetadata
+from wizard.simulation.exhaustive.use_cases.adaptive_trials import (
+    AdaptiveTrials,
+    StoppingReason,
+)
+from wizard.simulation.exhaustive.use_cases.simulation_result_storage import (
+    ColumnNotStored,
+    SimulationResultStorage,
+    SimulationResultType,
+)
+from wizard.simulation.exhaustive.use_cases.simulator import (
+    SimulatorWithOneLearningPlayer,
+)
+from wizard.simulation.exhaustive.use_cases.survey_simulation_result import (
+    SurveySimulationResult,
+)
+
+CONFIG = GameConfig(number_of_players=2, number_of_cards_per_player=1)
+LEARNING_PLAYER_ID = 1
+METADATA = SimulationResultMetadata(
+    simulation_id=-12,
+    learning_player_id=LEARNING_PLAYER_ID,
+    number_of_players=CONFIG.number_of_players,
+    number_of_cards_per_player=CONFIG.number_of_cards_per_player,
+    total_number_trial=2,
+)
+
+
+@pytest.fixture
+def storage(tmp_path) -> SimulationResultStorage:
+    storage = SimulationResultStorage()
+    storage.BASE_PATH = f"{tmp_path}/"
+    return storage
+
+
+@pytest.fixture
+def simulator() -> SimulatorWithOneLearningPlayer:
+    players = [DefinedStrategyPlayer(identifier=i) for i in range(CONFIG.number_of_players)]
+    return SimulatorWithOneLearningPlayer(
+        players=players,
+        learning_player=players[LEARNING_PLAYER_ID],
+        initial_deck=Deck(shuffle=False),
+        number_trial_each_combination=METADATA.total_number_trial,
+        seed=0,
+        config=CONFIG,
+    )
+
+
+class TestSimulationResultStorage:
+    def test_all_outcomes_round_trip_without_loss(self, storage, simulator):
+        simulation_result = pd.DataFrame(simulator.simulate())
+        storage.save_simulation_result(simulation_result, METADATA, SimulationResultType.ALL_OUTCOME)
+
+        read_simulation_result = storage.read_given_simulation_result(METADATA, SimulationResultType.ALL_OUTCOME)
+
+        pd.testing.assert_frame_equal(read_simulation_result, simulation_result, check_dtype=False)
+        assert read_simulation_result.number_of_turns_won[0] == simulation_result.number_of_turns_won[0]
+
+    def test_chunked_writes_match_a_single_write(self, storage, simulator):
+        with storage.open_writer(METADATA, SimulationResultType.ALL_OUTCOME) as writer:
+            for combination_results in simulator.iterate_combination_results():
+                writer.write_combination_results(combination_results)
+
+        pd.testing.assert_frame_equal(
+            storage.read_given_simulation_result(METADATA, SimulationResultType.ALL_OUTCOME),
+            pd.DataFrame(simulator.simulate()),
+            check_dtype=False,
+        )
+
+    def test_reads_only_requested_columns(self, storage, simulator):
+        storage.save_simulation_result(pd.DataFrame(simulator.simulate()), METADATA, SimulationResultType.ALL_OUTCOME)
+
+        read_simulation_result = storage.read_given_simulation_result(
+            METADATA, SimulationResultType.ALL_OUTCOME, columns=["trial_number", "weight"]
+        )
+
+        assert list(read_simulation_result.columns) == ["trial_number", "weight"]
+        with pytest.raises(ColumnNotStored):
+            storage.read_given_simulation_result(METADATA, SimulationResultType.ALL_OUTCOME, columns=["score"])
+
+    def test_metadata_sidecar(self, storage, simulator):
+        storage.save_simulation_result(pd.DataFrame(simulator.simulate()), METADATA, SimulationResultType.ALL_OUTCOME)
+
+        metadata = storage.read_simulation_result_metadata(METADATA, SimulationResultType.ALL_OUTCOME)
+
+        assert SimulationResultMetadata(**metadata["simulation_result_metadata"]) == METADATA
+        assert metadata["simulation_type"] == SimulationResultType.ALL_OUTCOME.value
+        assert metadata["columns"]["number_of_turns_won"]["keys"] == [0, 1]
+        assert json.loads(json.dumps(metadata)) == metadata
+
+    def test_stopping_reasons_of_adaptive_trials_are_in_the_metadata(self, storage):
+        players = [DefinedStrategyPlayer(identifier=i) for i in range(CONFIG.number_of_players)]
+        simulator = SimulatorWithOneLearningPlayer(
+            players=players,
+            learning_player=players[LEARNING_PLAYER_ID],
+            initial_deck=Deck(shuffle=False),
+            number_trial_each_combination=METADATA.total_number_trial,
+            seed=0,
+            config=CONFIG,
+            adaptive_trials=AdaptiveTrials(initial_number_of_trials=2, batch_number_of_trials=2),
+        )
+        stopping_reasons_of_simulator = {}
+        with storage.open_writer(METADATA, SimulationResultType.ALL_OUTCOME) as writer:
+            for combination_results in simulator.iterate_combination_results():
+                writer.write_combination_results(combination_results)
+                stopping_reasons_of_simulator.setdefault(combination_results.tested_combination, []).append(
+                    [combination_results.stopping_reason, combination_results.number_of_trials]
+                )
+
+        stopping_reasons = storage.read_simulation_result_metadata(METADATA, SimulationResultType.ALL_OUTCOME)[
+            "stopping_reasons"
+        ]
+
+        # HandCombinationsOneCard simulates each copy of the duplicated special cards, each copy keeping its entry
+        assert {combination: len(stoppings) for combination, stoppings in stopping_reasons.items()} == Counter(
+            card.representation for card in Deck().cards
+        )
+        assert {
+            combination: [[stopping["stopping_reason"], stopping["number_of_trials"]] for stopping in stoppings]
+            for combination, stoppings in stopping_reasons.items()
+        } == stopping_reasons_of_simulator
+        assert {stopping["stopping_reason"] for stoppings in stopping_reasons.values() for stopping in stoppings} <= {
+            reason.value for reason in StoppingReason
+        }
+
+    def test_most_relevant_survey_is_read_with_predictions_as_index(self, storage, simulator):
+        survey = SurveySimulationResult(
+            pd.DataFrame(simulator.simulate()), LEARNING_PLAYER_ID, number_of_cards_per_player=1
+        ).compute_optimal_strategy()
+        storage.save_simulation_result(survey, METADATA, SimulationResultType.SURVEY)
+
+        surveyed_simulation_result = (
+            storage.read_most_relevant_surveyed_simulation_result_based_on_current_configuration(
+                player_position=LEARNING_PLAYER_ID, config=CONFIG
+            )
+        )
+
+        assert len(surveyed_simulation_result) == 2 * len(survey)
+        assert surveyed_simulation_result.index.names == [
+            "tested_combination",
+            "combination_played_order",
+            "prediction",
+        ]
@@ -0,0 +1,115 @@
+from collections import Counter, defaultdict
+
+import pytest
+
+from wizard.base_game.deck import Deck
+from wizard.base_game.game_config import GameConfig
+from wizard.base_game.player.player import DefinedStrategyPlayer
+from wizard.simulation.exhaustive.use_cases.adaptive_trials import (
+    AdaptiveTrials,
+    StoppingReason,
+)
+from wizard.simulation.exhaustive.use_cases.simulator import (
+    ExactSimulatorWithOneLearningPlayer,
+    InitialTrialsExceedBudget,
+    SimulatorWithOneLearningPlayer,
+)
+
+CONFIG = GameConfig(number_of_cards_per_player=1)
+NUMBER_TRIALS_EACH_COMBINATION = 3
+SEED = 7
+ADAPTIVE_CONFIG = GameConfig(number_of_players=2, number_of_cards_per_player=1)
+ADAPTIVE_NUMBER_TRIALS_EACH_COMBINATION = 40
+ADAPTIVE_TRIALS = AdaptiveTrials(initial_number_of_trials=10, batch_number_of_trials=10, max_number_of_trials=200)
+
+
+def _simulate(number_of_workers: int, seed: int = SEED):
+    players = [DefinedStrategyPlayer(identifier=i) for i in range(CONFIG.number_of_players)]
+    simulator = SimulatorWithOneLearningPlayer(
+        players=players,
+        learning_player=players[2],
+        initial_deck=Deck(shuffle=False),
+        number_trial_each_combination=NUMBER_TRIALS_EACH_COMBINATION,
+        seed=seed,
+        config=CONFIG,
+    )
+    return simulator.simulate(number_of_workers=number_of_workers)
+
+
+class TestSimulatorWithOneLearningPlayer:
+    @pytest.mark.parametrize(
+        "number_of_workers", [pytest.param(2, id="two_workers"), pytest.param(3, id="three_workers")]
+    )
+    def test_parallel_results_are_identical_to_serial_ones(self, number_of_workers: int):
+        assert _simulate(number_of_workers=number_of_workers) == _simulate(number_of_workers=1)
+
+    def test_each_combination_is_simulated_for_every_trial(self):
+        results = _simulate(number_of_workers=1)
+        assert len(results) == len(Deck().cards) * NUMBER_TRIALS_EACH_COMBINATION
+        assert all(sum(result.number_of_turns_won.values()) == 1 for result in results)
+
+    def test_seed_changes_results(self):
+        assert _simulate(number_of_workers=1, seed=0) != _simulate(number_of_workers=1, seed=1)
+
+
+class TestExactSimulatorWithOneLearningPlayer:
+    def test_deal_probabilities_sum_to_one_for_each_combination(self):
+        players = [DefinedStrategyPlayer(identifier=i) for i in range(CONFIG.number_of_players)]
+        results = ExactSimulatorWithOneLearningPlayer(
+            players=players, learning_player=players[2], initial_deck=Deck(shuffle=False), config=CONFIG
+        ).simulate()
+
+        total_weight_per_combination = defaultdict(float)
+        for result in results:
+            total_weight_per_combination[result.tested_combination] += result.weight
+        # HandCombinationsOneCard simulates each copy of the duplicated special cards
+        number_of_copies = Counter(card.representation for card in Deck().cards)
+        assert total_weight_per_combination == pytest.approx(number_of_copies)
+
+
+class TestAdaptiveSimulatorWithOneLearningPlayer:
+    @staticmethod
+    def _simulator(number_trial_each_combination: int = ADAPTIVE_NUMBER_TRIALS_EACH_COMBINATION):
+        players = [DefinedStrategyPlayer(identifier=i) for i in range(ADAPTIVE_CONFIG.number_of_players)]
+        return SimulatorWithOneLearningPlayer(
+            players=players,
+            learning_player=players[1],
+            initial_deck=Deck(shuffle=False),
+            number_trial_each_combination=number_trial_each_combination,
+            seed=SEED,
+            config=ADAPTIVE_CONFIG,
+            adaptive_trials=ADAPTIVE_TRIALS,
+        )
+
+    def _simulate(self, number_of_workers: int):
+        return list(self._simulator().iterate_combination_results(number_of_workers=number_of_workers))
+
+    def test_every_combination_stops_once_within_the_budget(self):
+        combination_results = self._simulate(number_of_workers=1)
+
+        # HandCombinationsOneCard simulates each copy of the duplicated special cards
+        assert sorted(results.tested_combination for results in combination_results) == sorted(
+            card.representation for card in Deck().cards
+        )
+        assert {results.stopping_reason for results in combination_results} <= {
+            reason.value for reason in StoppingReason
+        }
+        assert sum(
+            results.number_of_trials for results in combination_results
+        ) <= ADAPTIVE_NUMBER_TRIALS_EACH_COMBINATION * len(combination_results)
+        assert all(results.number_of_trials <= ADAPTIVE_TRIALS.max_number_of_trials for results in combination_results)
+
+    def test_settled_combinations_leave_budget_to_close_calls(self):
+        number_of_trials = [results.number_of_trials for results in self._simulate(number_of_workers=1)]
+        assert min(number_of_trials) == ADAPTIVE_TRIALS.initial_number_of_trials
+        assert max(number_of_trials) > ADAPTIVE_NUMBER_TRIALS_EACH_COMBINATION
+
+    def test_parallel_results_are_identical_to_serial_ones(self):
+        def _comparable(combination_results):
+            return [(results.stopping_reason, results.to_simulation_results()) for results in combination_results]
+
+        assert _comparable(self._simulate(number_of_workers=2)) == _comparable(self._simulate(number_of_workers=1))
+
+    def test_initial_trials_must_fit_in_the_budget(self):
+        with pytest.raises(InitialTrialsExceedBudget):
+            self._simulator(number_trial_each_combination=ADAPTIVE_TRIALS.initial_number_of_trials - 1)
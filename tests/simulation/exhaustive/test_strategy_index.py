@@ -0,0 +1,186 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from project_path import ABS_PATH_PROJECT
+from wizard.base_game.card import Card
+from wizard.base_game.deck import Deck
+from wizard.base_game.game import Game
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG
+from wizard.base_game.hand import Hand
+from wizard.base_game.player.player import DefinedStrategyPlayer, StatisticalPlayer
+from wizard.simulation.exhaustive.simulation_result import (
+    SimulationResultMetadata,
+    most_relevant_surveyed_simulation_result_path,
+)
+from wizard.simulation.exhaustive.use_cases.hand_combinations import (
+    HandCombinationsTwoCards,
+)
+from wizard.simulation.exhaustive.use_cases.simulation_result_storage import (
+    SimulationResultStorage,
+    SimulationResultType,
+)
+from wizard.simulation.exhaustive.use_cases.simulator import (
+    SimulatorWithOneLearningPlayer,
+)
+from wizard.simulation.exhaustive.use_cases.strategy_index import (
+    StrategyIndex,
+    StrategyNotFound,
+    StrategyTableStorage,
+    get_strategy_index,
+)
+from wizard.simulation.exhaustive.use_cases.survey_simulation_result import (
+    SurveySimulationResult,
+)
+
+
+@pytest.fixture(scope="module")
+def surveyed_simulation_result() -> pd.DataFrame:
+    players = [DefinedStrategyPlayer(identifier=i) for i in range(DEFAULT_GAME_CONFIG.number_of_players)]
+    simulator = SimulatorWithOneLearningPlayer(
+        players=players,
+        learning_player=players[0],
+        initial_deck=Deck(shuffle=False),
+        number_trial_each_combination=1,
+        seed=0,
+    )
+    return SurveySimulationResult(pd.DataFrame(simulator.simulate()), learning_player_id=0).compute_optimal_strategy()
+
+
+def _save_survey(surveyed_simulation_result: pd.DataFrame, position: int, total_number_trial: int = 1) -> None:
+    SimulationResultStorage().save_simulation_result(
+        simulation_result=surveyed_simulation_result,
+        simulation_result_metadata=SimulationResultMetadata(
+            simulation_id=0,
+            learning_player_id=position,
+            number_of_players=DEFAULT_GAME_CONFIG.number_of_players,
+            number_of_cards_per_player=DEFAULT_GAME_CONFIG.number_of_cards_per_player,
+            total_number_trial=total_number_trial,
+        ),
+        simulation_type=SimulationResultType.SURVEY,
+    )
+
+
+@pytest.fixture
+def stored_surveys(tmp_path, monkeypatch, surveyed_simulation_result):
+    monkeypatch.setattr(SimulationResultStorage, "BASE_PATH", f"{tmp_path}/")
+    monkeypatch.setattr(StrategyTableStorage, "BASE_PATH", f"{tmp_path}/")
+    for position in range(DEFAULT_GAME_CONFIG.number_of_players):
+        _save_survey(surveyed_simulation_result, position)
+    get_strategy_index.cache_clear()
+    yield
+    get_strategy_index.cache_clear()
+
+
+def _strategy_from_dataframe(melted_survey: pd.DataFrame, cards: list) -> tuple:
+    # Lookup previously done by the statistical policies on every decision
+    hand_combination = HandCombinationsTwoCards().list_cards_to_hand_combination(cards)
+    rows = melted_survey[
+        melted_survey.index.get_level_values("tested_combination")
+        == Hand(list(hand_combination)).to_single_representation()
+    ]
+    tested_combination, combination_played_order, prediction = rows.score.idxmax()
+    card_play_priority = [
+        cards[hand_combination.index(card)]
+        for card in Hand.from_single_representation(combination_played_order, sort=False).cards
+    ]
+    return prediction, card_play_priority
+
+
+class TestStrategyIndex:
+    def test_strategies_match_dataframe_lookups(self, stored_surveys):
+        melted_survey = (
+            SimulationResultStorage().read_most_relevant_surveyed_simulation_result_based_on_current_configuration(
+                player_position=1
+            )
+        )
+        strategy_index = get_strategy_index(DEFAULT_GAME_CONFIG)
+        deck = Deck(rng=np.random.default_rng(0))
+
+        for _ in range(50):
+            cards = deck.cards[:2]
+            deck.shuffle()
+            strategy = strategy_index.strategy(cards, position=1)
+            assert (strategy.prediction, list(strategy.card_play_priority)) == _strategy_from_dataframe(
+                melted_survey, cards
+            )
+
+    def test_index_is_shared_across_policies(self, stored_surveys):
+        players = [StatisticalPlayer(identifier=i) for i in range(DEFAULT_GAME_CONFIG.number_of_players)]
+        game = Game(rng=np.random.default_rng(1))
+        game.initialize_game(deck=Deck(rng=np.random.default_rng(1)), players=players)
+        game.request_predictions()
+        game.play_game()
+
+        strategy_index = get_strategy_index(DEFAULT_GAME_CONFIG)
+        assert strategy_index is get_strategy_index(DEFAULT_GAME_CONFIG)
+        assert (strategy_index.best_predictions != -1).all()
+
+    def test_missing_strategy(self):
+        strategy_index = StrategyIndex()
+        strategy_index.compile_position(
+            pd.DataFrame(columns=["tested_combination", "combination_played_order", "prediction", "score"]).set_index(
+                ["tested_combination", "combination_played_order", "prediction"]
+            ),
+            position=0,
+        )
+        with pytest.raises(StrategyNotFound):
+            strategy_index.strategy([Card(color="RED", number=1), Card(color="BLUE", number=2)], position=0)
+
+
+class TestStrategyTableStorage:
+    def test_compiled_table_is_memory_mapped_read_only(self, stored_surveys):
+        compiled_strategy_index = StrategyIndex(DEFAULT_GAME_CONFIG).compile()
+        StrategyTableStorage().save(compiled_strategy_index)
+
+        strategy_index = get_strategy_index(DEFAULT_GAME_CONFIG)
+
+        assert isinstance(strategy_index.table, np.memmap)
+        assert not strategy_index.best_predictions.flags.writeable
+        np.testing.assert_array_equal(strategy_index.table, compiled_strategy_index.table)
+        cards = [Card(color="RED", number=13), Card(color="BLUE", number=3)]
+        assert strategy_index.strategy(cards, position=2) == compiled_strategy_index.strategy(cards, position=2)
+
+    @pytest.mark.parametrize(
+        "total_number_trial",
+        [pytest.param(1, id="survey_rewritten"), pytest.param(2, id="survey_with_more_trials")],
+    )
+    def test_table_compiled_before_a_new_survey_is_stale(
+        self, stored_surveys, surveyed_simulation_result, total_number_trial: int
+    ):
+        StrategyTableStorage().save(StrategyIndex(DEFAULT_GAME_CONFIG).compile())
+        if total_number_trial == 1:
+            survey_path = most_relevant_surveyed_simulation_result_path(SimulationResultStorage.BASE_PATH, 1)
+            os.utime(survey_path, ns=(os.stat(survey_path).st_atime_ns, os.stat(survey_path).st_mtime_ns + 1))
+        else:
+            _save_survey(surveyed_simulation_result, position=1, total_number_trial=total_number_trial)
+
+        strategy_index = get_strategy_index(DEFAULT_GAME_CONFIG)
+
+        assert StrategyTableStorage().load(DEFAULT_GAME_CONFIG) is None
+        assert not isinstance(strategy_index.table, np.memmap)
+        cards = [Card(color="RED", number=13), Card(color="BLUE", number=3)]
+        assert strategy_index.strategy(cards, position=1).prediction != -1
+
+    def test_loading_a_compiled_table_does_not_need_pandas(self, tmp_path, stored_surveys):
+        StrategyTableStorage().save(StrategyIndex(DEFAULT_GAME_CONFIG).compile())
+        statement = (
+            "from wizard.base_game.card import Card\n"
+            "from wizard.simulation.exhaustive.use_cases.strategy_index import StrategyTableStorage, get_strategy_index\n"
+            f"StrategyTableStorage.BASE_PATH = '{tmp_path}/'\n"
+            "get_strategy_index().strategy([Card(color='RED', number=1), Card(special_card='Magician')], position=0)\n"
+            "print('pandas' in sys.modules)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", f"import sys\n{statement}"],
+            cwd=ABS_PATH_PROJECT,
+            env={**os.environ, "PYTHONPATH": ABS_PATH_PROJECT},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        assert output.strip() == "False"
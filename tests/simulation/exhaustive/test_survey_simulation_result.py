@@ -0,0 +1,101 @@
+import pandas as pd
+import pytest
+
+from wizard.base_game.deck import Deck
+from wizard.base_game.game_config import GameConfig
+from wizard.base_game.player.player import DefinedStrategyPlayer
+from wizard.simulation.exhaustive.constants import COMBINATION_INDEXES
+from wizard.simulation.exhaustive.use_cases.simulator import (
+    ExactSimulatorWithOneLearningPlayer,
+    SimulatorWithOneLearningPlayer,
+)
+from wizard.simulation.exhaustive.use_cases.survey_simulation_result import (
+    StreamingSurveySimulationResult,
+    SurveySimulationResult,
+)
+
+LEARNING_PLAYER_ID = 1
+COMBINATION = "13 BLUE - 2 GREEN"
+
+
+def _simulation_results(trials: list[tuple[int, list[int], float]]) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {
+                "trial_number": trial_number,
+                "tested_combination": COMBINATION,
+                "combination_played_order": COMBINATION,
+                "number_of_turns_won": {0: 2 - turns_won, LEARNING_PLAYER_ID: turns_won},
+                "weight": weight,
+            }
+            for trial_number, outcomes, weight in trials
+            for turns_won in outcomes
+        ]
+    )
+
+
+class TestSurveySimulationResult:
+    def test_weights_act_as_repeated_trials(self):
+        weighted = _simulation_results([(0, [0, 1], 3.0), (1, [2], 1.0)])
+        repeated = _simulation_results([(0, [0, 1], 1.0), (1, [0, 1], 1.0), (2, [0, 1], 1.0), (3, [2], 1.0)])
+
+        pd.testing.assert_frame_equal(
+            SurveySimulationResult(
+                weighted, LEARNING_PLAYER_ID, number_of_cards_per_player=2
+            ).compute_optimal_strategy(),
+            SurveySimulationResult(
+                repeated, LEARNING_PLAYER_ID, number_of_cards_per_player=2
+            ).compute_optimal_strategy(),
+        )
+
+    def test_results_without_weight_are_averaged_uniformly(self):
+        results = _simulation_results([(0, [1], 1.0), (1, [2], 1.0)]).drop(columns="weight")
+        survey = SurveySimulationResult(results, LEARNING_PLAYER_ID, number_of_cards_per_player=2)
+        assert survey.compute_optimal_strategy().loc[COMBINATION, "score_prediction_1"] == (30 - 10) / 2
+
+
+def _simulator(exact: bool, config: GameConfig):
+    players = [DefinedStrategyPlayer(identifier=i) for i in range(config.number_of_players)]
+    if exact:
+        return ExactSimulatorWithOneLearningPlayer(
+            players=players,
+            learning_player=players[LEARNING_PLAYER_ID],
+            initial_deck=Deck(shuffle=False),
+            config=config,
+        )
+    return SimulatorWithOneLearningPlayer(
+        players=players,
+        learning_player=players[LEARNING_PLAYER_ID],
+        initial_deck=Deck(shuffle=False),
+        number_trial_each_combination=2,
+        seed=0,
+        config=config,
+    )
+
+
+class TestStreamingSurveySimulationResult:
+    @pytest.mark.parametrize(
+        "exact, config",
+        [
+            pytest.param(False, GameConfig(number_of_players=2, number_of_cards_per_player=2), id="random_trials"),
+            pytest.param(True, GameConfig(number_of_cards_per_player=1), id="exact_deals"),
+        ],
+    )
+    def test_matches_survey_of_all_outcomes(self, exact: bool, config: GameConfig):
+        streaming_survey = StreamingSurveySimulationResult(
+            LEARNING_PLAYER_ID, number_of_cards_per_player=config.number_of_cards_per_player
+        )
+        for combination_results in _simulator(exact, config).iterate_combination_results():
+            streaming_survey.add(combination_results)
+        survey = SurveySimulationResult(
+            pd.DataFrame(_simulator(exact, config).simulate()),
+            LEARNING_PLAYER_ID,
+            number_of_cards_per_player=config.number_of_cards_per_player,
+        )
+
+        pd.testing.assert_frame_equal(
+            streaming_survey.compute_optimal_strategy()
+            .reset_index()
+            .sort_values(COMBINATION_INDEXES, ignore_index=True),
+            survey.compute_optimal_strategy().reset_index().sort_values(COMBINATION_INDEXES, ignore_index=True),
+        )
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from config.common import BASE_COLORS, TRUMP_COLOR
+from wizard.base_game.card import Card
+from wizard.base_game.deck import Deck
+from wizard.base_game.game import Game
+from wizard.base_game.game_config import GameConfig
+from wizard.base_game.player.player import RandomPlayer
+from wizard.simulation.monte_carlo.simulate_multiple_outcomes_for_given_player_state import (
+    PlayerMustBeNextToPlay,
+    SimulateMultipleOutcomesForGivenPlayerState,
+)
+
+CONFIG = GameConfig(number_of_players=3, number_of_cards_per_player=3)
+
+
+class TestSimulateMultipleOutcomesForGivenPlayerState:
+    def test_every_playable_card_gets_an_outcome_distribution(self, mid_deal_game):
+        game = mid_deal_game(CONFIG, seed=0, number_of_cards_played=1)
+        learning_player = game.next_player_playing
+
+        action_outcomes = SimulateMultipleOutcomesForGivenPlayerState(
+            game, learning_player, number_of_determinizations=20, seed=0
+        ).execute()
+
+        assert set(action_outcomes) == set(learning_player.card_play_policy(learning_player).playable_cards())
+        for outcomes in action_outcomes.values():
+            assert outcomes.number_of_rollouts == 20
+            assert outcomes.turns_won_distribution.sum() == pytest.approx(1.0)
+
+    def test_game_is_left_as_given(self, mid_deal_game):
+        game = mid_deal_game(CONFIG, seed=0, number_of_cards_played=1)
+        hands = {player: player.cards.copy() for player in game.definition.players}
+        initial_cards = {player: player.initial_cards.copy() for player in game.definition.players}
+        turn_history = game.state.round_specifics.turn_history.copy()
+
+        SimulateMultipleOutcomesForGivenPlayerState(
+            game, game.next_player_playing, number_of_determinizations=10, seed=0
+        ).execute()
+
+        assert {player: player.cards for player in game.definition.players} == hands
+        assert {player: player.initial_cards for player in game.definition.players} == initial_cards
+        assert game.state.round_specifics.turn_history == turn_history
+        assert sum(game.state.number_of_turns_won.values()) == 0
+
+    def test_parallel_outcomes_are_identical_to_serial_ones(self, mid_deal_game):
+        game = mid_deal_game(CONFIG, seed=0, number_of_cards_played=1)
+        engine = SimulateMultipleOutcomesForGivenPlayerState(
+            game, game.next_player_playing, number_of_determinizations=20, seed=3
+        )
+
+        serial_outcomes = engine.execute()
+        parallel_outcomes = engine.execute(number_of_workers=2)
+
+        for card, outcomes in serial_outcomes.items():
+            np.testing.assert_array_equal(
+                parallel_outcomes[card].turns_won_distribution, outcomes.turns_won_distribution
+            )
+
+    def test_time_budget_stops_drawing_determinizations(self, mid_deal_game):
+        game = mid_deal_game(CONFIG, seed=0, number_of_cards_played=1)
+        action_outcomes = SimulateMultipleOutcomesForGivenPlayerState(
+            game, game.next_player_playing, number_of_determinizations=10**6, seed=0
+        ).execute(time_budget=0.05)
+
+        assert 1 <= next(iter(action_outcomes.values())).number_of_rollouts < 10**6
+
+    def test_hidden_hands_respect_colors_known_to_not_be_in_hand(self):
+        config = GameConfig(number_of_players=2, number_of_cards_per_player=1)
+        players = [RandomPlayer(identifier=i) for i in range(config.number_of_players)]
+        game = Game(rng=np.random.default_rng(0), config=config)
+        game.initialize_game(deck=Deck(shuffle=False), players=players, starting_player=players[0], deterministic=True)
+        game.state.predictions = {players[0]: 1, players[1]: 0}
+        # Only the removed 13 of trump and a magician beat the 12 of trump
+        players[0].cards = [Card(color=TRUMP_COLOR, number=12)]
+        players[0].initial_cards = players[0].cards.copy()
+        players[1].colors_known_to_not_be_in_hand = list(BASE_COLORS)
+
+        outcomes = SimulateMultipleOutcomesForGivenPlayerState(
+            game, players[0], number_of_determinizations=400, seed=0
+        ).execute()[Card(color=TRUMP_COLOR, number=12)]
+
+        # The other player holds one of the 2 magicians or 2 jesters, instead of a magician once in 26 deals
+        assert 0.4 < outcomes.turns_won_distribution[0] < 0.6
+
+    def test_player_must_be_next_to_play(self, mid_deal_game):
+        game = mid_deal_game(CONFIG, seed=0, number_of_cards_played=1)
+        other_player = next(player for player in game.definition.players if player is not game.next_player_playing)
+        with pytest.raises(PlayerMustBeNextToPlay):
+            SimulateMultipleOutcomesForGivenPlayerState(game, other_player)
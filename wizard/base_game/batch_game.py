@@ -0,0 +1,228 @@
+from typing import List, Optional, Type
+
+import numpy as np
+
+from wizard.base_game.bitboard import SLOT_CARD_ID
+from wizard.base_game.card_id import (
+    CARD_COLOR_INDEX,
+    CARD_RANK,
+    NO_COLOR_INDEX,
+    TRICK_RANKS_BY_TRUMP,
+)
+from wizard.base_game.count_points import CountPoints
+from wizard.base_game.deck import Deck
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG, GameConfig
+from wizard.base_game.player.card_play_policy import (
+    BaseCardPlayPolicy,
+    HighestCardPlayPolicy,
+    LowestCardPlayPolicy,
+    RandomCardPlayPolicy,
+)
+from wizard.base_game.random_streams import rng_or_default
+
+CARD_COLOR_INDEX_ARRAY = np.array(CARD_COLOR_INDEX, dtype=np.int8)
+CARD_RANK_ARRAY = np.array(CARD_RANK, dtype=np.int16)
+TRICK_RANKS_BY_TRUMP_ARRAY = np.array(TRICK_RANKS_BY_TRUMP, dtype=np.int16)
+DECK_TEMPLATE_IDS = np.array(SLOT_CARD_ID, dtype=np.int8)
+
+NOT_PLAYED = -1
+
+
+class CardPlayPolicyNotVectorized(Exception):
+    pass
+
+
+class BatchGameNotInitialized(Exception):
+    pass
+
+
+class NumberOfPoliciesNotMatchingConfig(Exception):
+    pass
+
+
+def playable_cards(hands: np.ndarray, cards_in_hand: np.ndarray, lead_colors: np.ndarray) -> np.ndarray:
+    """Row-wise BaseCardPlayPolicy.playable_cards on hands of card ids, cards already played being masked out"""
+    colors = CARD_COLOR_INDEX_ARRAY[hands]
+    is_special_card = colors == NO_COLOR_INDEX
+    is_lead_color = (colors == lead_colors[:, None]) & ~is_special_card
+    has_lead_color = (cards_in_hand & is_lead_color).any(axis=1)
+    return cards_in_hand & (~has_lead_color[:, None] | is_lead_color | is_special_card)
+
+
+def _play_random_card(playable: np.ndarray, hands: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return np.where(playable, rng.random(playable.shape), -1).argmax(axis=1)
+
+
+def _play_highest_card(playable: np.ndarray, hands: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return np.where(playable, CARD_RANK_ARRAY[hands], -1).argmax(axis=1)
+
+
+def _play_lowest_card(playable: np.ndarray, hands: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return np.where(playable, CARD_RANK_ARRAY[hands], np.iinfo(np.int16).max).argmin(axis=1)
+
+
+VECTORIZED_CARD_PLAY_POLICIES = {
+    RandomCardPlayPolicy: _play_random_card,
+    HighestCardPlayPolicy: _play_highest_card,
+    LowestCardPlayPolicy: _play_lowest_card,
+}
+
+
+class BatchGame:
+    """
+    Plays N deals in lockstep, every state being stored in NumPy arrays indexed by [game, seat, ...].
+    Seats follow the order of card_play_policies, like Game.definition.players.
+    """
+
+    def __init__(
+        self,
+        number_of_games: int,
+        card_play_policies: List[Type[BaseCardPlayPolicy]],
+        rng: Optional[np.random.Generator] = None,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+    ):
+        for card_play_policy in card_play_policies:
+            if card_play_policy not in VECTORIZED_CARD_PLAY_POLICIES:
+                raise CardPlayPolicyNotVectorized(card_play_policy.__name__)
+        if len(card_play_policies) != config.number_of_players:
+            raise NumberOfPoliciesNotMatchingConfig
+        self.config = config
+        self.number_of_games = number_of_games
+        self.number_of_players = config.number_of_players
+        self.number_of_cards_per_player = config.number_of_cards_per_player
+        self._trick_rank = TRICK_RANKS_BY_TRUMP_ARRAY[config.trump_color_index]
+        self._card_play_policies = card_play_policies
+        self._rng = rng_or_default(rng)
+
+        self.hands: Optional[np.ndarray] = None
+        self.trump_cards_removed: Optional[np.ndarray] = None
+        self.initial_starting_players: Optional[np.ndarray] = None
+        self.predictions: Optional[np.ndarray] = None
+        self.cards_in_hand: Optional[np.ndarray] = None
+        self.turn_history: Optional[np.ndarray] = None
+        self.starting_player_history: Optional[np.ndarray] = None
+        self.winner_history: Optional[np.ndarray] = None
+        self.number_of_turns_won: Optional[np.ndarray] = None
+
+    def deal(self, deterministic: bool = False) -> None:
+        decks = self._rng.permuted(np.tile(DECK_TEMPLATE_IDS, (self.number_of_games, 1)), axis=1)
+        self._initialize_from_deck_ids(
+            deck_ids=decks,
+            starting_players=self._rng.integers(self.number_of_players, size=self.number_of_games),
+            deterministic=deterministic,
+        )
+
+    def initialize_from_decks(
+        self, decks: List[Deck], starting_players: np.ndarray, deterministic: bool = True
+    ) -> None:
+        self._initialize_from_deck_ids(
+            deck_ids=np.array([[card.id for card in deck.cards] for deck in decks], dtype=np.int8),
+            starting_players=starting_players,
+            deterministic=deterministic,
+        )
+
+    def initialize_from_hands(
+        self, hands: np.ndarray, starting_players: np.ndarray, trump_cards_removed: np.ndarray
+    ) -> None:
+        self.hands = np.asarray(hands, dtype=np.int8).reshape(
+            self.number_of_games, self.number_of_players, self.number_of_cards_per_player
+        )
+        self.initial_starting_players = np.asarray(starting_players, dtype=np.int64)
+        self.trump_cards_removed = np.asarray(trump_cards_removed, dtype=np.int8)
+        self.reset_game()
+
+    def reset_game(self) -> None:
+        if self.hands is None:
+            raise BatchGameNotInitialized
+        shape = (self.number_of_games, self.number_of_cards_per_player)
+        self.predictions = np.full((self.number_of_games, self.number_of_players), NOT_PLAYED, dtype=np.int64)
+        self.cards_in_hand = np.ones(self.hands.shape, dtype=bool)
+        self.turn_history = np.full(shape + (self.number_of_players,), NOT_PLAYED, dtype=np.int8)
+        self.starting_player_history = np.full(shape, NOT_PLAYED, dtype=np.int64)
+        self.winner_history = np.full(shape, NOT_PLAYED, dtype=np.int64)
+        self.number_of_turns_won = np.zeros((self.number_of_games, self.number_of_players), dtype=np.int64)
+
+    def set_predictions(self, predictions: np.ndarray) -> None:
+        self.predictions = np.asarray(predictions, dtype=np.int64).reshape(self.number_of_games, self.number_of_players)
+
+    def request_random_predictions(self) -> None:
+        # Mirrors RandomPredictionPolicy together with BasePredictionPolicy.possible_predictions
+        games = np.arange(self.number_of_games)
+        sum_of_already_announced_predictions = np.zeros(self.number_of_games, dtype=np.int64)
+        for offset in range(self.number_of_players - 1):
+            seats = (self.initial_starting_players + offset) % self.number_of_players
+            predictions = self._rng.integers(self.number_of_cards_per_player + 1, size=self.number_of_games)
+            self.predictions[games, seats] = predictions
+            sum_of_already_announced_predictions += predictions
+
+        last_seats = (self.initial_starting_players - 1) % self.number_of_players
+        forbidden_predictions = self.number_of_cards_per_player - sum_of_already_announced_predictions
+        has_forbidden_prediction = forbidden_predictions > 0
+        predictions = self._rng.integers(
+            self.number_of_cards_per_player + 1 - has_forbidden_prediction, size=self.number_of_games
+        )
+        predictions += has_forbidden_prediction & (predictions >= forbidden_predictions)
+        self.predictions[games, last_seats] = predictions
+
+    def play_game(self) -> None:
+        if self.hands is None:
+            raise BatchGameNotInitialized
+        games = np.arange(self.number_of_games)
+        starting_players = self.initial_starting_players.copy()
+        for turn in range(self.number_of_cards_per_player):
+            lead_colors = np.full(self.number_of_games, NO_COLOR_INDEX, dtype=np.int8)
+            cards_played_in_order = np.empty((self.number_of_games, self.number_of_players), dtype=np.int8)
+            for card_position in range(self.number_of_players):
+                seats = (starting_players + card_position) % self.number_of_players
+                played_cards = self._play_next_cards(games, seats, lead_colors)
+                cards_played_in_order[:, card_position] = played_cards
+                self.turn_history[games, turn, seats] = played_cards
+                played_colors = CARD_COLOR_INDEX_ARRAY[played_cards]
+                lead_colors = np.where(lead_colors == NO_COLOR_INDEX, played_colors, lead_colors)
+
+            winner_positions = self._trick_rank[lead_colors[:, None], cards_played_in_order].argmax(axis=1)
+            winners = (starting_players + winner_positions) % self.number_of_players
+            self.starting_player_history[:, turn] = starting_players
+            self.winner_history[:, turn] = winners
+            self.number_of_turns_won[games, winners] += 1
+            starting_players = winners
+
+    def scores(self) -> np.ndarray:
+        return CountPoints.count_points_arrays(self.predictions, self.number_of_turns_won)
+
+    def _initialize_from_deck_ids(self, deck_ids: np.ndarray, starting_players: np.ndarray, deterministic: bool):
+        # Same dealing procedure as Game: one trump card is removed from the deck, then each player in turn
+        # receives the next number_of_cards_per_player cards
+        is_trump = CARD_COLOR_INDEX_ARRAY[deck_ids] == self.config.trump_color_index
+        if deterministic:
+            removed_positions = deck_ids.shape[1] - 1 - is_trump[:, ::-1].argmax(axis=1)
+        else:
+            ranks_among_trumps = self._rng.integers(is_trump.sum(axis=1))
+            removed_positions = (is_trump.cumsum(axis=1) > ranks_among_trumps[:, None]).argmax(axis=1)
+        games = np.arange(deck_ids.shape[0])
+        trump_cards_removed = deck_ids[games, removed_positions]
+
+        is_kept = np.ones(deck_ids.shape, dtype=bool)
+        is_kept[games, removed_positions] = False
+        remaining_deck_ids = deck_ids[is_kept].reshape(deck_ids.shape[0], deck_ids.shape[1] - 1)
+
+        self.initialize_from_hands(
+            hands=remaining_deck_ids[:, : self.number_of_players * self.number_of_cards_per_player],
+            starting_players=starting_players,
+            trump_cards_removed=trump_cards_removed,
+        )
+
+    def _play_next_cards(self, games: np.ndarray, seats: np.ndarray, lead_colors: np.ndarray) -> np.ndarray:
+        hands = self.hands[games, seats]
+        playable = playable_cards(hands, self.cards_in_hand[games, seats], lead_colors)
+
+        card_indexes = np.zeros(self.number_of_games, dtype=np.int64)
+        for seat, card_play_policy in enumerate(self._card_play_policies):
+            is_seat = seats == seat
+            if is_seat.any():
+                card_indexes[is_seat] = VECTORIZED_CARD_PLAY_POLICIES[card_play_policy](
+                    playable[is_seat], hands[is_seat], self._rng
+                )
+
+        self.cards_in_hand[games, seats, card_indexes] = False
+        return hands[games, card_indexes]
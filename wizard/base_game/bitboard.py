@@ -0,0 +1,109 @@
+from typing import Iterable, List
+
+from config.common import (
+    BASE_COLORS,
+    NUMBER_OF_CARDS,
+    NUMBER_OF_JESTERS,
+    NUMBER_OF_MAGICIANS,
+)
+from wizard.base_game.card_id import (
+    CARD_COLOR_INDEX,
+    FIRST_COLORED_CARD_ID,
+    JESTER_ID,
+    MAGICIAN_ID,
+    NO_COLOR_INDEX,
+    NUMBER_OF_CARD_IDS,
+)
+
+# One bit per physical card of the deck: magicians, then jesters, then colored cards ordered by card id.
+# Duplicated special cards get one slot per copy so that a mask can hold both copies.
+SLOT_CARD_ID = tuple(
+    [MAGICIAN_ID] * NUMBER_OF_MAGICIANS
+    + [JESTER_ID] * NUMBER_OF_JESTERS
+    + list(range(FIRST_COLORED_CARD_ID, NUMBER_OF_CARD_IDS))
+)
+NUMBER_OF_SLOTS = len(SLOT_CARD_ID)
+assert NUMBER_OF_SLOTS == NUMBER_OF_CARDS <= 64, "Deck does not fit in a 64-bit mask"
+
+CARD_ID_SLOTS = tuple(
+    tuple(slot for slot, slot_card_id in enumerate(SLOT_CARD_ID) if slot_card_id == identifier)
+    for identifier in range(NUMBER_OF_CARD_IDS)
+)
+CARD_ID_MASK = tuple(sum(1 << slot for slot in slots) for slots in CARD_ID_SLOTS)
+
+FULL_DECK_MASK = (1 << NUMBER_OF_SLOTS) - 1
+
+# Indexed by color index, the last entry (NO_COLOR_INDEX) holds the special cards
+COLOR_MASKS = tuple(
+    sum(1 << slot for slot, identifier in enumerate(SLOT_CARD_ID) if CARD_COLOR_INDEX[identifier] == color_index)
+    for color_index in range(len(BASE_COLORS) + 1)
+)
+SPECIAL_CARDS_MASK = COLOR_MASKS[NO_COLOR_INDEX]
+
+
+class CardNotInMask(Exception):
+    pass
+
+
+class NoFreeSlotForCard(Exception):
+    pass
+
+
+def add_card_to_mask(mask: int, card_id: int) -> int:
+    for slot in CARD_ID_SLOTS[card_id]:
+        if not (mask >> slot) & 1:
+            return mask | 1 << slot
+    raise NoFreeSlotForCard
+
+
+def remove_card_from_mask(mask: int, card_id: int) -> int:
+    copies = mask & CARD_ID_MASK[card_id]
+    if not copies:
+        raise CardNotInMask
+    return mask ^ (1 << (copies.bit_length() - 1))
+
+
+def contains_card(mask: int, card_id: int) -> bool:
+    return bool(mask & CARD_ID_MASK[card_id])
+
+
+def cards_to_mask(card_ids: Iterable[int]) -> int:
+    mask = 0
+    for card_id in card_ids:
+        mask = add_card_to_mask(mask, card_id)
+    return mask
+
+
+def merge_masks(mask: int, other_mask: int) -> int:
+    """Cards of both masks, the copies of a special card held by both taking its lowest slots"""
+    merged_mask = (mask | other_mask) & ~SPECIAL_CARDS_MASK
+    for special_card_id in (MAGICIAN_ID, JESTER_ID):
+        number_of_copies = (mask & CARD_ID_MASK[special_card_id]).bit_count() + (
+            other_mask & CARD_ID_MASK[special_card_id]
+        ).bit_count()
+        if number_of_copies > len(CARD_ID_SLOTS[special_card_id]):
+            raise NoFreeSlotForCard
+        merged_mask |= sum(1 << slot for slot in CARD_ID_SLOTS[special_card_id][:number_of_copies])
+    return merged_mask
+
+
+def mask_to_card_ids(mask: int) -> List[int]:
+    card_ids = []
+    while mask:
+        lowest_bit = mask & -mask
+        card_ids.append(SLOT_CARD_ID[lowest_bit.bit_length() - 1])
+        mask ^= lowest_bit
+    return card_ids
+
+
+def number_of_cards(mask: int) -> int:
+    return mask.bit_count()
+
+
+def playable_mask(hand_mask: int, lead_color_index: int = NO_COLOR_INDEX) -> int:
+    if lead_color_index == NO_COLOR_INDEX:
+        return hand_mask
+    cards_from_lead_color = hand_mask & COLOR_MASKS[lead_color_index]
+    if cards_from_lead_color:
+        return cards_from_lead_color | (hand_mask & SPECIAL_CARDS_MASK)
+    return hand_mask
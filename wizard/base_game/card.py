@@ -1,24 +1,49 @@
-from functools import cached_property
-from typing import Optional
+from typing import Dict, Optional
 
-from config.common import BASE_COLORS, JESTER_NAME, MAGICIAN_NAME, NUMBER_CARDS_PER_COLOR, SUITS
+from config.common import BASE_COLORS, JESTER_NAME, MAGICIAN_NAME
+from wizard.base_game.card_id import (
+    CARD_COLOR_INDEX,
+    CARD_NUMBER,
+    CARD_RANK,
+    JESTER_ID,
+    MAGICIAN_ID,
+    NUMBER_OF_CARD_IDS,
+    card_id,
+)
 
 
 class Card:
-    def __init__(
-        self,
+    """
+    Cards are interned: Card(...) returns the unique immutable instance of the given card.
+    """
+
+    __slots__ = ("special_card", "number", "color", "id")
+    _interned_cards: Dict[int, "Card"] = {}
+
+    def __new__(
+        cls,
         color: Optional[str] = None,
         number: Optional[int] = None,
         special_card: Optional[str] = None,
     ):
         if special_card and (color or number):
             raise InvalidCard
-        self.special_card = special_card
-        self.number = number
-        self.color = color
+        identifier = card_id(color=color, number=number, special_card=special_card)
+        card = cls._interned_cards.get(identifier)
+        if card is None:
+            card = super().__new__(cls)
+            object.__setattr__(card, "special_card", special_card)
+            object.__setattr__(card, "number", number)
+            object.__setattr__(card, "color", color)
+            object.__setattr__(card, "id", identifier)
+            cls._interned_cards[identifier] = card
+        return card
 
     @classmethod
     def from_representation(cls, card_representation: str):
+        card = CARDS_BY_REPRESENTATION.get(card_representation)
+        if card is not None:
+            return card
         if card_representation in [JESTER_NAME, MAGICIAN_NAME]:
             return cls(special_card=card_representation)
         return cls(
@@ -28,53 +53,60 @@ class Card:
 
     @classmethod
     def from_id(cls, identifier: int):
-        if identifier == 0:
-            return cls(special_card=MAGICIAN_NAME)
-        elif identifier == 1:
-            return cls(special_card=JESTER_NAME)
-        return cls(color=BASE_COLORS[(identifier - 2) // 13], number=(identifier - 2) % 13 + 1)
+        return CARDS_BY_ID[identifier]
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("Card is immutable")
+
+    def __copy__(self) -> "Card":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "Card":
+        return self
+
+    def __reduce__(self):
+        return Card, (self.color, self.number, self.special_card)
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Card):
-            if ((self.number == other.number) & (self.color == other.color) & (self.special_card is None)) or (
-                (self.special_card == other.special_card) & (self.special_card is not None)
-            ):
-                return True
-            return False
+            return self.id == other.id
         return NotImplemented
 
+    def __hash__(self) -> int:
+        return self.id
+
     def __gt__(self, other: object):
         if isinstance(other, Card):
-            if (self.color is not None) and (other.color is not None):
-                if [
-                    -int(BASE_COLORS.index(self.color)),
-                    self.number,
-                ] > [
-                    -int(BASE_COLORS.index(other.color)),
-                    other.number,
-                ]:
-                    return True
-                return False
-            if self != other:
-                if (self.special_card == MAGICIAN_NAME) or (other.special_card == JESTER_NAME):
-                    return True
-            return False
+            return CARD_RANK[self.id] > CARD_RANK[other.id]
         return NotImplemented
 
+    def __lt__(self, other: object):
+        if isinstance(other, Card):
+            return CARD_RANK[self.id] < CARD_RANK[other.id]
+        return NotImplemented
+
+    @property
+    def rank(self) -> int:
+        return CARD_RANK[self.id]
+
     @property
     def representation(self) -> str:
         if self.color is not None:
             return f"{self.number} {self.color}"
         return str(self.special_card)
 
-    @cached_property
-    def id(self) -> int:
-        if self.special_card == MAGICIAN_NAME:
-            return 0
-        elif self.special_card == JESTER_NAME:
-            return 1
-        return NUMBER_CARDS_PER_COLOR * BASE_COLORS.index(self.color) + SUITS.index(self.number) + 2
-
 
 class InvalidCard(Exception):
     pass
+
+
+def _create_card_from_id(identifier: int) -> Card:
+    if identifier == MAGICIAN_ID:
+        return Card(special_card=MAGICIAN_NAME)
+    elif identifier == JESTER_ID:
+        return Card(special_card=JESTER_NAME)
+    return Card(color=BASE_COLORS[CARD_COLOR_INDEX[identifier]], number=CARD_NUMBER[identifier])
+
+
+CARDS_BY_ID = tuple(_create_card_from_id(identifier) for identifier in range(NUMBER_OF_CARD_IDS))
+CARDS_BY_REPRESENTATION = {card.representation: card for card in CARDS_BY_ID}
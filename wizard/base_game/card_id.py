@@ -0,0 +1,98 @@
+from typing import Optional, Sequence
+
+from config.common import (
+    BASE_COLORS,
+    JESTER_NAME,
+    MAGICIAN_NAME,
+    NUMBER_CARDS_PER_COLOR,
+    SUITS,
+    TRUMP_COLOR,
+)
+
+MAGICIAN_ID = 0
+JESTER_ID = 1
+FIRST_COLORED_CARD_ID = 2
+NUMBER_OF_CARD_IDS = FIRST_COLORED_CARD_ID + NUMBER_CARDS_PER_COLOR * len(BASE_COLORS)
+
+NO_COLOR_INDEX = len(BASE_COLORS)
+COLOR_INDEX = {color: index for index, color in enumerate(BASE_COLORS)}
+TRUMP_COLOR_INDEX = COLOR_INDEX[TRUMP_COLOR]
+
+
+def card_id(color: Optional[str] = None, number: Optional[int] = None, special_card: Optional[str] = None) -> int:
+    if special_card == MAGICIAN_NAME:
+        return MAGICIAN_ID
+    if special_card == JESTER_NAME:
+        return JESTER_ID
+    return NUMBER_CARDS_PER_COLOR * COLOR_INDEX[color] + SUITS.index(number) + FIRST_COLORED_CARD_ID
+
+
+def _color_index_of_id(identifier: int) -> int:
+    if identifier < FIRST_COLORED_CARD_ID:
+        return NO_COLOR_INDEX
+    return (identifier - FIRST_COLORED_CARD_ID) // NUMBER_CARDS_PER_COLOR
+
+
+def _number_of_id(identifier: int) -> int:
+    if identifier < FIRST_COLORED_CARD_ID:
+        return 0
+    return SUITS[(identifier - FIRST_COLORED_CARD_ID) % NUMBER_CARDS_PER_COLOR]
+
+
+CARD_COLOR_INDEX = tuple(_color_index_of_id(identifier) for identifier in range(NUMBER_OF_CARD_IDS))
+CARD_NUMBER = tuple(_number_of_id(identifier) for identifier in range(NUMBER_OF_CARD_IDS))
+
+
+def _card_rank(identifier: int) -> int:
+    if identifier == JESTER_ID:
+        return 0
+    if identifier == MAGICIAN_ID:
+        return NUMBER_CARDS_PER_COLOR * len(BASE_COLORS) + 1
+    return NUMBER_CARDS_PER_COLOR * (NO_COLOR_INDEX - 1 - CARD_COLOR_INDEX[identifier]) + CARD_NUMBER[identifier]
+
+
+def _trick_rank(identifier: int, lead_color_index: int, trump_color_index: int) -> int:
+    if identifier == JESTER_ID:
+        return 0
+    if identifier == MAGICIAN_ID:
+        return 4 * (NUMBER_CARDS_PER_COLOR + 1)
+    is_trump = CARD_COLOR_INDEX[identifier] == trump_color_index
+    is_lead = CARD_COLOR_INDEX[identifier] == lead_color_index
+    return (NUMBER_CARDS_PER_COLOR + 1) * (2 * is_trump + is_lead) + CARD_NUMBER[identifier]
+
+
+# Total order used to sort hands (Card.__gt__): jester < colors by reversed BASE_COLORS order and number < magician
+CARD_RANK = tuple(_card_rank(identifier) for identifier in range(NUMBER_OF_CARD_IDS))
+
+# Strength of a card within a trick, indexed by [trump_color_index][lead_color_index][card_id].
+# Equal ranks go to the card played first.
+TRICK_RANKS_BY_TRUMP = tuple(
+    tuple(
+        tuple(_trick_rank(identifier, lead_color_index, trump_color_index) for identifier in range(NUMBER_OF_CARD_IDS))
+        for lead_color_index in range(NO_COLOR_INDEX + 1)
+    )
+    for trump_color_index in range(NO_COLOR_INDEX)
+)
+TRICK_RANK = TRICK_RANKS_BY_TRUMP[TRUMP_COLOR_INDEX]
+
+
+def lead_color_index(card_ids: Sequence[int]) -> int:
+    for identifier in card_ids:
+        if CARD_COLOR_INDEX[identifier] != NO_COLOR_INDEX:
+            return CARD_COLOR_INDEX[identifier]
+    return NO_COLOR_INDEX
+
+
+def trick_winner_position(
+    card_ids: Sequence[int], lead_color: Optional[int] = None, trump_color_index: int = TRUMP_COLOR_INDEX
+) -> int:
+    trick_ranks = TRICK_RANKS_BY_TRUMP[trump_color_index][
+        lead_color_index(card_ids) if lead_color is None else lead_color
+    ]
+    winner_position = 0
+    winner_rank = trick_ranks[card_ids[0]]
+    for position in range(1, len(card_ids)):
+        if trick_ranks[card_ids[position]] > winner_rank:
+            winner_position = position
+            winner_rank = trick_ranks[card_ids[position]]
+    return winner_position
@@ -1,5 +1,7 @@
 from typing import Dict, Union
 
+import numpy as np
+
 from config.common import (
     BASE_REWARD,
     DYNAMIC_LOSS,
@@ -8,10 +10,15 @@ from config.common import (
 )
 from wizard.base_game.player.player import Player
 
-POINT_RANGE = (
-    -DYNAMIC_REWARD * NUMBER_OF_CARDS_PER_PLAYER,
-    DYNAMIC_REWARD * NUMBER_OF_CARDS_PER_PLAYER + BASE_REWARD,
-)
+
+def point_range(number_of_cards_per_player: int) -> tuple[int, int]:
+    return (
+        -DYNAMIC_REWARD * number_of_cards_per_player,
+        DYNAMIC_REWARD * number_of_cards_per_player + BASE_REWARD,
+    )
+
+
+POINT_RANGE = point_range(NUMBER_OF_CARDS_PER_PLAYER)
 
 
 class CountPoints:
@@ -33,3 +40,11 @@ class CountPoints:
         if prediction == number_of_turns_won:
             return int((DYNAMIC_REWARD * prediction + BASE_REWARD))
         return int(DYNAMIC_LOSS * abs(prediction - number_of_turns_won))
+
+    @staticmethod
+    def count_points_arrays(predictions: np.ndarray, number_of_turns_won: np.ndarray) -> np.ndarray:
+        return np.where(
+            predictions == number_of_turns_won,
+            DYNAMIC_REWARD * predictions + BASE_REWARD,
+            DYNAMIC_LOSS * np.abs(predictions - number_of_turns_won),
+        )
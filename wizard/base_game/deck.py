@@ -1,4 +1,5 @@
-from typing import List
+from copy import copy
+from typing import List, Optional
 
 import numpy as np
 
@@ -10,56 +11,113 @@ from config.common import (
     NUMBER_OF_MAGICIANS,
     SUITS,
 )
+from wizard.base_game.bitboard import (
+    CARD_ID_MASK,
+    COLOR_MASKS,
+    SPECIAL_CARDS_MASK,
+    cards_to_mask,
+    remove_card_from_mask,
+)
 from wizard.base_game.card import Card
+from wizard.base_game.card_id import COLOR_INDEX, JESTER_ID, MAGICIAN_ID
+from wizard.base_game.random_streams import rng_or_default
 
 
 # noinspection PyTypeChecker
 class Deck:
-    def __init__(self, shuffle: bool = True):
-        self.cards = self._create_new_deck(shuffle=shuffle)
+    def __init__(self, shuffle: bool = True, rng: Optional[np.random.Generator] = None):
+        self.rng = rng_or_default(rng)
+        self.cards = self._create_new_deck(shuffle=shuffle, rng=self.rng)
         self.initial_cards = self.cards.copy()
+        self._initial_mask = self.mask
+
+    @property
+    def cards(self) -> List[Card]:
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards: List[Card]) -> None:
+        self._cards = cards
+        self.mask = cards_to_mask(card.id for card in cards)
 
     def shuffle(self) -> None:
-        np.random.shuffle(self.cards)
+        self.rng.shuffle(self._cards)
+
+    def copy(self) -> "Deck":
+        deck = copy(self)
+        deck._cards = self._cards.copy()
+        deck.initial_cards = deck.cards if self.initial_cards is self.cards else self.initial_cards.copy()
+        return deck
 
     def reset_deck(self):
-        self.cards = self.initial_cards.copy()
+        self._cards = self.initial_cards.copy()
+        self.mask = self._initial_mask
+
+    def remove_card(self, card: Card) -> None:
+        self.mask = remove_card_from_mask(self.mask, card.id)
+        index_card = self._cards.index(card)
+        self._cards = self._cards[:index_card] + self._cards[index_card + 1 :]
+
+    def remove_first_cards(self, number_of_cards: int) -> None:
+        for card in self._cards[:number_of_cards]:
+            self.mask = remove_card_from_mask(self.mask, card.id)
+        self._cards = self._cards[number_of_cards:]
 
     def remove_cards(self, cards_to_remove: List[Card]) -> None:
-        for card_to_remove in cards_to_remove:
-            for card in self.cards:
-                if card == card_to_remove:
-                    self.cards.remove(card)
-                    break
+        remaining_mask = self.mask
+        for card in cards_to_remove:
+            remaining_mask = remove_card_from_mask(remaining_mask, card.id)
+        # The copies removed from the list are the first ones in deck order
+        removed_mask = self.mask ^ remaining_mask
+        remaining_cards = []
+        for card in self._cards:
+            copies = removed_mask & CARD_ID_MASK[card.id]
+            if copies:
+                removed_mask ^= copies & -copies
+            else:
+                remaining_cards.append(card)
+        self._cards[:] = remaining_cards
+        self.mask = remaining_mask
         self.initial_cards = self.cards  # Useful for exhaustive simulation purpose
+        self._initial_mask = self.mask
 
     def filtered_cards(
         self, colors: list[str], keep_joker: bool = True, keep_joker_duplicates: bool = True
     ) -> list[Card]:
+        kept_mask = 0
+        for color in colors:
+            kept_mask |= COLOR_MASKS[COLOR_INDEX[color]]
+        kept_mask &= self.mask
+        if keep_joker:
+            special_cards_mask = self.mask & SPECIAL_CARDS_MASK
+            if not keep_joker_duplicates:
+                # Only the first copy of each special card is kept
+                for special_card_id in (MAGICIAN_ID, JESTER_ID):
+                    copies = special_cards_mask & CARD_ID_MASK[special_card_id]
+                    special_cards_mask ^= copies ^ (copies & -copies)
+            kept_mask |= special_cards_mask
+        if kept_mask == self.mask:
+            return self._cards.copy()
         filtered_cards: list[Card] = []
-        joker_already_added: list[str] = []
-        for card in self.cards:
-            if card.color in colors:
-                filtered_cards += [card]
-            elif (
-                (card.special_card is not None)
-                & keep_joker
-                & (keep_joker_duplicates or card.special_card not in joker_already_added)
-            ):
-                filtered_cards += [card]
-                joker_already_added += [card.special_card]
+        for card in self._cards:
+            copies = kept_mask & CARD_ID_MASK[card.id]
+            if copies:
+                kept_mask ^= copies & -copies
+                filtered_cards.append(card)
         return filtered_cards
 
     @staticmethod
-    def _create_new_deck(shuffle: bool):
-        list_cards = []
-        for color in BASE_COLORS:
-            for number in SUITS:
-                list_cards += [Card(color=color, number=number, special_card=None)]
-        list_cards += [Card(color=None, number=None, special_card=MAGICIAN_NAME)] * NUMBER_OF_MAGICIANS
-        list_cards += [Card(color=None, number=None, special_card=JESTER_NAME)] * NUMBER_OF_JESTERS
+    def _create_new_deck(shuffle: bool, rng: np.random.Generator):
+        list_cards = list(DECK_TEMPLATE)
 
         if shuffle:
-            np.random.shuffle(list_cards)  # type: ignore
+            rng.shuffle(list_cards)  # type: ignore
 
         return list_cards
+
+
+DECK_TEMPLATE = tuple(
+    [Card(color=color, number=number, special_card=None) for color in BASE_COLORS for number in SUITS]
+    + [Card(color=None, number=None, special_card=MAGICIAN_NAME)] * NUMBER_OF_MAGICIANS
+    + [Card(color=None, number=None, special_card=JESTER_NAME)] * NUMBER_OF_JESTERS
+)
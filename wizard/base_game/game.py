@@ -1,15 +1,18 @@
 # mypy: disable-error-code="union-attr"
-import random
 from dataclasses import dataclass
-from random import choice
 from typing import Dict, List, Optional
 
-from config.common import NUMBER_OF_CARDS_PER_PLAYER, NUMBER_OF_PLAYERS, TRUMP_COLOR
+import numpy as np
+
+from wizard.base_game.bitboard import COLOR_MASKS, merge_masks
 from wizard.base_game.card import Card
+from wizard.base_game.card_id import COLOR_INDEX, trick_winner_position
 from wizard.base_game.count_points import CountPoints
 from wizard.base_game.deck import Deck
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG, GameConfig
 from wizard.base_game.played_card import PlayedCard
-from wizard.base_game.player.player import Player
+from wizard.base_game.player.player import Player, PlayerHandSnapshot
+from wizard.base_game.random_streams import rng_or_default
 
 Terminal = bool
 
@@ -29,6 +32,14 @@ class GameRoundSpecifics:
     number_cards_played: int
     starting_color: Optional[str] = None
 
+    def copy(self) -> "GameRoundSpecifics":
+        return GameRoundSpecifics(
+            turn_history=self.turn_history.copy(),
+            starting_player=self.starting_player,
+            number_cards_played=self.number_cards_played,
+            starting_color=self.starting_color,
+        )
+
 
 @dataclass
 class GameState:
@@ -38,12 +49,37 @@ class GameState:
     previous_turns_history: List[List[PlayedCard]]
     round_specifics: GameRoundSpecifics
 
+    def copy(self) -> "GameState":
+        return GameState(
+            predictions=self.predictions.copy(),
+            number_of_turns_won=self.number_of_turns_won.copy(),
+            winner_history=self.winner_history.copy(),
+            previous_turns_history=self.previous_turns_history.copy(),
+            round_specifics=self.round_specifics.copy(),
+        )
+
+
+@dataclass(frozen=True)
+class GameSnapshot:
+    state: GameState
+    player_hands: Dict[Player, PlayerHandSnapshot]
+
 
 class Game:
-    def __init__(self, id_game: Optional[int] = None):
+    def __init__(
+        self,
+        id_game: Optional[int] = None,
+        rng: Optional[np.random.Generator] = None,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+    ):
         self.id_game = id_game
+        self.config = config
+        self.rng = rng_or_default(rng)
         self.definition: Optional[GameDefinition] = None
         self.state: Optional[GameState] = None
+        self._ordered_list_players: List[Player] = []
+        self._player_positions: Dict[Player, int] = {}
+        self._initial_ordered_list_players: List[Player] = []
 
     def initialize_game(
         self, deck: Deck, players: List[Player], starting_player: Player | None = None, deterministic: bool = False
@@ -53,7 +89,7 @@ class Game:
 
         self._distribute_cards(players=players, deck=deck)
 
-        starting_player = starting_player if starting_player else random.choice(players)
+        starting_player = starting_player if starting_player else players[self.rng.integers(len(players))]
 
         self.definition = GameDefinition(
             initial_starting_player=starting_player,
@@ -72,11 +108,27 @@ class Game:
         while not terminal:
             terminal = self._play_next_card(print_results=print_results)
 
+    def play_next_card(self, card: Card | None = None) -> Terminal:
+        """Plays the given card, or the one chosen by the policy of the next player"""
+        return self._play_next_card(card)
+
     def reset_game(self) -> None:
         self._initialize_game_state()
         for player in self.definition.players:
             player.reset_hand()
 
+    def snapshot(self) -> GameSnapshot:
+        return GameSnapshot(
+            state=self.state.copy(),
+            player_hands={player: player.snapshot_hand() for player in self.definition.players},
+        )
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        self.state = snapshot.state.copy()
+        self._update_seating_order()
+        for player, player_hand in snapshot.player_hands.items():
+            player.restore_hand(player_hand)
+
     def get_to_prediction_state_for_given_player(self, player: Player):
         for next_player_predicting in self.ordered_list_players:
             if next_player_predicting is player:
@@ -87,7 +139,7 @@ class Game:
         self.state.predictions[player] = prediction if prediction is not None else player.make_prediction()
 
     def get_to_first_play_afterstate_for_given_player(self, player: Player) -> Terminal:
-        for next_player_predicting in self.ordered_list_players[self.ordered_list_players.index(player) + 1 :]:
+        for next_player_predicting in self.ordered_list_players[self.position_of(player) + 1 :]:
             self.state.predictions[next_player_predicting] = next_player_predicting.make_prediction()
         while self.next_player_playing != player:
             self._play_next_card(print_results=False)
@@ -110,24 +162,27 @@ class Game:
         for player in players:
             player.assign_game(self)
 
-    @staticmethod
-    def _remove_one_trump_card(deck: Deck, deterministic: bool) -> Card:  # type: ignore
-        remaining_trump_cards = [card for card in deck.cards if card.color == TRUMP_COLOR]
-        trump_card_to_remove = remaining_trump_cards[-1] if deterministic else choice(remaining_trump_cards)
-        index_trump_card_to_remove = deck.cards.index(trump_card_to_remove)
-        deck.cards = deck.cards[:index_trump_card_to_remove] + deck.cards[index_trump_card_to_remove + 1 :]
+    def _remove_one_trump_card(self, deck: Deck, deterministic: bool) -> Card:  # type: ignore
+        number_of_trump_cards = (deck.mask & COLOR_MASKS[self.config.trump_color_index]).bit_count()
+        index_trump_card_to_remove = (
+            number_of_trump_cards - 1 if deterministic else self.rng.integers(number_of_trump_cards)
+        )
+        trump_card_to_remove = deck.filtered_cards([self.config.trump_color], keep_joker=False)[
+            index_trump_card_to_remove
+        ]
+        deck.remove_card(trump_card_to_remove)
         return trump_card_to_remove
 
-    @staticmethod
-    def _distribute_cards(players: List[Player], deck: Deck) -> None:
+    def _distribute_cards(self, players: List[Player], deck: Deck) -> None:
         assert players is not None, "No players"
         assert deck is not None, "Deck of cards is missing"
-        assert NUMBER_OF_CARDS_PER_PLAYER * NUMBER_OF_PLAYERS < len(deck.cards), "Not enough cards"
+        number_of_cards_per_player = self.config.number_of_cards_per_player
+        assert number_of_cards_per_player * self.config.number_of_players < deck.mask.bit_count(), "Not enough cards"
 
         for player in players:
-            player_has_received_cards = player.receive_cards(deck.cards[0:NUMBER_OF_CARDS_PER_PLAYER])
+            player_has_received_cards = player.receive_cards(deck.cards[0:number_of_cards_per_player])
             if player_has_received_cards:
-                deck.cards = deck.cards[NUMBER_OF_CARDS_PER_PLAYER:]
+                deck.remove_first_cards(number_of_cards_per_player)
 
     def _initialize_game_state(self) -> None:
         self.state = GameState(
@@ -142,6 +197,16 @@ class Game:
                 starting_color=None,
             ),
         )
+        self._initial_ordered_list_players = self._rotate_players(self.definition.initial_starting_player)
+        self._update_seating_order()
+
+    def _rotate_players(self, starting_player: Player) -> List[Player]:
+        index_starting_player = self.definition.players.index(starting_player)
+        return self.definition.players[index_starting_player:] + self.definition.players[:index_starting_player]
+
+    def _update_seating_order(self) -> None:
+        self._ordered_list_players = self._rotate_players(self.state.round_specifics.starting_player)
+        self._player_positions = {player: position for position, player in enumerate(self._ordered_list_players)}
 
     def _play_next_card(self, card: Card | None = None, print_results: bool = False) -> Terminal:
         player = self.next_player_playing
@@ -154,18 +219,26 @@ class Game:
                 starting_color=self.state.round_specifics.starting_color,
                 card_position=self.state.round_specifics.number_cards_played,
                 player=player,
+                trump_color=self.config.trump_color,
             )
         ]
         self.state.round_specifics.number_cards_played += 1
 
         if len(self.state.round_specifics.turn_history) == len(self.definition.players):
             self._complete_round(print_results)
-            if len(self.state.previous_turns_history) == NUMBER_OF_CARDS_PER_PLAYER:
+            if len(self.state.previous_turns_history) == self.config.number_of_cards_per_player:
                 return True
         return False
 
     def _complete_round(self, print_results: bool):
-        winner = max(self.state.round_specifics.turn_history)
+        turn_history = self.state.round_specifics.turn_history
+        winner = turn_history[
+            trick_winner_position(
+                [played_card.card.id for played_card in turn_history],
+                COLOR_INDEX.get(self.state.round_specifics.starting_color),
+                self.config.trump_color_index,
+            )
+        ]
 
         self.state.number_of_turns_won[winner.player] += 1
         self.state.winner_history += [winner]
@@ -175,27 +248,34 @@ class Game:
                 played_cards=self.state.round_specifics.turn_history, winner=winner
             )
 
-        self.state.round_specifics.starting_player = winner.player
         self.state.round_specifics.turn_history = []
         self.state.round_specifics.starting_color = None
         self.state.round_specifics.number_cards_played = 0
+        if winner.player is not self.state.round_specifics.starting_player:
+            self.state.round_specifics.starting_player = winner.player
+            self._update_seating_order()
 
     @property
     def ordered_list_players(self) -> List[Player]:
-        index_starting_player = self.definition.players.index(self.state.round_specifics.starting_player)
-        return self.definition.players[index_starting_player:] + self.definition.players[:index_starting_player]
+        return self._ordered_list_players
 
     @property
     def initial_ordered_list_players(self) -> List[Player]:
-        index_initial_starting_player = self.definition.players.index(self.definition.initial_starting_player)
-        return (
-            self.definition.players[index_initial_starting_player:]
-            + self.definition.players[:index_initial_starting_player]
-        )
+        return self._initial_ordered_list_players
+
+    def position_of(self, player: Player) -> int:
+        return self._player_positions[player]
+
+    @property
+    def remaining_cards_mask(self) -> int:
+        remaining_cards_mask = 0
+        for player in self.definition.players:
+            remaining_cards_mask = merge_masks(remaining_cards_mask, player.hand_mask)
+        return remaining_cards_mask
 
     @property
     def next_player_playing(self):
-        return self.ordered_list_players[self.state.round_specifics.number_cards_played]
+        return self._ordered_list_players[self.state.round_specifics.number_cards_played]
 
 
 class GameDisplayer:
@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+
+from config.common import (
+    BASE_COLORS,
+    NUMBER_OF_CARDS,
+    NUMBER_OF_CARDS_PER_PLAYER,
+    NUMBER_OF_PLAYERS,
+    TRUMP_COLOR,
+)
+from wizard.base_game.card_id import COLOR_INDEX
+
+
+class InvalidGameConfig(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    """
+    Parameters of a deal that used to be fixed at import time in config.common.
+    The deck composition itself is not part of it since card ids and bitboards rely on it.
+    """
+
+    number_of_players: int = NUMBER_OF_PLAYERS
+    number_of_cards_per_player: int = NUMBER_OF_CARDS_PER_PLAYER
+    trump_color: str = TRUMP_COLOR
+
+    def __post_init__(self):
+        if self.trump_color not in BASE_COLORS:
+            raise InvalidGameConfig(f"Unknown trump color {self.trump_color}")
+        if self.number_of_players < 1 or self.number_of_cards_per_player < 1:
+            raise InvalidGameConfig("At least one player and one card per player are required")
+        if self.number_of_players * self.number_of_cards_per_player >= NUMBER_OF_CARDS - 1:
+            raise InvalidGameConfig("Not enough cards")
+
+    @property
+    def trump_color_index(self) -> int:
+        return COLOR_INDEX[self.trump_color]
+
+
+DEFAULT_GAME_CONFIG = GameConfig()
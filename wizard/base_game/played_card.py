@@ -1,7 +1,8 @@
 from typing import Optional
 
-from config.common import JESTER_NAME, MAGICIAN_NAME, TRUMP_COLOR
+from config.common import TRUMP_COLOR
 from wizard.base_game.card import Card
+from wizard.base_game.card_id import COLOR_INDEX, NO_COLOR_INDEX, TRICK_RANKS_BY_TRUMP
 from wizard.base_game.player.player import Player
 
 
@@ -12,31 +13,21 @@ class PlayedCard:
         card_position: int,
         player: Player,
         starting_color: Optional[str] = None,
+        trump_color: str = TRUMP_COLOR,
     ):
         self.card = card
         self.starting_color = starting_color
         self.card_position = card_position
         self.player = player
+        self.trump_color = trump_color
 
     def __gt__(self, other: object) -> bool:
         if isinstance(other, PlayedCard):
-            if (self.card.special_card is None) & (other.card.special_card is None):
-                if [
-                    int(self.card.color == TRUMP_COLOR),
-                    (int(self.card.color == self.starting_color)),
-                    self.card.number,
-                ] > [
-                    int(other.card.color == TRUMP_COLOR),
-                    (int(other.card.color == self.starting_color)),
-                    other.card.number,
-                ]:
-                    return True
-                return False
-            if self.card_position < other.card_position:
-                if self.card.special_card == MAGICIAN_NAME or other.card.special_card == JESTER_NAME:
-                    return True
-                return False
-            if other.card.special_card == MAGICIAN_NAME or self.card.special_card == JESTER_NAME:
-                return False
-            return True
+            trick_ranks = TRICK_RANKS_BY_TRUMP[COLOR_INDEX[self.trump_color]][
+                COLOR_INDEX.get(self.starting_color, NO_COLOR_INDEX)
+            ]
+            self_rank, other_rank = trick_ranks[self.card.id], trick_ranks[other.card.id]
+            if self_rank != other_rank:
+                return self_rank > other_rank
+            return (self.card.special_card is not None) and self.card_position < other.card_position
         return NotImplemented
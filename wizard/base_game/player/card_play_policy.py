@@ -1,13 +1,11 @@
 import abc
-from functools import lru_cache
+from typing import Optional
 
-import numpy as np
-
-from config.common import NUMBER_OF_CARDS_PER_PLAYER
+from wizard.base_game.bitboard import COLOR_MASKS
 from wizard.base_game.card import Card
-from wizard.base_game.hand import Hand
-from wizard.simulation.exhaustive.use_cases.hand_combinations import IMPLEMENTED_COMBINATIONS
-from wizard.simulation.exhaustive.use_cases.simulation_result_storage import SimulationResultStorage
+from wizard.base_game.card_id import CARD_COLOR_INDEX, COLOR_INDEX, NO_COLOR_INDEX
+
+SEARCH_TIME_BUDGET = 0.1  # Seconds per card played by the search policies
 
 
 class BaseCardPlayPolicy(abc.ABC):
@@ -21,16 +19,17 @@ class BaseCardPlayPolicy(abc.ABC):
         return self._player.cards
 
     def _filter_playable_cards_relatively_to_first_color_played(self, first_color: str) -> list[Card]:
+        first_color_index = COLOR_INDEX[first_color]
+        if not self._player.hand_mask & COLOR_MASKS[first_color_index]:
+            return self._player.cards
         cards_from_required_color: list[Card] = []
         special_cards: list[Card] = []
         for card in self._player.cards:
-            if card.color == first_color:
+            if CARD_COLOR_INDEX[card.id] == first_color_index:
                 cards_from_required_color += [card]
-            elif card.color is None:
+            elif CARD_COLOR_INDEX[card.id] == NO_COLOR_INDEX:
                 special_cards += [card]
-        if cards_from_required_color:
-            return cards_from_required_color + special_cards
-        return self._player.cards
+        return cards_from_required_color + special_cards
 
     @abc.abstractmethod
     def execute(self) -> Card:
@@ -43,7 +42,8 @@ class BaseCardPlayPolicy(abc.ABC):
 
 class RandomCardPlayPolicy(BaseCardPlayPolicy):
     def execute(self) -> Card:
-        return np.random.choice(self.playable_cards())  # type: ignore
+        playable_cards = self.playable_cards()
+        return playable_cards[self._player.rng.integers(len(playable_cards))]
 
 
 class HighestCardPlayPolicy(BaseCardPlayPolicy):
@@ -72,35 +72,38 @@ class StatisticalCardPlayPolicy(BaseCardPlayPolicy):
 
     @property
     def cards_ordered_by_priority(self) -> list[Card]:
-        cards_ordered_by_priority = []
-        for placeholder_order_card in Hand.from_single_representation(
-            self._optimal_strategy.index.get_level_values("combination_played_order")[0]
-        ).cards:
-            for ind, placeholder_combination_card in enumerate(self._initial_hand_combination):
-                if placeholder_order_card == placeholder_combination_card:
-                    cards_ordered_by_priority.append(self._player.initial_cards[ind])
-                    break
-        return cards_ordered_by_priority
+        from wizard.simulation.exhaustive.use_cases.strategy_index import get_strategy_index
 
-    @property
-    def _optimal_strategy(self):
-        df = self._adequate_surveyed_simulation_result(self._player.position)
-        return df.loc[
-            df[
-                df.index.get_level_values("tested_combination")
-                == Hand(self._initial_hand_combination).to_single_representation()
-                ].idxmax(),
-            :,
-        ]
+        return list(
+            get_strategy_index(self._player.game.config)
+            .strategy(self._player.initial_cards, self._player.position)
+            .card_play_priority
+        )
 
-    @property
-    def _initial_hand_combination(self):
-        hand_combination_cls = IMPLEMENTED_COMBINATIONS[NUMBER_OF_CARDS_PER_PLAYER]
-        return hand_combination_cls().list_cards_to_hand_combination(self._player.initial_cards)
 
-    @lru_cache
-    def _adequate_surveyed_simulation_result(self, player_position: int):
-        return SimulationResultStorage().read_most_relevant_surveyed_simulation_result_based_on_current_configuration(player_position)
+class ISMCTSCardPlayPolicy(BaseCardPlayPolicy):
+    """
+    Information set MCTS over the hidden hands, stopping at the first of its budgets. Use functools.partial to
+    configure them, e.g. partial(ISMCTSCardPlayPolicy, time_budget=None, number_of_iterations=2000).
+    """
+
+    def __init__(
+        self, player, time_budget: Optional[float] = SEARCH_TIME_BUDGET, number_of_iterations: Optional[int] = None
+    ):
+        super().__init__(player)
+        self._time_budget = time_budget
+        self._number_of_iterations = number_of_iterations
+
+    def execute(self) -> Card:
+        from wizard.search.ismcts import player_search
+
+        card_id = player_search(self._player).search(
+            self._player.game,
+            self._player,
+            time_budget=self._time_budget,
+            number_of_iterations=self._number_of_iterations,
+        )
+        return next(card for card in self._player.cards if card.id == card_id)
 
 
 class DQNCardPlayPolicy(BaseCardPlayPolicy):
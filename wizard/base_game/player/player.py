@@ -1,11 +1,12 @@
 # mypy: disable-error-code="attr-defined"
-import random
+from dataclasses import dataclass
 from functools import partial
-from typing import List, Optional, Type
+from typing import TYPE_CHECKING, List, Optional, Type
 
-import pandas as pd
+import numpy as np
 
 from config.common import BASE_COLORS
+from wizard.base_game.bitboard import cards_to_mask, remove_card_from_mask
 from wizard.base_game.card import Card
 from wizard.base_game.deck import Deck
 from wizard.base_game.player.card_play_policy import (
@@ -13,6 +14,7 @@ from wizard.base_game.player.card_play_policy import (
     DefinedCardPlayPolicy,
     DQNCardPlayPolicy,
     HighestCardPlayPolicy,
+    ISMCTSCardPlayPolicy,
     RandomCardPlayPolicy,
     StatisticalCardPlayPolicy,
 )
@@ -20,10 +22,24 @@ from wizard.base_game.player.prediction_policy import (
     BasePredictionPolicy,
     DefinedPredictionPolicy,
     DQNPredictionPolicy,
+    ExpectedScorePredictionPolicy,
     RandomPredictionPolicy,
     StatisticalPredictionPolicy,
 )
-from wizard.rl_pipeline.agents.DQNAgent import DQNAgent
+from wizard.base_game.random_streams import rng_or_default
+
+if TYPE_CHECKING:  # pandas and torch are only needed by the statistical and DQN policies
+    import pandas as pd
+
+    from wizard.rl_pipeline.agents.DQNAgent import DQNAgent
+
+
+@dataclass(frozen=True)
+class PlayerHandSnapshot:
+    cards: List[Card]
+    hand_mask: int
+    initial_cards: List[Card]
+    colors_known_to_not_be_in_hand: List[str]
 
 
 class Player:
@@ -35,8 +51,9 @@ class Player:
         name: str | None = None,
         set_prediction: int | None = None,
         set_card_play_priority: list[Card] | None = None,
-        stat_table: pd.DataFrame | None = None,
-        agent: DQNAgent | None = None,
+        stat_table: "pd.DataFrame | None" = None,
+        agent: "DQNAgent | None" = None,
+        rng: np.random.Generator | None = None,
     ):
         self.identifier = identifier
         self.name = name
@@ -52,6 +69,16 @@ class Player:
         self.set_card_play_priority = set_card_play_priority
         self.stat_table = stat_table
         self.agent = agent
+        self.rng = rng_or_default(rng)
+
+    @property
+    def cards(self) -> Optional[List[Card]]:
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards: Optional[List[Card]]) -> None:
+        self._cards = cards
+        self.hand_mask = cards_to_mask(card.id for card in cards) if cards else 0
 
     def assign_game(self, game):
         self.game = game
@@ -72,6 +99,20 @@ class Player:
         self.cards = self.initial_cards.copy()
         self.colors_known_to_not_be_in_hand = []
 
+    def snapshot_hand(self) -> PlayerHandSnapshot:
+        return PlayerHandSnapshot(
+            cards=self.cards.copy(),
+            hand_mask=self.hand_mask,
+            initial_cards=self.initial_cards,
+            colors_known_to_not_be_in_hand=self.colors_known_to_not_be_in_hand.copy(),
+        )
+
+    def restore_hand(self, snapshot: PlayerHandSnapshot) -> None:
+        self._cards = snapshot.cards.copy()
+        self.hand_mask = snapshot.hand_mask
+        self.initial_cards = snapshot.initial_cards
+        self.colors_known_to_not_be_in_hand = snapshot.colors_known_to_not_be_in_hand.copy()
+
     def make_prediction(self) -> int:
         return self.prediction_policy(self).execute()
 
@@ -82,6 +123,7 @@ class Player:
             for card in self.cards:
                 if card == card_to_play:
                     self.cards.remove(card)
+                    self.hand_mask = remove_card_from_mask(self.hand_mask, card.id)
                     break
         self._update_colors_known_to_not_be_in_hand(card_to_play)
         return card_to_play
@@ -97,19 +139,21 @@ class Player:
 
     @property
     def position(self) -> int:
-        return self.game.ordered_list_players.index(self)
+        return self.game.position_of(self)
 
     def sample_another_possible_hand(self):
         other_players_cards = [
             card for player in self.game.definition.players if player != self for card in player.cards
         ]
         trump_card_removed = self.game.definition.trump_card_removed
-        possible_cards = Deck()
+        possible_cards = Deck(shuffle=False)
         possible_cards.remove_cards(other_players_cards + [trump_card_removed])
         possible_cards = possible_cards.filtered_cards(
             colors=list(set(BASE_COLORS) - set(self.colors_known_to_not_be_in_hand))
         )
-        self.cards = random.sample(possible_cards, len(self.cards))
+        self.cards = [
+            possible_cards[index] for index in self.rng.choice(len(possible_cards), len(self.cards), replace=False)
+        ]
         self.initial_cards = (self._cards_already_played + self.cards).copy()
 
     @property
@@ -142,4 +186,14 @@ StatisticalPlayer = partial(
     prediction_policy=StatisticalPredictionPolicy,
     card_play_policy=StatisticalCardPlayPolicy,
 )
+ISMCTSPlayer = partial(
+    Player,
+    prediction_policy=RandomPredictionPolicy,
+    card_play_policy=ISMCTSCardPlayPolicy,
+)
+ExpectedScorePlayer = partial(
+    Player,
+    prediction_policy=ExpectedScorePredictionPolicy,
+    card_play_policy=RandomCardPlayPolicy,
+)
 DQNPlayer = partial(Player, prediction_policy=DQNPredictionPolicy, card_play_policy=DQNCardPlayPolicy)
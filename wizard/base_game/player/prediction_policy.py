@@ -1,12 +1,4 @@
 import abc
-from functools import lru_cache
-
-import numpy as np
-
-from config.common import NUMBER_OF_CARDS_PER_PLAYER
-from wizard.base_game.hand import Hand
-from wizard.simulation.exhaustive.use_cases.hand_combinations import IMPLEMENTED_COMBINATIONS
-from wizard.simulation.exhaustive.use_cases.simulation_result_storage import SimulationResultStorage
 
 
 class BasePredictionPolicy(abc.ABC):
@@ -14,19 +6,21 @@ class BasePredictionPolicy(abc.ABC):
         self._player = player
 
     def possible_predictions(self) -> list[int]:
-        if self.forbidden_prediction() and self.forbidden_prediction() >= 0:
-            return list(range(self.forbidden_prediction())) + list(
-                range(self.forbidden_prediction() + 1, NUMBER_OF_CARDS_PER_PLAYER + 1)
+        number_of_cards_per_player = self._player.game.config.number_of_cards_per_player
+        forbidden_prediction = self.forbidden_prediction()
+        if forbidden_prediction and forbidden_prediction >= 0:
+            return list(range(forbidden_prediction)) + list(
+                range(forbidden_prediction + 1, number_of_cards_per_player + 1)
             )
-        return list(range(NUMBER_OF_CARDS_PER_PLAYER + 1))
+        return list(range(number_of_cards_per_player + 1))
 
     def forbidden_prediction(self) -> int | None:
-        if self._player.game.initial_ordered_list_players[-1] is self._player:
+        game = self._player.game
+        if game.initial_ordered_list_players[-1] is self._player:
             sum_of_already_announced_predictions = sum(
-                self._player.game.state.predictions[player]
-                for player in self._player.game.initial_ordered_list_players[:-1]
+                prediction for player, prediction in game.state.predictions.items() if player is not self._player
             )
-            return NUMBER_OF_CARDS_PER_PLAYER - sum_of_already_announced_predictions
+            return game.config.number_of_cards_per_player - sum_of_already_announced_predictions
         return None
 
     @abc.abstractmethod
@@ -36,7 +30,8 @@ class BasePredictionPolicy(abc.ABC):
 
 class RandomPredictionPolicy(BasePredictionPolicy):
     def execute(self) -> int:
-        return np.random.choice(self.possible_predictions())
+        possible_predictions = self.possible_predictions()
+        return possible_predictions[self._player.rng.integers(len(possible_predictions))]
 
 
 class DefinedPredictionPolicy(BasePredictionPolicy):
@@ -50,30 +45,32 @@ class DefinedPredictionPolicy(BasePredictionPolicy):
 
 class StatisticalPredictionPolicy(BasePredictionPolicy):
     def execute(self):
-        prediction = self._optimal_strategy.index.get_level_values("prediction")[0]
+        from wizard.simulation.exhaustive.use_cases.strategy_index import get_strategy_index
+
+        prediction = (
+            get_strategy_index(self._player.game.config)
+            .strategy(self._player.initial_cards, self._player.position)
+            .prediction
+        )
         if prediction in self.possible_predictions():
             return prediction
         return prediction + 1
 
-    @property
-    def _optimal_strategy(self):
-        df = self._adequate_surveyed_simulation_result(self._player.position)
-        return df.loc[
-            df[
-                df.index.get_level_values("tested_combination")
-                == Hand(self._initial_hand_combination).to_single_representation()
-                ].idxmax(),
-            :,
-        ]
-
-    @property
-    def _initial_hand_combination(self):
-        hand_combination_cls = IMPLEMENTED_COMBINATIONS[NUMBER_OF_CARDS_PER_PLAYER]
-        return hand_combination_cls().list_cards_to_hand_combination(self._player.initial_cards)
-
-    @lru_cache
-    def _adequate_surveyed_simulation_result(self, player_position: int):
-        return SimulationResultStorage().read_most_relevant_surveyed_simulation_result_based_on_current_configuration(player_position)
+
+class ExpectedScorePredictionPolicy(BasePredictionPolicy):
+    """Prediction of highest expected score given the hand strength table of the configuration"""
+
+    def execute(self) -> int:
+        from wizard.simulation.exhaustive.use_cases.hand_strength_table import get_hand_strength_table
+
+        expected_scores = get_hand_strength_table(self._player.game.config).expected_scores(
+            self._player.cards, self._player.position
+        )
+        forbidden_prediction = self.forbidden_prediction()
+        return max(
+            (prediction for prediction in self.possible_predictions() if prediction != forbidden_prediction),
+            key=lambda prediction: expected_scores[prediction],
+        )
 
 
 class DQNPredictionPolicy(BasePredictionPolicy):
@@ -0,0 +1,35 @@
+from typing import List, Optional
+
+import numpy as np
+
+Seed = int | np.random.SeedSequence | None
+
+# Fallback stream of the process when no generator is provided explicitly
+DEFAULT_RNG = np.random.default_rng()
+
+
+def rng_or_default(rng: Optional[np.random.Generator]) -> np.random.Generator:
+    return rng if rng is not None else DEFAULT_RNG
+
+
+def as_seed_sequence(seed: Seed) -> np.random.SeedSequence:
+    return seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+
+def stream_seed_sequence(seed: Seed, stream_index: int) -> np.random.SeedSequence:
+    """
+    Child number stream_index of the root seed, identical to as_seed_sequence(seed).spawn(n)[stream_index].
+    Since it only depends on the index, a stream gives the same draws whichever worker consumes it.
+    """
+    root = as_seed_sequence(seed)
+    return np.random.SeedSequence(
+        entropy=root.entropy, spawn_key=root.spawn_key + (stream_index,), pool_size=root.pool_size
+    )
+
+
+def stream_generator(seed: Seed, stream_index: int) -> np.random.Generator:
+    return np.random.default_rng(stream_seed_sequence(seed, stream_index))
+
+
+def spawn_generators(seed: Seed, number_of_generators: int) -> List[np.random.Generator]:
+    return [np.random.default_rng(child) for child in as_seed_sequence(seed).spawn(number_of_generators)]
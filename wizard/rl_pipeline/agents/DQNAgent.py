@@ -1,13 +1,12 @@
-import random
-from copy import deepcopy
+from dataclasses import replace
 
 import numpy as np
 import torch
 from torch import optim
 
-from config.common import NUMBER_OF_CARDS_PER_PLAYER
-from config.rl import ALPHA, EPSILON_EXPLORATION_RATE_CARD_PLAY, GAMMA, EPSILON_EXPLORATION_RATE_PREDICTIONS
+from config.rl import ALPHA, EPSILON_EXPLORATION_RATE_CARD_PLAY, EPSILON_EXPLORATION_RATE_PREDICTIONS, GAMMA
 from wizard.base_game.card import Card
+from wizard.base_game.random_streams import rng_or_default
 from wizard.rl_pipeline.features.data_cls import GenericFeatures
 from wizard.rl_pipeline.features.select_learning_features_and_cast_to_tensor import (
     SelectLearningFeaturesAndCastToTensor,
@@ -19,8 +18,9 @@ from wizard.rl_pipeline.type import Action, ActionType
 class DQNAgent:
     NUMBER_GRAD_ACCUMULATION_STEPS = 100
 
-    def __init__(self, model: MultiStepANN):
+    def __init__(self, model: MultiStepANN, rng: np.random.Generator | None = None):
         self.model = model
+        self.rng = rng_or_default(rng)
         self._optimizer = optim.Adam(model.parameters(), lr=ALPHA)
         self._deterministic_behavior = False
         self._n_iter = 0
@@ -49,8 +49,10 @@ class DQNAgent:
     @staticmethod
     def update_state_to_action_state_for_prediction_phase_only(state: GenericFeatures, action: Action) -> GenericFeatures:
         if action.is_prediction:
-            state = deepcopy(state)
-            state.generic_objective_context.NUMBER_ROUNDS_TO_WIN = action.value
+            state = replace(
+                state,
+                generic_objective_context=replace(state.generic_objective_context, NUMBER_ROUNDS_TO_WIN=action.value),
+            )
         return state
 
     def select_action(self, state: GenericFeatures) -> Action:
@@ -103,12 +105,13 @@ class DQNAgent:
 
     def _get_predictions_sorted_by_priority(self, state: GenericFeatures) -> list[int]:
         q_values = []
-        if not self._deterministic_behavior and random.random() < EPSILON_EXPLORATION_RATE_PREDICTIONS:
-            all_actions = list(range(NUMBER_OF_CARDS_PER_PLAYER + 1))
-            random.shuffle(all_actions)
+        number_of_possible_predictions = state.generic_objective_context.TOTAL_NUMBER_OF_ROUNDS + 1
+        if not self._deterministic_behavior and self.rng.random() < EPSILON_EXPLORATION_RATE_PREDICTIONS:
+            all_actions = list(range(number_of_possible_predictions))
+            self.rng.shuffle(all_actions)
             return all_actions
         with torch.no_grad():
-            for action in range(NUMBER_OF_CARDS_PER_PLAYER + 1):
+            for action in range(number_of_possible_predictions):
                 state.generic_objective_context.NUMBER_ROUNDS_TO_WIN = action
                 state_feat_torch = SelectLearningFeaturesAndCastToTensor().execute(state)
                 _, q_value = self._select_card_play_eps_greedy_action(
@@ -123,8 +126,8 @@ class DQNAgent:
         epsilon_exploration_rate: float = EPSILON_EXPLORATION_RATE_CARD_PLAY,
     ) -> tuple[torch.Tensor, torch.Tensor]:
         non_masked_indices = torch.nonzero(q_for_playable_cards)
-        if not self._deterministic_behavior and random.random() < epsilon_exploration_rate:
-            selected_action = non_masked_indices[np.random.randint(0, non_masked_indices.size(0))]
+        if not self._deterministic_behavior and self.rng.random() < epsilon_exploration_rate:
+            selected_action = non_masked_indices[self.rng.integers(0, non_masked_indices.size(0))]
         else:
             selected_action = non_masked_indices[q_for_playable_cards[non_masked_indices].argmax()]
         return selected_action, q_for_playable_cards[selected_action]
@@ -1,24 +1,37 @@
 from typing import Any
 
+import numpy as np
 from gymnasium import Env
 from gymnasium.core import ActType, RenderFrame
 from gymnasium.spaces import Discrete
 
 from config.common import NUMBER_OF_UNIQUE_CARDS
-from wizard.base_game.count_points import POINT_RANGE, CountPoints
+from wizard.base_game.count_points import CountPoints, point_range
 from wizard.base_game.deck import Deck
 from wizard.base_game.game import Game, Terminal
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG, GameConfig
 from wizard.base_game.player.player import Player
+from wizard.base_game.random_streams import stream_generator
 from wizard.rl_pipeline.features.compute_generic_features import ComputeGenericFeatures
-from wizard.rl_pipeline.features.observation_space import OBSERVATION_SPACE
+from wizard.rl_pipeline.features.observation_space import (
+    OBSERVATION_SPACE,
+    build_observation_space,
+)
 from wizard.rl_pipeline.type import Action
 
 
 class SinglePlayerLearningEnv(Env):
-    def __init__(self, players: list[Player], learning_player: Player, starting_player: Player | None = None):
-        self.reward_range = POINT_RANGE
+    def __init__(
+        self,
+        players: list[Player],
+        learning_player: Player,
+        starting_player: Player | None = None,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+    ):
+        self.reward_range = point_range(config.number_of_cards_per_player)
         self.action_space = Discrete(NUMBER_OF_UNIQUE_CARDS)
-        self.observation_space = OBSERVATION_SPACE
+        self.observation_space = build_observation_space(config)
+        self._config = config
 
         self._players = players
         self._learning_player = learning_player
@@ -54,16 +67,32 @@ class SinglePlayerLearningEnv(Env):
         seed: int | None = None,
         options: dict[str, Any] | None = None,
     ) -> tuple[OBSERVATION_SPACE, dict[str, Any]]:
-        self._game = Game()
+        super().reset(seed=seed)
+        self._seed_players()
+        self._game = Game(rng=self.np_random, config=self._config)
         for player in self._players:  # Safety mechanism in case of multiple consecutive reset calls
             player.drop_hand()
-        self._game.initialize_game(deck=Deck(), players=self._players, starting_player=self._starting_player)
+        self._game.initialize_game(
+            deck=Deck(rng=self.np_random), players=self._players, starting_player=self._starting_player
+        )
         self._game.get_to_prediction_state_for_given_player(self._learning_player)
         return (
             ComputeGenericFeatures(self._game, self._learning_player).execute(),
             {},
         )
 
+    def _seed_players(self) -> None:
+        """
+        Gives each player, then each agent of the players, its own child stream of the environment generator.
+        Streams are drawn again on every reset, so that episodes differ while following the seed of the environment.
+        """
+        seed_sequence = np.random.SeedSequence(int(self.np_random.integers(np.iinfo(np.int64).max)))
+        for stream_index, player in enumerate(self._players):
+            player.rng = stream_generator(seed_sequence, stream_index)
+        agents = dict.fromkeys(player.agent for player in self._players if player.agent is not None)
+        for stream_index, agent in enumerate(agents, start=len(self._players)):
+            agent.rng = stream_generator(seed_sequence, stream_index)
+
     def render(self) -> RenderFrame | list[RenderFrame] | None:
         pass
 
@@ -5,10 +5,10 @@ from config.common import (
     BASE_COLORS,
     JESTER_NAME,
     MAGICIAN_NAME,
-    NUMBER_OF_CARDS_PER_PLAYER,
-    TRUMP_COLOR,
 )
+from wizard.base_game.bitboard import COLOR_MASKS, merge_masks
 from wizard.base_game.card import Card
+from wizard.base_game.card_id import COLOR_INDEX
 from wizard.base_game.game import Game
 from wizard.base_game.played_card import PlayedCard
 from wizard.base_game.player.player import Player
@@ -18,10 +18,15 @@ from wizard.rl_pipeline.features.data_cls import (
     GenericFeatures,
     GenericObjectiveContextFeatures,
 )
+from wizard.rl_pipeline.features.used_features import (
+    check_number_of_players_is_supported,
+    prediction_feature_name,
+)
 
 
 class ComputeGenericFeatures:
     def __init__(self, game: Game, player: Player):
+        check_number_of_players_is_supported(game.config)
         self._game = game
         self._player = player
 
@@ -45,7 +50,7 @@ class ComputeGenericFeatures:
     def _compute_base_card_feature(self, card: Card):
         return {
             "IS_PLAYABLE": card in self._player.card_play_policy(self._player).playable_cards(),
-            "IS_TRUMP": card.color == TRUMP_COLOR,
+            "IS_TRUMP": card.color == self._game.config.trump_color,
             "IS_MAGICIAN": card.special_card == MAGICIAN_NAME,
             "IS_JESTER": card.special_card == JESTER_NAME,
             "COLOR": (BASE_COLORS.index(card.color) + 1) / 4 if card.color else 0,  # TODO: Workaround
@@ -104,7 +109,8 @@ class ComputeGenericFeatures:
             NUMBER_CARDS_REMAINING_IN_OTHER_PLAYERS_HANDS=len(self.remaining_cards_in_other_players_hand),
             NUMBER_CARDS_REMAINING_IN_PLAYER_HAND=len(self._player.cards),
             NUMBER_CARDS_REMAINING_PER_COLOR={
-                color: len([card for card in self.remaining_cards if card.color == color]) for color in BASE_COLORS
+                color: (self.remaining_cards_mask & COLOR_MASKS[COLOR_INDEX[color]]).bit_count()
+                for color in BASE_COLORS
             },
             NUMBER_CARDS_REMAINING_IN_HAND_PER_COLOR={
                 color: len([card for card in self._player.cards if card.color == color]) for color in BASE_COLORS
@@ -123,9 +129,9 @@ class ComputeGenericFeatures:
                 if self._game.state.predictions[self._player] is not None
                 else 0
             ),
-            TOTAL_NUMBER_OF_ROUNDS=NUMBER_OF_CARDS_PER_PLAYER,
+            TOTAL_NUMBER_OF_ROUNDS=self._game.config.number_of_cards_per_player,
             IS_PLAYER_STARTING=self._game.next_player_playing is self._player,
-            PLAYER_POSITION=self._game.ordered_list_players.index(self._player),
+            PLAYER_POSITION=self._game.position_of(self._player),
             IS_TERMINAL=not self._player.cards,
             IS_PREDICTION_STEP=(
                 1 if any([prediction is None for prediction in self._game.state.predictions.values()]) else -1
@@ -135,21 +141,12 @@ class ComputeGenericFeatures:
                 if self._player.prediction_policy(self._player).forbidden_prediction() is not None
                 else -1
             ),
-            PLAYER_0_PREDICTION=(
-                self._game.state.predictions[self._game.initial_ordered_list_players[0]]
-                if self._game.state.predictions[self._game.initial_ordered_list_players[0]] is not None
-                else -1
-            ),
-            PLAYER_1_PREDICTION=(
-                self._game.state.predictions[self._game.initial_ordered_list_players[1]]
-                if self._game.state.predictions[self._game.initial_ordered_list_players[1]] is not None
-                else -1
-            ),
-            PLAYER_2_PREDICTION=(
-                self._game.state.predictions[self._game.initial_ordered_list_players[1]]
-                if self._game.state.predictions[self._game.initial_ordered_list_players[1]] is not None
-                else -1
-            ),
+            **{
+                prediction_feature_name(seat): (
+                    self._game.state.predictions[player] if self._game.state.predictions[player] is not None else -1
+                )
+                for seat, player in enumerate(self._game.initial_ordered_list_players)
+            },
         )
 
     @cached_property
@@ -161,9 +158,13 @@ class ComputeGenericFeatures:
         remaining_cards_in_deck = self._game.definition.deck.cards
         return remaining_cards_in_deck + self.remaining_cards_in_other_players_hand
 
+    @cached_property
+    def remaining_cards_mask(self) -> int:
+        return merge_masks(self._game.definition.deck.mask, self._game.remaining_cards_mask & ~self._player.hand_mask)
+
     @cached_property
     def remaining_trump_cards(self):
-        return [c for c in self.remaining_cards if c.color == TRUMP_COLOR]
+        return [c for c in self.remaining_cards if c.color == self._game.config.trump_color]
 
     @cached_property
     def remaining_special_cards(self):
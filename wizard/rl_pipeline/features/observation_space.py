@@ -1,24 +1,31 @@
 from gymnasium.spaces import Discrete, Sequence, Tuple
 
 from config.common import NUMBER_OF_UNIQUE_CARDS
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG, GameConfig
 from wizard.rl_pipeline.features.data_cls import (
     GenericCardsContextFeatures,
     GenericCardSpecificFeatures,
     GenericObjectiveContextFeatures,
 )
-from wizard.rl_pipeline.features.used_features import USED_FEATURES
+from wizard.rl_pipeline.features.used_features import build_used_features
 
-OBSERVATION_SPACE = Tuple(
-    (
-        Sequence(
-            Tuple(
-                (
-                    Discrete(NUMBER_OF_UNIQUE_CARDS),
-                    Tuple([feat.space for feat in USED_FEATURES if feat.group == GenericCardSpecificFeatures]),
-                ),
-            )
-        ),
-        Tuple([feat.space for feat in USED_FEATURES if feat.group == GenericCardsContextFeatures]),
-        Tuple([feat.space for feat in USED_FEATURES if feat.group == GenericObjectiveContextFeatures]),
+
+def build_observation_space(config: GameConfig = DEFAULT_GAME_CONFIG) -> Tuple:
+    used_features = build_used_features(config)
+    return Tuple(
+        (
+            Sequence(
+                Tuple(
+                    (
+                        Discrete(NUMBER_OF_UNIQUE_CARDS),
+                        Tuple([feat.space for feat in used_features if feat.group == GenericCardSpecificFeatures]),
+                    ),
+                )
+            ),
+            Tuple([feat.space for feat in used_features if feat.group == GenericCardsContextFeatures]),
+            Tuple([feat.space for feat in used_features if feat.group == GenericObjectiveContextFeatures]),
+        )
     )
-)
+
+
+OBSERVATION_SPACE = build_observation_space()
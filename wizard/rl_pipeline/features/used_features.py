@@ -1,11 +1,7 @@
 from gymnasium.spaces import Discrete
 
-from config.common import (
-    NUMBER_CARDS_PER_COLOR,
-    NUMBER_OF_CARDS_PER_PLAYER,
-    NUMBER_OF_COLORS,
-    NUMBER_OF_PLAYERS,
-)
+from config.common import NUMBER_CARDS_PER_COLOR, NUMBER_OF_COLORS
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG, GameConfig
 from wizard.rl_pipeline.features.data_cls import (
     FeatureDescription,
     GenericCardsContextFeatures,
@@ -13,80 +9,97 @@ from wizard.rl_pipeline.features.data_cls import (
     GenericObjectiveContextFeatures,
 )
 
-USED_FEATURES = [
-    FeatureDescription("IS_PLAYABLE", Discrete(2), group=GenericCardSpecificFeatures),
-    FeatureDescription("IS_TRUMP", Discrete(2), group=GenericCardSpecificFeatures),
-    FeatureDescription("IS_MAGICIAN", Discrete(2), group=GenericCardSpecificFeatures),
-    FeatureDescription("IS_JESTER", Discrete(2), group=GenericCardSpecificFeatures),
-    FeatureDescription("COLOR", Discrete(NUMBER_OF_COLORS + 1), group=GenericCardSpecificFeatures),
-    FeatureDescription(
-        "NUMBER",
-        Discrete(NUMBER_CARDS_PER_COLOR + 1),
-        group=GenericCardSpecificFeatures,
-    ),
-    FeatureDescription("CAN_WIN_CURRENT_SUB_ROUND", Discrete(2), group=GenericCardSpecificFeatures),
-    FeatureDescription("WILL_WIN_CURRENT_SUB_ROUND", Discrete(2), group=GenericCardSpecificFeatures),
-    # FeatureDescription(
-    #     "NUMBER_SUPERIOR_CARDS_REMAINING_SAME_COLOR",
-    #     Discrete(NUMBER_CARDS_PER_COLOR + 1),
-    #     group=GenericCardSpecificFeatures,
-    # ),
-    # FeatureDescription(
-    #     "NUMBER_SUPERIOR_CARDS_REMAINING_AMONG_SPECIAL_TRUMP_AND_SAME_COLOR",
-    #     Discrete(NUMBER_CARDS_PER_COLOR * 2 + 1),
-    #     group=GenericCardSpecificFeatures,
-    # ),
-    FeatureDescription(
-        "NUMBER_CARDS_REMAINING_IN_PLAYER_HAND",
-        Discrete(NUMBER_OF_CARDS_PER_PLAYER + 1),
-        group=GenericCardsContextFeatures,
-    ),
-    FeatureDescription(
-        "NUMBER_ROUNDS_TO_WIN",
-        Discrete(NUMBER_OF_CARDS_PER_PLAYER + 1),
-        group=GenericObjectiveContextFeatures,
-    ),
-    FeatureDescription(
-        "NUMBER_ROUNDS_ALREADY_WON",
-        Discrete(NUMBER_OF_CARDS_PER_PLAYER + 1),
-        group=GenericObjectiveContextFeatures,
-    ),
-    FeatureDescription(
-        "IS_PLAYER_STARTING",
-        Discrete(2),
-        group=GenericObjectiveContextFeatures,
-    ),
-    FeatureDescription(
-        "PLAYER_POSITION",
-        Discrete(NUMBER_OF_PLAYERS),
-        group=GenericObjectiveContextFeatures,
-    ),
-    FeatureDescription(
-        "IS_TERMINAL",
-        Discrete(2),
-        group=GenericObjectiveContextFeatures,
-    ),
-    FeatureDescription(
-        "IS_PREDICTION_STEP",
-        Discrete(2),
-        group=GenericObjectiveContextFeatures,
-    ),
-    FeatureDescription(
-        "PLAYER_0_PREDICTION",
-        Discrete(NUMBER_OF_CARDS_PER_PLAYER + 1),
-        group=GenericObjectiveContextFeatures,
-    ),
-    FeatureDescription(
-        "PLAYER_1_PREDICTION",
-        Discrete(NUMBER_OF_CARDS_PER_PLAYER + 1),
-        group=GenericObjectiveContextFeatures,
-    ),
-    FeatureDescription(
-        "PLAYER_2_PREDICTION",
-        Discrete(NUMBER_OF_CARDS_PER_PLAYER + 1),
-        group=GenericObjectiveContextFeatures,
-    ),
-]
+# GenericObjectiveContextFeatures has one PLAYER_<seat>_PREDICTION field per seat of the learned games
+NUMBER_OF_SEATS_WITH_PREDICTION_FEATURE = 3
+
+
+class UnsupportedNumberOfPlayers(Exception):
+    pass
+
+
+def prediction_feature_name(seat: int) -> str:
+    return f"PLAYER_{seat}_PREDICTION"
+
+
+def check_number_of_players_is_supported(config: GameConfig) -> None:
+    if config.number_of_players != NUMBER_OF_SEATS_WITH_PREDICTION_FEATURE:
+        raise UnsupportedNumberOfPlayers(
+            f"Features hold the predictions of {NUMBER_OF_SEATS_WITH_PREDICTION_FEATURE} seats, "
+            f"not {config.number_of_players}"
+        )
+
+
+def build_used_features(config: GameConfig = DEFAULT_GAME_CONFIG) -> list[FeatureDescription]:
+    check_number_of_players_is_supported(config)
+    return [
+        FeatureDescription("IS_PLAYABLE", Discrete(2), group=GenericCardSpecificFeatures),
+        FeatureDescription("IS_TRUMP", Discrete(2), group=GenericCardSpecificFeatures),
+        FeatureDescription("IS_MAGICIAN", Discrete(2), group=GenericCardSpecificFeatures),
+        FeatureDescription("IS_JESTER", Discrete(2), group=GenericCardSpecificFeatures),
+        FeatureDescription("COLOR", Discrete(NUMBER_OF_COLORS + 1), group=GenericCardSpecificFeatures),
+        FeatureDescription(
+            "NUMBER",
+            Discrete(NUMBER_CARDS_PER_COLOR + 1),
+            group=GenericCardSpecificFeatures,
+        ),
+        FeatureDescription("CAN_WIN_CURRENT_SUB_ROUND", Discrete(2), group=GenericCardSpecificFeatures),
+        FeatureDescription("WILL_WIN_CURRENT_SUB_ROUND", Discrete(2), group=GenericCardSpecificFeatures),
+        # FeatureDescription(
+        #     "NUMBER_SUPERIOR_CARDS_REMAINING_SAME_COLOR",
+        #     Discrete(NUMBER_CARDS_PER_COLOR + 1),
+        #     group=GenericCardSpecificFeatures,
+        # ),
+        # FeatureDescription(
+        #     "NUMBER_SUPERIOR_CARDS_REMAINING_AMONG_SPECIAL_TRUMP_AND_SAME_COLOR",
+        #     Discrete(NUMBER_CARDS_PER_COLOR * 2 + 1),
+        #     group=GenericCardSpecificFeatures,
+        # ),
+        FeatureDescription(
+            "NUMBER_CARDS_REMAINING_IN_PLAYER_HAND",
+            Discrete(config.number_of_cards_per_player + 1),
+            group=GenericCardsContextFeatures,
+        ),
+        FeatureDescription(
+            "NUMBER_ROUNDS_TO_WIN",
+            Discrete(config.number_of_cards_per_player + 1),
+            group=GenericObjectiveContextFeatures,
+        ),
+        FeatureDescription(
+            "NUMBER_ROUNDS_ALREADY_WON",
+            Discrete(config.number_of_cards_per_player + 1),
+            group=GenericObjectiveContextFeatures,
+        ),
+        FeatureDescription(
+            "IS_PLAYER_STARTING",
+            Discrete(2),
+            group=GenericObjectiveContextFeatures,
+        ),
+        FeatureDescription(
+            "PLAYER_POSITION",
+            Discrete(config.number_of_players),
+            group=GenericObjectiveContextFeatures,
+        ),
+        FeatureDescription(
+            "IS_TERMINAL",
+            Discrete(2),
+            group=GenericObjectiveContextFeatures,
+        ),
+        FeatureDescription(
+            "IS_PREDICTION_STEP",
+            Discrete(2),
+            group=GenericObjectiveContextFeatures,
+        ),
+    ] + [
+        FeatureDescription(
+            prediction_feature_name(seat),
+            Discrete(config.number_of_cards_per_player + 1),
+            group=GenericObjectiveContextFeatures,
+        )
+        for seat in range(config.number_of_players)
+    ]
+
+
+USED_FEATURES = build_used_features()
 
 NUMBER_FEATURES_PER_GROUP = {
     group.__name__: len([feat for feat in USED_FEATURES if feat.group == group])
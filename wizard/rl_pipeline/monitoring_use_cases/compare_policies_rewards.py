@@ -1,9 +1,12 @@
 from torch.utils.tensorboard import SummaryWriter
 
-from config.common import NUMBER_OF_PLAYERS
 from wizard.base_game.deck import Deck
-from wizard.base_game.player.player import Player, MaxRandomPlayer
-from wizard.rl_pipeline.monitoring_use_cases.monitoring_use_case import MonitoringUseCase
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG, GameConfig
+from wizard.base_game.player.player import MaxRandomPlayer, Player
+from wizard.base_game.random_streams import Seed, as_seed_sequence, stream_generator
+from wizard.rl_pipeline.monitoring_use_cases.monitoring_use_case import (
+    MonitoringUseCase,
+)
 from wizard.simulation.simulate_pre_defined_games import SimulatePreDefinedGames
 
 
@@ -16,12 +19,20 @@ class ComparePoliciesRewards(MonitoringUseCase):
         challenger_players_with_label: dict[str, Player],
         starting_player_position: int | None = None,
         tensorboard_name: str | None = None,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+        seed: Seed = None,
     ):
         super().__init__(frequency, writer, tensorboard_name)
-        self._decks = [Deck() for _ in range(number_of_simulated_games)]
+        # One stream per deck, then one per other player
+        seed = as_seed_sequence(seed)
+        self._decks = [Deck(rng=stream_generator(seed, index)) for index in range(number_of_simulated_games)]
         self._challenger_players_with_label = challenger_players_with_label
-        self._other_players = [MaxRandomPlayer(i) for i in range(1, NUMBER_OF_PLAYERS)]
+        self._other_players = [
+            MaxRandomPlayer(i, rng=stream_generator(seed, number_of_simulated_games + i))
+            for i in range(1, config.number_of_players)
+        ]
         self._starting_player_position = starting_player_position
+        self._config = config
 
     def execute(self, epoch: int, *args, **kwargs) -> None:
         output = {}
@@ -29,6 +40,10 @@ class ComparePoliciesRewards(MonitoringUseCase):
             players = [challenger_player] + self._other_players
             starting_player = players[self._starting_player_position] if self._starting_player_position else None
             output[name] = SimulatePreDefinedGames(
-                decks=self._decks, players=players, learning_player=challenger_player, starting_player=starting_player
+                decks=self._decks,
+                players=players,
+                learning_player=challenger_player,
+                starting_player=starting_player,
+                config=self._config,
             ).execute()
         self._writer.add_scalars(self._tensorboard_name, output, epoch)
@@ -0,0 +1,143 @@
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from wizard.base_game.bitboard import (
+    add_card_to_mask,
+    mask_to_card_ids,
+    playable_mask,
+    remove_card_from_mask,
+)
+from wizard.base_game.card_id import lead_color_index, trick_winner_position
+from wizard.base_game.count_points import CountPoints, point_range
+from wizard.base_game.game import Game
+from wizard.base_game.game_config import GameConfig
+from wizard.base_game.player.player import Player
+from wizard.search.hidden_hand_sampler import HiddenHandSampler
+
+
+class DealState:
+    """
+    Card-play phase of a deal with every hand known, as bitmasks indexed by seat, the seats following
+    Game.definition.players. Cards are played and undone in place, which is what the searches need.
+    """
+
+    def __init__(
+        self,
+        hand_masks: List[int],
+        leader: int,
+        trick_card_ids: List[int],
+        tricks_won: List[int],
+        predictions: List[int],
+        config: GameConfig,
+    ):
+        self.hand_masks = hand_masks
+        self.leader = leader
+        self.trick_card_ids = trick_card_ids
+        self.tricks_won = tricks_won
+        self.predictions = predictions
+        self.config = config
+        self.number_of_players = config.number_of_players
+        self._undo_stack: List[Tuple[int, int, List[int]]] = []
+
+    @classmethod
+    def from_game(cls, game: Game) -> "DealState":
+        players = game.definition.players
+        return cls(
+            hand_masks=[player.hand_mask for player in players],
+            leader=players.index(game.state.round_specifics.starting_player),
+            trick_card_ids=[played_card.card.id for played_card in game.state.round_specifics.turn_history],
+            tricks_won=[game.state.number_of_turns_won[player] for player in players],
+            predictions=[game.state.predictions[player] for player in players],
+            config=game.config,
+        )
+
+    def copy(self) -> "DealState":
+        return DealState(
+            hand_masks=self.hand_masks.copy(),
+            leader=self.leader,
+            trick_card_ids=self.trick_card_ids.copy(),
+            tricks_won=self.tricks_won.copy(),
+            predictions=self.predictions,
+            config=self.config,
+        )
+
+    @property
+    def next_player(self) -> int:
+        return (self.leader + len(self.trick_card_ids)) % self.number_of_players
+
+    @property
+    def is_terminal(self) -> bool:
+        return not self.trick_card_ids and not any(self.hand_masks)
+
+    def legal_card_ids(self) -> List[int]:
+        """Distinct ids of the cards the next player may play, copies of special cards being the same move"""
+        mask = playable_mask(self.hand_masks[self.next_player], lead_color_index(self.trick_card_ids))
+        return list(dict.fromkeys(mask_to_card_ids(mask)))
+
+    def play(self, card_id: int) -> None:
+        player = self.next_player
+        self.hand_masks[player] = remove_card_from_mask(self.hand_masks[player], card_id)
+        self.trick_card_ids.append(card_id)
+        if len(self.trick_card_ids) < self.number_of_players:
+            self._undo_stack.append((player, self.leader, []))
+            return
+        winner = (
+            self.leader + trick_winner_position(self.trick_card_ids, trump_color_index=self.config.trump_color_index)
+        ) % self.number_of_players
+        self._undo_stack.append((player, self.leader, self.trick_card_ids))
+        self.tricks_won[winner] += 1
+        self.leader = winner
+        self.trick_card_ids = []
+
+    def undo(self) -> None:
+        """Takes back the last card played"""
+        player, leader, completed_trick_card_ids = self._undo_stack.pop()
+        if completed_trick_card_ids:
+            self.tricks_won[self.leader] -= 1
+            self.trick_card_ids = completed_trick_card_ids
+        self.leader = leader
+        self.hand_masks[player] = add_card_to_mask(self.hand_masks[player], self.trick_card_ids.pop())
+
+    def scores(self) -> List[int]:
+        return [
+            CountPoints.count_points_single_prediction(prediction, number_of_turns_won)
+            for prediction, number_of_turns_won in zip(self.predictions, self.tricks_won)
+        ]
+
+    def normalized_scores(self) -> List[float]:
+        """Scores mapped to [0, 1], the reward range of the searches"""
+        lowest_score, highest_score = point_range(self.config.number_of_cards_per_player)
+        return [(score - lowest_score) / (highest_score - lowest_score) for score in self.scores()]
+
+
+class InformationSet:
+    """What one seat knows about a DealState: its own hand, every card played and the colors others are out of"""
+
+    def __init__(self, deal_state: DealState, sampler: HiddenHandSampler):
+        self.observer = sampler.observer
+        self.deal_state = deal_state
+        self.sampler = sampler
+
+    @classmethod
+    def from_game(cls, game: Game, observer: Player, sampler: Optional[HiddenHandSampler] = None) -> "InformationSet":
+        """sampler, when following the deal already, saves building one from the game"""
+        deal_state = DealState.from_game(game)
+        # The other hands are not known, determinize deals them
+        deal_state.hand_masks = [
+            hand_mask if player is observer else 0
+            for player, hand_mask in zip(game.definition.players, deal_state.hand_masks)
+        ]
+        return cls(deal_state=deal_state, sampler=sampler or HiddenHandSampler.from_game(game, observer))
+
+    def determinize(self, rng: np.random.Generator) -> DealState:
+        return next(self.determinizations(rng, number_of_determinizations=1))
+
+    def determinizations(self, rng: np.random.Generator, number_of_determinizations: int) -> Iterator[DealState]:
+        """DealStates with the unseen cards dealt to the other seats, drawn in one call to the sampler"""
+        hand_masks = self.sampler.hand_masks(self.sampler.sample(rng, number_of_determinizations)).tolist()
+        for determinized_hand_masks in hand_masks:
+            deal_state = self.deal_state.copy()
+            determinized_hand_masks[self.observer] = deal_state.hand_masks[self.observer]
+            deal_state.hand_masks = determinized_hand_masks
+            yield deal_state
@@ -0,0 +1,173 @@
+import math
+from typing import Callable, Dict, List, Tuple
+
+from wizard.base_game.bitboard import CARD_ID_MASK
+from wizard.base_game.card_id import (
+    CARD_COLOR_INDEX,
+    NO_COLOR_INDEX,
+    TRICK_RANKS_BY_TRUMP,
+    lead_color_index,
+)
+from wizard.base_game.count_points import CountPoints
+from wizard.base_game.game import Game
+from wizard.search.deal_state import DealState
+
+# Lower and upper bounds of the value of a position, keyed on its remaining hands, leader, trick and tricks won
+TranspositionTable = Dict[Tuple, Tuple[float, float]]
+
+
+class DoubleDummySolver:
+    """
+    Exact values of the card-play phase with every hand known. A seat's value is what it can force whatever the
+    others play, found by alpha-beta against the other seats playing together, with a transposition table per
+    objective and the cards strongest in the trick tried first.
+    """
+
+    def __init__(self, deal_state: DealState):
+        self._deal_state = deal_state.copy()
+        self._trick_ranks = TRICK_RANKS_BY_TRUMP[deal_state.config.trump_color_index]
+        self._tables: Dict[Tuple[str, int], TranspositionTable] = {}
+
+    @classmethod
+    def from_game(cls, game: Game) -> "DoubleDummySolver":
+        return cls(DealState.from_game(game))
+
+    def forced_tricks(self, seat: int) -> int:
+        """Number of tricks of the deal, including those already won, the seat is sure to end with"""
+        return self._solve(
+            "tricks", seat, lambda number_of_tricks_won: number_of_tricks_won, is_additive_in_tricks=True
+        )
+
+    def forced_tricks_by_seat(self) -> List[int]:
+        return [self.forced_tricks(seat) for seat in range(self._deal_state.number_of_players)]
+
+    def forced_score(self, seat: int) -> int:
+        """Points the seat is sure to score given its prediction"""
+        prediction = self._deal_state.predictions[seat]
+        return self._solve(
+            "score",
+            seat,
+            lambda number_of_tricks_won: CountPoints.count_points_single_prediction(prediction, number_of_tricks_won),
+            is_additive_in_tricks=False,
+        )
+
+    def _solve(
+        self, objective: str, seat: int, value_of_tricks_won: Callable[[int], int], is_additive_in_tricks: bool
+    ) -> int:
+        """
+        An objective additive in tricks is worth the tricks already won plus those to come, its table then holds
+        the value of the tricks to come only, shared by positions that differ by the tricks already won.
+        """
+        table = self._tables.setdefault((objective, seat), {})
+        tricks_won = self._deal_state.tricks_won[seat]
+        reachable_values = sorted(
+            {
+                value_of_tricks_won(tricks_won + tricks_to_come)
+                for tricks_to_come in range(self._number_of_tricks_left + 1)
+            }
+        )
+        # Null-window searches for each next reachable value are far narrower than a single full-window search
+        value = reachable_values[0]
+        for next_value in reachable_values[1:]:
+            bound = self._alpha_beta(
+                seat, value_of_tricks_won, is_additive_in_tricks, table, next_value - 1, next_value
+            )
+            if bound < next_value:
+                break
+            value = next_value
+        return value
+
+    def _alpha_beta(
+        self,
+        seat: int,
+        value_of_tricks_won: Callable[[int], int],
+        is_additive_in_tricks: bool,
+        table: TranspositionTable,
+        alpha: float,
+        beta: float,
+    ) -> float:
+        deal_state = self._deal_state
+        if deal_state.is_terminal:
+            return value_of_tricks_won(deal_state.tricks_won[seat])
+        # Only the tricks of the seat matter to its value
+        offset = deal_state.tricks_won[seat] if is_additive_in_tricks else 0
+        key = (
+            tuple(deal_state.hand_masks),
+            deal_state.leader,
+            tuple(deal_state.trick_card_ids),
+            None if is_additive_in_tricks else deal_state.tricks_won[seat],
+        )
+        lower_bound, upper_bound = table.get(key, (-math.inf, math.inf))
+        lower_bound, upper_bound = lower_bound + offset, upper_bound + offset
+        if lower_bound >= beta:
+            return lower_bound
+        if upper_bound <= alpha:
+            return upper_bound
+        alpha, beta = max(alpha, lower_bound), min(beta, upper_bound)
+        window_alpha, window_beta = alpha, beta
+
+        is_maximizing = deal_state.next_player == seat
+        best_value = -math.inf if is_maximizing else math.inf
+        for card_id in self._ordered_card_ids():
+            deal_state.play(card_id)
+            value = self._alpha_beta(seat, value_of_tricks_won, is_additive_in_tricks, table, alpha, beta)
+            deal_state.undo()
+            if is_maximizing:
+                best_value = max(best_value, value)
+                alpha = max(alpha, best_value)
+            else:
+                best_value = min(best_value, value)
+                beta = min(beta, best_value)
+            if alpha >= beta:
+                break
+
+        if best_value <= window_alpha:
+            upper_bound = min(upper_bound, best_value)
+        if best_value >= window_beta:
+            lower_bound = max(lower_bound, best_value)
+        if window_alpha < best_value < window_beta:
+            lower_bound = upper_bound = best_value
+        table[key] = (lower_bound - offset, upper_bound - offset)
+        return best_value
+
+    @property
+    def _number_of_tricks_left(self) -> int:
+        deal_state = self._deal_state
+        return (sum(hand_mask.bit_count() for hand_mask in deal_state.hand_masks) + len(deal_state.trick_card_ids)) // (
+            deal_state.number_of_players
+        )
+
+    def _ordered_card_ids(self) -> List[int]:
+        """
+        Legal cards by decreasing rank in the trick, a lead being ranked in its own color. Cards of a color with
+        no card left in play between them win and lose the same tricks, only the highest of them is kept.
+        """
+        deal_state = self._deal_state
+        next_player = deal_state.next_player
+        in_play_mask = 0
+        for seat, hand_mask in enumerate(deal_state.hand_masks):
+            if seat != next_player:
+                in_play_mask |= hand_mask
+        for card_id in deal_state.trick_card_ids:
+            if CARD_COLOR_INDEX[card_id] != NO_COLOR_INDEX:
+                in_play_mask |= CARD_ID_MASK[card_id]
+        card_ids: List[int] = []
+        for card_id in deal_state.legal_card_ids():  # Increasing ids, hence numbers within a color
+            if (
+                card_ids
+                and CARD_COLOR_INDEX[card_id] != NO_COLOR_INDEX
+                and CARD_COLOR_INDEX[card_id] == CARD_COLOR_INDEX[card_ids[-1]]
+                and not in_play_mask & (CARD_ID_MASK[card_id] - CARD_ID_MASK[card_ids[-1]])
+            ):
+                card_ids[-1] = card_id
+            else:
+                card_ids.append(card_id)
+
+        trick_color_index = lead_color_index(deal_state.trick_card_ids)
+        return sorted(
+            card_ids,
+            key=lambda card_id: self._trick_ranks[
+                CARD_COLOR_INDEX[card_id] if trick_color_index == NO_COLOR_INDEX else trick_color_index
+            ][card_id],
+            reverse=True,
+        )
@@ -0,0 +1,246 @@
+from math import comb
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from wizard.base_game.bitboard import (
+    CARD_ID_MASK,
+    FULL_DECK_MASK,
+    SLOT_CARD_ID,
+    CardNotInMask,
+    cards_to_mask,
+)
+from wizard.base_game.card_id import (
+    CARD_COLOR_INDEX,
+    COLOR_INDEX,
+    NO_COLOR_INDEX,
+    lead_color_index,
+)
+from wizard.base_game.game import Game
+from wizard.base_game.player.player import Player
+
+SLOT_COLOR_INDEXES = np.array([CARD_COLOR_INDEX[card_id] for card_id in SLOT_CARD_ID], dtype=np.int8)
+
+
+class NoConsistentDeal(Exception):
+    pass
+
+
+class HiddenHandSampler:
+    """
+    Deals the cards an observer has not seen to the other seats of a deal, consistently with the colors each seat is
+    known to be out of. It follows the deal through card_played, hence one sampler serves every determinization
+    of the observer until the end of the deal.
+    Colors are gathered in groups of colors allowed to the same seats, and the seats known to be out of a color are
+    the constrained ones. The number of deals completing each choice of group counts of the constrained seats is
+    counted once per state of the deal, so that drawing these counts with their number of deals as weight, then the
+    cards among each group, draws every consistent deal with the same probability.
+    """
+
+    def __init__(
+        self,
+        observer: int,
+        hand_sizes: List[int],
+        unseen_mask: int,
+        void_color_indexes: Sequence[Sequence[int]],
+        trick_card_ids: List[int],
+    ):
+        self.observer = observer
+        self.hand_sizes = hand_sizes
+        self.number_of_players = len(hand_sizes)
+        self._is_color_allowed = np.ones((self.number_of_players, NO_COLOR_INDEX + 1), dtype=bool)
+        for seat, color_indexes in enumerate(void_color_indexes):
+            self._is_color_allowed[seat, list(color_indexes)] = False
+        self._trick_card_ids = trick_card_ids
+        self._set_unseen_mask(unseen_mask)
+        self._group_counts_choices: Dict[Tuple[int, Tuple[int, ...]], Tuple[np.ndarray, np.ndarray, int]] = {}
+
+    @classmethod
+    def from_game(cls, game: Game, observer: Player) -> "HiddenHandSampler":
+        players = game.definition.players
+        seen_card_ids = [game.definition.trump_card_removed.id] + [
+            played_card.card.id
+            for turn in game.state.previous_turns_history + [game.state.round_specifics.turn_history]
+            for played_card in turn
+        ]
+        return cls(
+            observer=players.index(observer),
+            hand_sizes=[len(player.cards) for player in players],
+            unseen_mask=FULL_DECK_MASK ^ cards_to_mask(seen_card_ids + [card.id for card in observer.cards]),
+            void_color_indexes=[
+                [COLOR_INDEX[color] for color in player.colors_known_to_not_be_in_hand] for player in players
+            ],
+            trick_card_ids=[played_card.card.id for played_card in game.state.round_specifics.turn_history],
+        )
+
+    @property
+    def void_color_indexes(self) -> List[List[int]]:
+        return [np.flatnonzero(~is_color_allowed).tolist() for is_color_allowed in self._is_color_allowed]
+
+    def card_played(self, seat: int, card_id: int) -> None:
+        """Updates the unseen cards, the hand sizes and the colors known to be missing after a card is played"""
+        trick_color_index = lead_color_index(self._trick_card_ids)
+        if trick_color_index != NO_COLOR_INDEX and CARD_COLOR_INDEX[card_id] not in (NO_COLOR_INDEX, trick_color_index):
+            self._is_color_allowed[seat, trick_color_index] = False
+        self._group_counts_choices = {}
+        if seat != self.observer:
+            # Seen copies of a card take its lowest slots, as in from_game
+            copies = self.unseen_mask & CARD_ID_MASK[card_id]
+            if not copies:
+                raise CardNotInMask
+            self._set_unseen_mask(self.unseen_mask ^ (copies & -copies))
+        self.hand_sizes[seat] -= 1
+        self._trick_card_ids.append(card_id)
+        if len(self._trick_card_ids) == self.number_of_players:
+            self._trick_card_ids = []
+
+    def columns(self, seat: int) -> slice:
+        """Columns of the seat in the deals drawn by sample"""
+        start = sum(self.hand_sizes[other_seat] for other_seat in range(seat) if other_seat != self.observer)
+        return slice(start, start + self.hand_sizes[seat])
+
+    def sample(self, rng: np.random.Generator, number_of_deals: int) -> np.ndarray:
+        """
+        Slots of the cards dealt to the seats other than the observer, by increasing seat, one deal per row. Deals are
+        drawn uniformly among the deals consistent with the hand sizes and the colors each seat is known to be out of.
+        """
+        constrained_seats = [
+            seat
+            for seat in range(self.number_of_players)
+            if seat != self.observer and self.hand_sizes[seat] and not self._is_color_allowed[seat].all()
+        ]
+        # group_is_allowed[group, index of the constrained seat]
+        group_is_allowed, color_groups = np.unique(
+            self._is_color_allowed[constrained_seats].T, axis=0, return_inverse=True
+        )
+        slot_groups = color_groups.reshape(-1)[self._unseen_color_indexes]
+        number_of_groups = len(group_is_allowed)
+        group_counts = np.zeros((number_of_deals, number_of_groups, len(constrained_seats)), dtype=np.int64)
+        remaining_counts = np.tile(np.bincount(slot_groups, minlength=number_of_groups), (number_of_deals, 1))
+        for index in range(len(constrained_seats)):
+            states, state_of_deals = np.unique(remaining_counts, axis=0, return_inverse=True)
+            for state_index, state in enumerate(states.tolist()):
+                choices, probabilities, number_of_completions = self._group_counts_choices_of(
+                    index, tuple(state), constrained_seats, group_is_allowed
+                )
+                if not number_of_completions:
+                    raise NoConsistentDeal
+                rows = np.flatnonzero(state_of_deals.reshape(-1) == state_index)
+                group_counts[rows, :, index] = choices[rng.choice(len(choices), size=len(rows), p=probabilities)]
+            remaining_counts -= group_counts[:, :, index]
+        return self._deal_group_counts(rng, group_counts, constrained_seats, slot_groups)
+
+    def hand_masks(self, deals: np.ndarray) -> np.ndarray:
+        """Hand masks of the seats for each deal, as unsigned 64-bit integers, the observer's being left empty"""
+        hand_masks = np.zeros((len(deals), self.number_of_players), dtype=np.uint64)
+        slot_masks = np.left_shift(np.uint64(1), deals.astype(np.uint64))
+        for seat in range(self.number_of_players):
+            if seat != self.observer:
+                hand_masks[:, seat] = np.bitwise_or.reduce(slot_masks[:, self.columns(seat)], axis=1)
+        return hand_masks
+
+    def _set_unseen_mask(self, unseen_mask: int) -> None:
+        self.unseen_mask = unseen_mask
+        self._unseen_slots = np.array(
+            [slot for slot in range(len(SLOT_CARD_ID)) if (unseen_mask >> slot) & 1], dtype=np.int64
+        )
+        # Pool of the unseen cards of each color, as the color of every unseen slot
+        self._unseen_color_indexes = SLOT_COLOR_INDEXES[self._unseen_slots]
+
+    def _group_counts_choices_of(
+        self, index: int, remaining_counts: Tuple[int, ...], constrained_seats: List[int], group_is_allowed: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Counts of cards of each group the index-th constrained seat may get out of remaining_counts, their
+        probabilities, proportional to the number of ways to complete them for the next constrained seats, and the
+        number of ways to give their cards to the constrained seats from the index-th one on
+        """
+        key = (index, remaining_counts)
+        if key not in self._group_counts_choices:
+            choices = list(
+                _compositions(
+                    self.hand_sizes[constrained_seats[index]],
+                    [
+                        count if is_allowed else 0
+                        for count, is_allowed in zip(remaining_counts, group_is_allowed[:, index])
+                    ],
+                )
+            )
+            numbers_of_completions = [
+                _number_of_subsets(remaining_counts, choice)
+                * (
+                    1
+                    if index + 1 == len(constrained_seats)
+                    else self._group_counts_choices_of(
+                        index + 1,
+                        tuple(count - taken for count, taken in zip(remaining_counts, choice)),
+                        constrained_seats,
+                        group_is_allowed,
+                    )[2]
+                )
+                for choice in choices
+            ]
+            number_of_completions = sum(numbers_of_completions)
+            self._group_counts_choices[key] = (
+                np.array(choices, dtype=np.int64).reshape(len(choices), len(remaining_counts)),
+                np.array(
+                    [
+                        number / number_of_completions if number_of_completions else 0.0
+                        for number in numbers_of_completions
+                    ]
+                ),
+                number_of_completions,
+            )
+        return self._group_counts_choices[key]
+
+    def _deal_group_counts(
+        self, rng: np.random.Generator, group_counts: np.ndarray, constrained_seats: List[int], slot_groups: np.ndarray
+    ) -> np.ndarray:
+        """
+        Deals group_counts[deal, group, constrained seat] cards of each group to the constrained seats, taken in a
+        random order of the unseen cards, the other cards going to the other seats in the same order
+        """
+        number_of_deals = len(group_counts)
+        order = rng.random((number_of_deals, len(self._unseen_slots))).argsort(axis=1)
+        shuffled_slots = self._unseen_slots[order]
+        shuffled_groups = slot_groups[order]
+        is_group = shuffled_groups[:, :, None] == np.arange(group_counts.shape[1])
+        ranks_in_group = (is_group.cumsum(axis=1) - 1)[is_group].reshape(shuffled_groups.shape)
+        # Constrained seat taking each card: the card of rank r of group g goes to the first seat whose cumulated
+        # count of g exceeds r, the last index standing for the other seats
+        cumulated_counts = np.take_along_axis(group_counts.cumsum(axis=2), shuffled_groups[:, :, None], axis=1)
+        receiving_indexes = (ranks_in_group[:, :, None] >= cumulated_counts).sum(axis=2)
+
+        deals = np.empty((number_of_deals, sum(self.hand_sizes) - self.hand_sizes[self.observer]), dtype=np.int64)
+        unconstrained_columns = []
+        for seat in range(self.number_of_players):
+            if seat == self.observer:
+                continue
+            if seat in constrained_seats:
+                is_received = receiving_indexes == constrained_seats.index(seat)
+                positions = np.argsort(~is_received, axis=1, kind="stable")[:, : self.hand_sizes[seat]]
+                deals[:, self.columns(seat)] = np.take_along_axis(shuffled_slots, positions, axis=1)
+            else:
+                unconstrained_columns.extend(range(self.columns(seat).start, self.columns(seat).stop))
+        is_unconstrained = receiving_indexes == len(constrained_seats)
+        positions = np.argsort(~is_unconstrained, axis=1, kind="stable")[:, : len(unconstrained_columns)]
+        deals[:, unconstrained_columns] = np.take_along_axis(shuffled_slots, positions, axis=1)
+        return deals
+
+
+def _compositions(total: int, bounds: Sequence[int]) -> Iterator[Tuple[int, ...]]:
+    """Tuples of len(bounds) counts summing to total, each at most its bound"""
+    if not bounds:
+        if total == 0:
+            yield ()
+        return
+    for count in range(min(total, bounds[0]) + 1):
+        for rest in _compositions(total - count, bounds[1:]):
+            yield (count,) + rest
+
+
+def _number_of_subsets(counts: Sequence[int], taken_counts: Sequence[int]) -> int:
+    number_of_subsets = 1
+    for count, taken_count in zip(counts, taken_counts):
+        number_of_subsets *= comb(count, taken_count)
+    return number_of_subsets
@@ -0,0 +1,160 @@
+import math
+import time
+import weakref
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from wizard.base_game.game import Game
+from wizard.base_game.player.player import Player
+from wizard.search.deal_state import DealState, InformationSet
+from wizard.search.hidden_hand_sampler import HiddenHandSampler
+
+EXPLORATION = 0.7
+DETERMINIZATION_BATCH_SIZE = 64
+
+
+class SearchBudgetMissing(Exception):
+    pass
+
+
+class Node:
+    __slots__ = ("seat", "children", "number_of_visits", "reward_sum", "number_of_availabilities")
+
+    def __init__(self, seat: int):
+        self.seat = seat  # Seat that played the card leading to this node
+        self.children: Dict[int, "Node"] = {}
+        self.number_of_visits = 0
+        self.reward_sum = 0.0
+        self.number_of_availabilities = 1
+
+    def upper_confidence_bound(self, exploration: float) -> float:
+        return self.reward_sum / self.number_of_visits + exploration * math.sqrt(
+            math.log(self.number_of_availabilities) / self.number_of_visits
+        )
+
+
+class InformationSetMCTS:
+    """
+    Single-observer information set Monte Carlo tree search: every iteration samples the hidden hands, then descends
+    the tree among the moves legal in that sample, selecting by UCB with availability counts. The tree of a deal
+    is kept between the moves of its observer, the root following the cards played meanwhile, and so is the sampler
+    of the hidden hands.
+    """
+
+    def __init__(self, rng: np.random.Generator, exploration: float = EXPLORATION):
+        self._rng = rng
+        self._exploration = exploration
+        self._game_definition: Optional[weakref.ref] = None
+        self._root: Optional[Node] = None
+        self._sampler: Optional[HiddenHandSampler] = None
+        self._played_card_ids: List[int] = []
+
+    def search(
+        self,
+        game: Game,
+        observer: Player,
+        time_budget: Optional[float] = None,
+        number_of_iterations: Optional[int] = None,
+    ) -> int:
+        """Id of the most visited card of the observer once the first of the budgets is spent"""
+        if time_budget is None and number_of_iterations is None:
+            raise SearchBudgetMissing
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        root = self._move_root(game, observer)
+        information_set = InformationSet.from_game(game, observer, sampler=self._sampler)
+
+        iteration = 0
+        while not root.children or (
+            (number_of_iterations is None or iteration < number_of_iterations)
+            and (deadline is None or time.perf_counter() < deadline)
+        ):
+            batch_size = DETERMINIZATION_BATCH_SIZE
+            if number_of_iterations is not None:
+                batch_size = max(1, min(batch_size, number_of_iterations - iteration))
+            for deal_state in information_set.determinizations(self._rng, batch_size):
+                self._iterate(root, deal_state)
+                iteration += 1
+                if deadline is not None and root.children and time.perf_counter() >= deadline:
+                    break
+
+        legal_card_ids = set(information_set.deal_state.legal_card_ids())
+        return max(
+            (card_id for card_id in root.children if card_id in legal_card_ids),
+            key=lambda card_id: root.children[card_id].number_of_visits,
+        )
+
+    @property
+    def root(self) -> Optional[Node]:
+        return self._root
+
+    def _move_root(self, game: Game, observer: Player) -> Node:
+        players = game.definition.players
+        played_cards = [
+            (players.index(played_card.player), played_card.card.id)
+            for turn in game.state.previous_turns_history + [game.state.round_specifics.turn_history]
+            for played_card in turn
+        ]
+        played_card_ids = [card_id for _, card_id in played_cards]
+        # Replaying a deal after Game.reset_game keeps its definition and its tree
+        is_same_deal = (
+            self._game_definition is not None
+            and self._game_definition() is game.definition
+            and self._root is not None
+            and played_card_ids[: len(self._played_card_ids)] == self._played_card_ids
+        )
+        if not is_same_deal:
+            root, self._sampler = None, HiddenHandSampler.from_game(game, observer)
+        else:
+            root = self._root
+            for seat, card_id in played_cards[len(self._played_card_ids) :]:
+                self._sampler.card_played(seat, card_id)
+                if root is not None:
+                    root = root.children.get(card_id)
+        if root is None:
+            root = Node(seat=(players.index(observer) - 1) % len(players))
+        self._game_definition, self._root, self._played_card_ids = weakref.ref(game.definition), root, played_card_ids
+        return root
+
+    def _iterate(self, root: Node, deal_state: DealState) -> None:
+        node = root
+        path = [root]
+        while not deal_state.is_terminal:
+            legal_card_ids = deal_state.legal_card_ids()
+            untried_card_ids = [card_id for card_id in legal_card_ids if card_id not in node.children]
+            for card_id in legal_card_ids:
+                if card_id in node.children:
+                    node.children[card_id].number_of_availabilities += 1
+            if untried_card_ids:
+                card_id = untried_card_ids[self._rng.integers(len(untried_card_ids))]
+                node.children[card_id] = child = Node(seat=deal_state.next_player)
+                deal_state.play(card_id)
+                path.append(child)
+                break
+            card_id = max(
+                legal_card_ids,
+                key=lambda legal_card_id: node.children[legal_card_id].upper_confidence_bound(self._exploration),
+            )
+            node = node.children[card_id]
+            deal_state.play(card_id)
+            path.append(node)
+
+        while not deal_state.is_terminal:
+            legal_card_ids = deal_state.legal_card_ids()
+            deal_state.play(legal_card_ids[self._rng.integers(len(legal_card_ids))])
+
+        rewards = deal_state.normalized_scores()
+        for node in path:
+            node.number_of_visits += 1
+            node.reward_sum += rewards[node.seat]
+
+
+_SEARCHES: "weakref.WeakKeyDictionary[Player, InformationSetMCTS]" = weakref.WeakKeyDictionary()
+
+
+def player_search(player: Player) -> InformationSetMCTS:
+    """Search of the player, kept as long as the player so that its tree is reused from one move to the next"""
+    search = _SEARCHES.get(player)
+    if search is None:
+        search = _SEARCHES[player] = InformationSetMCTS(rng=player.rng)
+    return search
@@ -0,0 +1,17 @@
+import numpy as np
+
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG
+from wizard.simulation.exhaustive.use_cases.hand_strength_table import (
+    HandStrengthTable,
+    HandStrengthTableStorage,
+)
+
+NUMBER_OF_DEALS_PER_HAND = 10_000
+SEED = 0
+
+hand_strength_table = HandStrengthTable.build(
+    config=DEFAULT_GAME_CONFIG,
+    number_of_deals_per_hand=NUMBER_OF_DEALS_PER_HAND,
+    rng=np.random.default_rng(SEED),
+)
+print(HandStrengthTableStorage().save(hand_strength_table))
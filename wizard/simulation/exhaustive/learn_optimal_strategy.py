@@ -1,20 +1,21 @@
-import pandas as pd
-
 from config.common import NUMBER_OF_CARDS_PER_PLAYER, NUMBER_OF_PLAYERS
 from wizard.base_game.deck import Deck
 from wizard.base_game.player.player import DefinedStrategyPlayer
 from wizard.simulation.exhaustive.simulation_result import SimulationResultMetadata
+from wizard.simulation.exhaustive.use_cases.adaptive_trials import AdaptiveTrials
 from wizard.simulation.exhaustive.use_cases.simulation_result_storage import (
     SimulationResultStorage,
     SimulationResultType,
 )
 from wizard.simulation.exhaustive.use_cases.simulator import SimulatorWithOneLearningPlayer
-from wizard.simulation.exhaustive.use_cases.survey_simulation_result import SurveySimulationResult
+from wizard.simulation.exhaustive.use_cases.survey_simulation_result import StreamingSurveySimulationResult
 
 # profiler = Profiler()
 # profiler.start()
 
 NUMBER_TRIALS_EACH_COMBINATION = 500
+# Average budget per combination, spent where the best strategy is still unclear. None spreads it evenly
+ADAPTIVE_TRIALS = AdaptiveTrials()
 
 players = [DefinedStrategyPlayer(identifier=i) for i in range(NUMBER_OF_PLAYERS)]
 learning_player = players[2]
@@ -24,6 +25,7 @@ simulator = SimulatorWithOneLearningPlayer(
     learning_player=learning_player,
     initial_deck=Deck(),
     number_trial_each_combination=NUMBER_TRIALS_EACH_COMBINATION,
+    adaptive_trials=ADAPTIVE_TRIALS,
 )
 
 simulation_result_metadata = SimulationResultMetadata(
@@ -33,20 +35,18 @@ simulation_result_metadata = SimulationResultMetadata(
     number_of_cards_per_player=NUMBER_OF_CARDS_PER_PLAYER,
     total_number_trial=NUMBER_TRIALS_EACH_COMBINATION,
 )
-simulation_result = pd.DataFrame(simulator.simulate())
-
-SimulationResultStorage().save_simulation_result(
-    simulation_result=simulation_result,
-    simulation_result_metadata=simulation_result_metadata,
-    simulation_type=SimulationResultType.ALL_OUTCOME,
-)
-
-
-survey = SurveySimulationResult(
-    simulation_results=simulation_result,
+# Outcomes are written and surveyed one combination at a time instead of being gathered in memory
+survey = StreamingSurveySimulationResult(
     learning_player_id=learning_player.identifier,
     number_of_cards_per_player=NUMBER_OF_CARDS_PER_PLAYER,
 )
+with SimulationResultStorage().open_writer(
+    simulation_result_metadata=simulation_result_metadata,
+    simulation_type=SimulationResultType.ALL_OUTCOME,
+) as writer:
+    for combination_results in simulator.iterate_combination_results():
+        writer.write_combination_results(combination_results)
+        survey.add(combination_results)
 surveyed_simulation_result = survey.compute_optimal_strategy()
 
 SimulationResultStorage().save_simulation_result(
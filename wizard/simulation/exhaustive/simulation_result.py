@@ -1,5 +1,19 @@
+import os
 from dataclasses import dataclass
-from typing import Dict
+from enum import Enum
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG, GameConfig
+
+RESULT_EXTENSION = ".npz"
+LEGACY_RESULT_EXTENSION = ".csv"
+
+
+class SimulationResultType(Enum):
+    ALL_OUTCOME = "all_outcome"
+    SURVEY = "survey"
 
 
 @dataclass
@@ -8,6 +22,61 @@ class SimulationResult:
     tested_combination: str
     combination_played_order: str
     number_of_turns_won: Dict[int, int]
+    weight: float = 1.0  # Probability of the trial when opponent deals are enumerated exactly
+
+
+@dataclass
+class CombinationSimulationResults:
+    """
+    Every outcome simulated for one hand combination, stored column-wise so that it is cheap to send across processes.
+    Row i was played with the order combination_played_orders[combination_played_order_indexes[i]].
+    """
+
+    tested_combination: str
+    combination_played_orders: List[str]
+    player_identifiers: List[int]
+    trial_numbers: np.ndarray
+    combination_played_order_indexes: np.ndarray
+    number_of_turns_won: np.ndarray
+    weights: np.ndarray
+    stopping_reason: Optional[str] = None  # Why sampling stopped, when trials are allocated adaptively
+
+    @classmethod
+    def concatenate(cls, batches: List["CombinationSimulationResults"]) -> "CombinationSimulationResults":
+        """Batches of trials of the same combination, simulated with the same players and orders"""
+        return cls(
+            tested_combination=batches[0].tested_combination,
+            combination_played_orders=batches[0].combination_played_orders,
+            player_identifiers=batches[0].player_identifiers,
+            trial_numbers=np.concatenate([batch.trial_numbers for batch in batches]),
+            combination_played_order_indexes=np.concatenate(
+                [batch.combination_played_order_indexes for batch in batches]
+            ),
+            number_of_turns_won=np.concatenate([batch.number_of_turns_won for batch in batches]),
+            weights=np.concatenate([batch.weights for batch in batches]),
+            stopping_reason=batches[-1].stopping_reason,
+        )
+
+    @property
+    def number_of_trials(self) -> int:
+        return len(np.unique(self.trial_numbers))
+
+    def to_simulation_results(self) -> List[SimulationResult]:
+        return [
+            SimulationResult(
+                trial_number=trial_number,
+                tested_combination=self.tested_combination,
+                combination_played_order=self.combination_played_orders[combination_played_order_index],
+                number_of_turns_won=dict(zip(self.player_identifiers, number_of_turns_won)),
+                weight=weight,
+            )
+            for trial_number, combination_played_order_index, number_of_turns_won, weight in zip(
+                self.trial_numbers.tolist(),
+                self.combination_played_order_indexes.tolist(),
+                self.number_of_turns_won.tolist(),
+                self.weights.tolist(),
+            )
+        ]
 
 
 @dataclass
@@ -17,3 +86,22 @@ class SimulationResultMetadata:
     number_of_players: int
     number_of_cards_per_player: int
     total_number_trial: int
+
+
+def most_relevant_surveyed_simulation_result_path(
+    base_path: str, player_position: int, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> str:
+    """Stored survey of the position with the most trials, without reading it"""
+    folder_path = (
+        f"{base_path}"
+        f"number_of_players={config.number_of_players}/"
+        f"number_cards_per_player={config.number_of_cards_per_player}/"
+        f"learning_player_position={player_position}/"
+        f"{SimulationResultType.SURVEY.value}/"
+    )
+    file_paths = [
+        file_path
+        for file_path in os.listdir(folder_path)
+        if file_path.endswith((RESULT_EXTENSION, LEGACY_RESULT_EXTENSION))
+    ]
+    return folder_path + max(file_paths, key=lambda file_path: int(file_path.split("_")[0]))
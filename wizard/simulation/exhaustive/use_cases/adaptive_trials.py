@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+
+from wizard.simulation.exhaustive.simulation_result import CombinationSimulationResults
+from wizard.simulation.exhaustive.use_cases.survey_simulation_result import (
+    weighted_worst_scores_per_key,
+)
+
+MIN_NUMBER_OF_TRIALS_TO_SETTLE = 2
+
+
+class StoppingReason(Enum):
+    SETTLED = "settled"
+    MAX_TRIALS_REACHED = "max_trials_reached"
+    BUDGET_EXHAUSTED = "budget_exhausted"
+
+
+@dataclass(frozen=True)
+class AdaptiveTrials:
+    """
+    Trials of a combination are drawn by batches until its best (played order, prediction) is statistically settled.
+    The total budget stays number_trial_each_combination per combination: the trials saved on clear-cut combinations
+    go to the close calls, up to max_number_of_trials each.
+    """
+
+    initial_number_of_trials: int = 50
+    batch_number_of_trials: int = 50
+    max_number_of_trials: int = 2000
+    z_score: float = 2.576  # Two-sided 99% confidence intervals
+    tolerance: float = 0.5  # Mean score gap under which two strategies are as good as each other
+
+
+def trial_scores(
+    combination_simulation_results: CombinationSimulationResults, learning_player_id: int, predictions: np.ndarray
+) -> np.ndarray:
+    """
+    Survey statistic of each trial, the worst score over the outcomes of the trial, for every (played order,
+    prediction) of the combination. Returns an array of shape (number_of_orders * number_of_predictions, trials).
+    """
+    results = combination_simulation_results
+    played_orders, played_order_codes = np.unique(results.combination_played_orders, return_inverse=True)
+    row_orders = played_order_codes.reshape(-1)[results.combination_played_order_indexes]
+    _, trial_indexes = np.unique(results.trial_numbers, return_inverse=True)
+    number_of_trials = results.number_of_trials
+    score_sums, _ = weighted_worst_scores_per_key(
+        key_codes=row_orders * number_of_trials + trial_indexes.reshape(-1),
+        trial_numbers=results.trial_numbers,
+        number_of_turns_won=results.number_of_turns_won[:, results.player_identifiers.index(learning_player_id)],
+        weights=np.ones(len(results.trial_numbers)),
+        number_of_keys=len(played_orders) * number_of_trials,
+        predictions=predictions,
+    )
+    return (
+        score_sums.reshape(len(played_orders), number_of_trials, len(predictions))
+        .transpose(0, 2, 1)
+        .reshape(-1, number_of_trials)
+    )
+
+
+def is_settled(scores: np.ndarray, z_score: float, tolerance: float) -> bool:
+    """
+    scores of shape (strategies, trials) share their trials, hence every strategy is compared to the best one on
+    paired differences: the best is settled once each other strategy is either significantly worse, or within
+    tolerance of it with confidence
+    """
+    number_of_trials = scores.shape[1]
+    if number_of_trials < MIN_NUMBER_OF_TRIALS_TO_SETTLE:
+        return False
+    differences = scores[scores.mean(axis=1).argmax()] - scores
+    mean_differences = differences.mean(axis=1)
+    margins = z_score * differences.std(axis=1, ddof=1) / np.sqrt(number_of_trials)
+    return bool(((mean_differences - margins > 0) | (mean_differences + margins <= tolerance)).all())
@@ -0,0 +1,150 @@
+import itertools
+from functools import lru_cache
+from math import comb
+from typing import List, Sequence
+
+import numpy as np
+
+from config.common import (
+    BASE_COLORS,
+    NUMBER_CARDS_PER_COLOR,
+    NUMBER_OF_JESTERS,
+    NUMBER_OF_MAGICIANS,
+    TRUMP_COLOR,
+)
+from wizard.base_game.card import Card
+from wizard.base_game.card_id import (
+    CARD_COLOR_INDEX,
+    CARD_NUMBER,
+    COLOR_INDEX,
+    FIRST_COLORED_CARD_ID,
+    JESTER_ID,
+    MAGICIAN_ID,
+    NUMBER_OF_CARD_IDS,
+)
+
+NO_CLASS = -1
+# The class tables hold every multiset of card ids: about 4M rows for 5 cards, 45M for 6
+MAX_CANONICALIZED_NUMBER_OF_CARDS = 5
+
+
+class TooManyCardsToCanonicalize(Exception):
+    pass
+
+
+class HandCanonicalizer:
+    """
+    Color-isomorphism classes of hands of number_of_cards cards. Trump and special cards are fixed points, while the
+    other colors are relabelled so that their groups of cards come by decreasing size, then decreasing numbers, in the
+    order of the non-trump colors of BASE_COLORS.
+    Every multiset of card ids is ranked in the combinatorial number system and the class and relabelling of each rank
+    are precomputed, so that canonicalizing a hand is a lookup. The tables growing with the number of multisets,
+    hands of more than MAX_CANONICALIZED_NUMBER_OF_CARDS cards are not canonicalized.
+    """
+
+    def __init__(self, number_of_cards: int, trump_color: str = TRUMP_COLOR):
+        if number_of_cards > MAX_CANONICALIZED_NUMBER_OF_CARDS:
+            raise TooManyCardsToCanonicalize(number_of_cards)
+        self.number_of_cards = number_of_cards
+        self.trump_color = trump_color
+        self._other_color_indexes = [COLOR_INDEX[color] for color in BASE_COLORS if color != trump_color]
+        # Images of the non-trump colors, in the order of _other_color_indexes
+        self._permutations = list(itertools.permutations(self._other_color_indexes))
+        self._binomials = np.array(
+            [[comb(n, k) for k in range(number_of_cards + 1)] for n in range(NUMBER_OF_CARD_IDS + number_of_cards)],
+            dtype=np.int64,
+        )
+        self._relabelled_card_ids = self._build_relabelled_card_ids()
+
+        hands = np.fromiter(
+            itertools.chain.from_iterable(
+                itertools.combinations_with_replacement(range(NUMBER_OF_CARD_IDS), number_of_cards)
+            ),
+            dtype=np.int64,
+        ).reshape(-1, number_of_cards)
+        relabellings = self._canonical_relabellings(hands)
+        canonical_ranks = self.hand_ranks(np.sort(self._relabelled_card_ids[relabellings[:, None], hands], axis=1))
+        is_valid = self._is_valid(hands)
+
+        representative_ranks, valid_class_ids = np.unique(canonical_ranks[is_valid], return_inverse=True)
+        # class_ids[rank] and relabellings[rank] for every multiset rank, NO_CLASS for impossible hands
+        self.class_ids = np.full(comb(NUMBER_OF_CARD_IDS + number_of_cards - 1, number_of_cards), NO_CLASS, np.int32)
+        self.relabellings = np.zeros(len(self.class_ids), dtype=np.int8)
+        hand_ranks = self.hand_ranks(hands)
+        self.class_ids[hand_ranks[is_valid]] = valid_class_ids.reshape(-1)
+        self.relabellings[hand_ranks] = relabellings
+        rank_to_hand = np.empty((len(self.class_ids), number_of_cards), dtype=np.int64)
+        rank_to_hand[hand_ranks] = hands
+        self.representatives = rank_to_hand[representative_ranks]
+
+    @property
+    def number_of_classes(self) -> int:
+        return len(self.representatives)
+
+    def hand_ranks(self, sorted_card_ids: np.ndarray) -> np.ndarray:
+        """Colex rank of multisets given as rows of card ids sorted in increasing order"""
+        positions = np.arange(self.number_of_cards)
+        return self._binomials[sorted_card_ids + positions, positions + 1].sum(axis=1)
+
+    def class_id(self, cards: Sequence[Card]) -> int:
+        return int(self.class_ids[self._hand_rank(cards)])
+
+    def canonical_cards(self, cards: Sequence[Card]) -> List[Card]:
+        """Cards of the class representative, in the same order as the given cards"""
+        relabelled_card_ids = self._relabelled_card_ids[self.relabellings[self._hand_rank(cards)]]
+        return [Card.from_id(int(relabelled_card_ids[card.id])) for card in cards]
+
+    def representative_hands(self) -> List[List[Card]]:
+        return [[Card.from_id(card_id) for card_id in hand] for hand in self.representatives.tolist()]
+
+    def _hand_rank(self, cards: Sequence[Card]) -> int:
+        sorted_card_ids = sorted(card.id for card in cards)
+        return int(sum(self._binomials[card_id + i, i + 1] for i, card_id in enumerate(sorted_card_ids)))
+
+    def _build_relabelled_card_ids(self) -> np.ndarray:
+        # _relabelled_card_ids[r, id]: id once the non-trump colors are permuted by the r-th permutation
+        relabelled_card_ids = np.tile(np.arange(NUMBER_OF_CARD_IDS), (len(self._permutations), 1))
+        for relabelling, permutation in enumerate(self._permutations):
+            for card_id in range(FIRST_COLORED_CARD_ID, NUMBER_OF_CARD_IDS):
+                color_index = CARD_COLOR_INDEX[card_id]
+                if color_index in self._other_color_indexes:
+                    new_color_index = permutation[self._other_color_indexes.index(color_index)]
+                    relabelled_card_ids[relabelling, card_id] = (
+                        FIRST_COLORED_CARD_ID + NUMBER_CARDS_PER_COLOR * new_color_index + CARD_NUMBER[card_id] - 1
+                    )
+        return relabelled_card_ids
+
+    def _canonical_relabellings(self, hands: np.ndarray) -> np.ndarray:
+        colors = np.array(CARD_COLOR_INDEX)[hands]
+        numbers = np.array(CARD_NUMBER)[hands]
+        # Sets of numbers of a same size compare like their bitmasks, hence the key size first then bitmask
+        group_keys = np.stack(
+            [
+                (colors == color_index).sum(axis=1) << NUMBER_CARDS_PER_COLOR
+                | np.where(colors == color_index, 1 << np.maximum(numbers - 1, 0), 0).sum(axis=1)
+                for color_index in self._other_color_indexes
+            ],
+            axis=1,
+        )
+        # Group ranked r takes the r-th non-trump color
+        ranks = np.argsort(np.argsort(-group_keys, axis=1, kind="stable"), axis=1)
+        number_of_colors = len(self._other_color_indexes)
+        permutation_ids = np.zeros(number_of_colors**number_of_colors, dtype=np.int8)
+        for index, permutation in enumerate(itertools.permutations(range(number_of_colors))):
+            permutation_ids[np.ravel_multi_index(permutation, (number_of_colors,) * number_of_colors)] = index
+        return permutation_ids[np.ravel_multi_index(tuple(ranks.T), (number_of_colors,) * number_of_colors)]
+
+    @staticmethod
+    def _is_valid(hands: np.ndarray) -> np.ndarray:
+        is_colored = hands >= FIRST_COLORED_CARD_ID
+        has_duplicate_colored_card = (is_colored[:, 1:] & (hands[:, 1:] == hands[:, :-1])).any(axis=1)
+        return (
+            ~has_duplicate_colored_card
+            & ((hands == MAGICIAN_ID).sum(axis=1) <= NUMBER_OF_MAGICIANS)
+            & ((hands == JESTER_ID).sum(axis=1) <= NUMBER_OF_JESTERS)
+        )
+
+
+@lru_cache
+def get_hand_canonicalizer(number_of_cards: int, trump_color: str = TRUMP_COLOR) -> HandCanonicalizer:
+    return HandCanonicalizer(number_of_cards=number_of_cards, trump_color=trump_color)
@@ -1,24 +1,31 @@
 import abc
+import functools
 import itertools
 from typing import List, Optional
 
 from config.common import BASE_COLORS, JESTER_NAME, MAGICIAN_NAME, TRUMP_COLOR
 from wizard.base_game.card import Card
 from wizard.base_game.deck import Deck
+from wizard.simulation.exhaustive.use_cases.hand_canonicalizer import (
+    MAX_CANONICALIZED_NUMBER_OF_CARDS,
+    HandCanonicalizer,
+    get_hand_canonicalizer,
+)
 from wizard.simulation.utils import iterator_to_list_of_list
 
 
 class HandCombinations(abc.ABC):
-    def __init__(self, deck: Optional[Deck] = None):
+    def __init__(self, deck: Optional[Deck] = None, trump_color: str = TRUMP_COLOR):
         self.deck = deck or Deck()
+        self.trump_color = trump_color
+        self.other_colors = [color for color in BASE_COLORS if color != trump_color]
 
     @abc.abstractmethod
     def build_all_possible_hand_combinations(self) -> List[List[Card]]:
         pass
 
-    @staticmethod
     @abc.abstractmethod
-    def list_cards_to_hand_combination(list_cards: List[Card]) -> List[Card]:
+    def list_cards_to_hand_combination(self, list_cards: List[Card]) -> List[Card]:
         pass
 
     @staticmethod
@@ -30,8 +37,7 @@ class HandCombinationsOneCard(HandCombinations):
     def build_all_possible_hand_combinations(self) -> List[List[Card]]:
         return [[card] for card in self.deck.cards]
 
-    @staticmethod
-    def list_cards_to_hand_combination(list_cards: List[Card]) -> List[Card]:
+    def list_cards_to_hand_combination(self, list_cards: List[Card]) -> List[Card]:
         return list_cards
 
 
@@ -56,25 +62,25 @@ class HandCombinationsTwoCards(HandCombinations):
 
     def _get_combinations_trump_joker(self) -> List[List[Card]]:
         only_trumps_and_joker = self.deck.filtered_cards(
-            colors=[TRUMP_COLOR], keep_joker=True, keep_joker_duplicates=False
+            colors=[self.trump_color], keep_joker=True, keep_joker_duplicates=False
         )
         return self._get_all_subset_size_n(list_cards=only_trumps_and_joker, n=2)
 
     def _get_combinations_one_trump_joker_one_other(self) -> List[List[Card]]:
         only_trumps_and_joker = self.deck.filtered_cards(
-            colors=[TRUMP_COLOR], keep_joker=True, keep_joker_duplicates=False
+            colors=[self.trump_color], keep_joker=True, keep_joker_duplicates=False
         )
         only_one_color = self.deck.filtered_cards(
-            colors=[BASE_COLORS[1]], keep_joker=False, keep_joker_duplicates=False
+            colors=[self.other_colors[0]], keep_joker=False, keep_joker_duplicates=False
         )
         return iterator_to_list_of_list(itertools.product(only_trumps_and_joker, only_one_color))
 
     def _get_combinations_two_others(self) -> List[List[Card]]:
         only_one_color = self.deck.filtered_cards(
-            colors=[BASE_COLORS[1]], keep_joker=False, keep_joker_duplicates=False
+            colors=[self.other_colors[0]], keep_joker=False, keep_joker_duplicates=False
         )
         only_one_other_color = self.deck.filtered_cards(
-            colors=[BASE_COLORS[2]], keep_joker=False, keep_joker_duplicates=False
+            colors=[self.other_colors[1]], keep_joker=False, keep_joker_duplicates=False
         )
 
         all_combinations_one_color_only = self._get_all_subset_size_n(list_cards=only_one_color, n=2)
@@ -89,42 +95,38 @@ class HandCombinationsTwoCards(HandCombinations):
         all_pairs_from_two_colors = iterator_to_list_of_list(itertools.product(one_color, other_color))
         return [pair for pair in all_pairs_from_two_colors if pair[0].number >= pair[1].number]
 
-    @staticmethod
-    def list_cards_to_hand_combination(list_cards: List[Card]) -> List[Card]:
+    def list_cards_to_hand_combination(self, list_cards: List[Card]) -> List[Card]:
         """
         Returns the associated hand combination of a list of cards in the SAME order
         :param list_cards:
         :return:
         """
-        first_card_is_trump_or_special = list_cards[0].color not in BASE_COLORS[1:]
-        second_card_is_trump_or_special = list_cards[1].color not in BASE_COLORS[1:]
-
-        if first_card_is_trump_or_special:
-            if second_card_is_trump_or_special:
-                return list_cards
-            return [
-                list_cards[0],
-                Card(color=BASE_COLORS[1], number=list_cards[1].number),
-            ]
-        if second_card_is_trump_or_special:
-            return [
-                Card(color=BASE_COLORS[1], number=list_cards[0].number),
-                list_cards[1],
-            ]
-        if list_cards[0].color == list_cards[1].color:
-            return [
-                Card(color=BASE_COLORS[1], number=list_cards[0].number),
-                Card(color=BASE_COLORS[1], number=list_cards[1].number),
-            ]
-        if list_cards[0].number >= list_cards[1].number:  # type: ignore
-            return [
-                Card(color=BASE_COLORS[1], number=list_cards[0].number),
-                Card(color=BASE_COLORS[2], number=list_cards[1].number),
-            ]
-        return [
-            Card(color=BASE_COLORS[2], number=list_cards[0].number),
-            Card(color=BASE_COLORS[1], number=list_cards[1].number),
-        ]
-
-
-IMPLEMENTED_COMBINATIONS = {1: HandCombinationsOneCard, 2: HandCombinationsTwoCards}
+        return get_hand_canonicalizer(number_of_cards=2, trump_color=self.trump_color).canonical_cards(list_cards)
+
+
+class HandCombinationsNCards(HandCombinations):
+    """One representative per color-isomorphism class of hands of number_of_cards cards"""
+
+    def __init__(self, number_of_cards: int, deck: Optional[Deck] = None, trump_color: str = TRUMP_COLOR):
+        super().__init__(deck=deck, trump_color=trump_color)
+        self.number_of_cards = number_of_cards
+
+    def build_all_possible_hand_combinations(self) -> List[List[Card]]:
+        return self._canonicalizer.representative_hands()
+
+    def list_cards_to_hand_combination(self, list_cards: List[Card]) -> List[Card]:
+        return self._canonicalizer.canonical_cards(list_cards)
+
+    @property
+    def _canonicalizer(self) -> HandCanonicalizer:
+        return get_hand_canonicalizer(number_of_cards=self.number_of_cards, trump_color=self.trump_color)
+
+
+IMPLEMENTED_COMBINATIONS = {
+    1: HandCombinationsOneCard,
+    2: HandCombinationsTwoCards,
+    **{
+        number_of_cards: functools.partial(HandCombinationsNCards, number_of_cards)
+        for number_of_cards in range(3, MAX_CANONICALIZED_NUMBER_OF_CARDS + 1)
+    },
+}
@@ -0,0 +1,204 @@
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Sequence, Type
+
+import numpy as np
+
+from project_path import ABS_PATH_PROJECT
+from wizard.base_game.batch_game import (
+    CARD_COLOR_INDEX_ARRAY,
+    DECK_TEMPLATE_IDS,
+    BatchGame,
+)
+from wizard.base_game.card import Card
+from wizard.base_game.card_id import NUMBER_OF_CARD_IDS
+from wizard.base_game.count_points import CountPoints
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG, GameConfig
+from wizard.base_game.player.card_play_policy import (
+    BaseCardPlayPolicy,
+    RandomCardPlayPolicy,
+)
+from wizard.base_game.random_streams import rng_or_default
+from wizard.simulation.exhaustive.use_cases.hand_canonicalizer import (
+    get_hand_canonicalizer,
+)
+
+NUMBER_OF_DEALS_PER_HAND = 1000
+BATCH_NUMBER_OF_GAMES = 100_000
+
+# Rank of every card of the deck template among the copies of its id, so that a hand holding c copies of an id
+# takes the c first ones
+_TEMPLATE_COPY_RANKS = np.array(
+    [(DECK_TEMPLATE_IDS[:slot] == card_id).sum() for slot, card_id in enumerate(DECK_TEMPLATE_IDS)], dtype=np.int64
+)
+
+
+class InvalidHandStrengthTable(Exception):
+    pass
+
+
+class HandStrengthTableNotFound(Exception):
+    pass
+
+
+class HandStrengthTable:
+    """
+    Distribution of the number of tricks won with every canonical hand at every position of the playing order, every
+    seat playing reference_card_play_policy: trick_distributions[class id, position, number of tricks won].
+    A prediction is then chosen from the hand alone, in one lookup.
+    """
+
+    def __init__(
+        self,
+        config: GameConfig,
+        trick_distributions: np.ndarray,
+        reference_card_play_policy: Type[BaseCardPlayPolicy] = RandomCardPlayPolicy,
+    ):
+        self.config = config
+        self.reference_card_play_policy = reference_card_play_policy
+        self._canonicalizer = get_hand_canonicalizer(config.number_of_cards_per_player, config.trump_color)
+        expected_shape = (
+            self._canonicalizer.number_of_classes,
+            config.number_of_players,
+            config.number_of_cards_per_player + 1,
+        )
+        if trick_distributions.shape != expected_shape:
+            raise InvalidHandStrengthTable(f"Shape {trick_distributions.shape} instead of {expected_shape}")
+        self.trick_distributions = trick_distributions
+        number_of_tricks = np.arange(config.number_of_cards_per_player + 1)
+        # scores[prediction, number of tricks won]
+        self._scores = CountPoints.count_points_arrays(number_of_tricks[:, None], number_of_tricks[None, :])
+
+    @classmethod
+    def build(
+        cls,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+        reference_card_play_policy: Type[BaseCardPlayPolicy] = RandomCardPlayPolicy,
+        number_of_deals_per_hand: int = NUMBER_OF_DEALS_PER_HAND,
+        rng: Optional[np.random.Generator] = None,
+    ) -> "HandStrengthTable":
+        """
+        Plays number_of_deals_per_hand random deals of the other hands for every class representative and position,
+        with BatchGame, many classes at once
+        """
+        rng = rng_or_default(rng)
+        canonicalizer = get_hand_canonicalizer(config.number_of_cards_per_player, config.trump_color)
+        trick_counts = np.zeros(
+            (canonicalizer.number_of_classes, config.number_of_players, config.number_of_cards_per_player + 1),
+            dtype=np.int64,
+        )
+        number_of_classes_per_batch = max(1, BATCH_NUMBER_OF_GAMES // number_of_deals_per_hand)
+        for position in range(config.number_of_players):
+            for first_class_id in range(0, canonicalizer.number_of_classes, number_of_classes_per_batch):
+                representatives = canonicalizer.representatives[
+                    first_class_id : first_class_id + number_of_classes_per_batch
+                ]
+                trick_counts[first_class_id : first_class_id + len(representatives), position] = _count_tricks_won(
+                    representatives, position, config, reference_card_play_policy, number_of_deals_per_hand, rng
+                )
+        return cls(
+            config,
+            trick_distributions=trick_counts / number_of_deals_per_hand,
+            reference_card_play_policy=reference_card_play_policy,
+        )
+
+    def trick_distribution(self, cards: Sequence[Card], position: int) -> np.ndarray:
+        return self.trick_distributions[self._canonicalizer.class_id(cards), position]
+
+    def expected_scores(self, cards: Sequence[Card], position: int) -> np.ndarray:
+        """Expected CountPoints score of every prediction, indexed by prediction"""
+        return self._scores @ self.trick_distribution(cards, position)
+
+
+def _count_tricks_won(
+    representatives: np.ndarray,
+    position: int,
+    config: GameConfig,
+    reference_card_play_policy: Type[BaseCardPlayPolicy],
+    number_of_deals_per_hand: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Counts of [representative, number of tricks won], the representative being held by seat 0"""
+    number_of_classes, number_of_cards_per_player = representatives.shape
+    # Deck template without the cards of each representative, the removed trump card then drawn among the others
+    copies_in_hand = (representatives[:, :, None] == np.arange(NUMBER_OF_CARD_IDS)).sum(axis=1)
+    is_in_deck = _TEMPLATE_COPY_RANKS >= copies_in_hand[:, DECK_TEMPLATE_IDS]
+    decks = np.broadcast_to(DECK_TEMPLATE_IDS, is_in_deck.shape)[is_in_deck].reshape(number_of_classes, -1)
+    decks = rng.permuted(np.repeat(decks, number_of_deals_per_hand, axis=0), axis=1)
+    number_of_games = len(decks)
+    games = np.arange(number_of_games)
+
+    is_trump = CARD_COLOR_INDEX_ARRAY[decks] == config.trump_color_index
+    ranks_among_trumps = rng.integers(is_trump.sum(axis=1))
+    removed_positions = (is_trump.cumsum(axis=1) > ranks_among_trumps[:, None]).argmax(axis=1)
+    trump_cards_removed = decks[games, removed_positions]
+    is_kept = np.ones(decks.shape, dtype=bool)
+    is_kept[games, removed_positions] = False
+    other_hands = decks[is_kept].reshape(number_of_games, -1)[
+        :, : (config.number_of_players - 1) * number_of_cards_per_player
+    ]
+
+    batch_game = BatchGame(
+        number_of_games=number_of_games,
+        card_play_policies=[reference_card_play_policy] * config.number_of_players,
+        rng=rng,
+        config=config,
+    )
+    batch_game.initialize_from_hands(
+        hands=np.concatenate([np.repeat(representatives, number_of_deals_per_hand, axis=0), other_hands], axis=1),
+        # Seat 0 plays at the given position of the first trick
+        starting_players=np.full(number_of_games, -position % config.number_of_players),
+        trump_cards_removed=trump_cards_removed,
+    )
+    batch_game.play_game()
+    class_indexes = np.repeat(np.arange(number_of_classes), number_of_deals_per_hand)
+    return np.bincount(
+        class_indexes * (number_of_cards_per_player + 1) + batch_game.number_of_turns_won[:, 0],
+        minlength=number_of_classes * (number_of_cards_per_player + 1),
+    ).reshape(number_of_classes, number_of_cards_per_player + 1)
+
+
+class HandStrengthTableStorage:
+    """Hand strength tables are plain .npy files of trick distributions, memory-mapped read-only"""
+
+    BASE_PATH = f"{ABS_PATH_PROJECT}/simulation_result/"
+
+    def save(self, hand_strength_table: HandStrengthTable) -> str:
+        path = self.path(hand_strength_table.config, hand_strength_table.reference_card_play_policy)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, hand_strength_table.trick_distributions, allow_pickle=False)
+        return path
+
+    def load(
+        self,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+        reference_card_play_policy: Type[BaseCardPlayPolicy] = RandomCardPlayPolicy,
+    ) -> Optional[HandStrengthTable]:
+        path = self.path(config, reference_card_play_policy)
+        if not os.path.exists(path):
+            return None
+        return HandStrengthTable(
+            config,
+            trick_distributions=np.load(path, mmap_mode="r", allow_pickle=False),
+            reference_card_play_policy=reference_card_play_policy,
+        )
+
+    def path(self, config: GameConfig, reference_card_play_policy: Type[BaseCardPlayPolicy]) -> str:
+        return (
+            f"{self.BASE_PATH}"
+            f"number_of_players={config.number_of_players}/"
+            f"number_cards_per_player={config.number_of_cards_per_player}/"
+            f"hand_strength_table/"
+            f"trump_color={config.trump_color}/"
+            f"{reference_card_play_policy.__name__}.npy"
+        )
+
+
+@lru_cache
+def get_hand_strength_table(config: GameConfig = DEFAULT_GAME_CONFIG) -> HandStrengthTable:
+    """Process-wide stored table against random play, built beforehand by build_hand_strength_table.py"""
+    hand_strength_table = HandStrengthTableStorage().load(config)
+    if hand_strength_table is None:
+        raise HandStrengthTableNotFound(HandStrengthTableStorage().path(config, RandomCardPlayPolicy))
+    return hand_strength_table
@@ -0,0 +1,177 @@
+import itertools
+from collections import Counter
+from dataclasses import dataclass
+from math import comb, factorial, prod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config.common import (
+    BASE_COLORS,
+    JESTER_NAME,
+    MAGICIAN_NAME,
+    NUMBER_OF_CARDS,
+    NUMBER_OF_JESTERS,
+    NUMBER_OF_MAGICIANS,
+    SUITS,
+    TRUMP_COLOR,
+)
+from wizard.base_game.card import Card
+
+
+@dataclass(frozen=True)
+class WeightedDeal:
+    hands: Tuple[Tuple[Card, ...], ...]  # One hand per opponent, in dealing order
+    probability: float
+
+
+@dataclass(frozen=True)
+class _CardType:
+    """Cards that are interchangeable for the outcome: special cards, or a run of numbers of one color
+    between two cards of the learning player"""
+
+    color: Optional[str]
+    special_card: Optional[str]
+    numbers: Tuple[int, ...]
+    copies: int
+
+    def card(self, rank: int) -> Card:
+        if self.special_card is not None:
+            return Card(special_card=self.special_card)
+        return Card(color=self.color, number=self.numbers[rank])
+
+
+class OpponentDeals:
+    """
+    Exact distribution of the opponents' hands once the learning player holds learning_player_cards,
+    following Game's dealing: one trump card is removed uniformly at random, then the opponents receive
+    consecutive slices of the shuffled deck.
+
+    Deals giving the same outcome whatever the playing orders are merged and their probabilities summed:
+    - only the relative order of cards of a same color matters, so opponent cards are described by the run of
+      numbers they fall in between two cards of the learning player and by their order within that run
+    - colors other than trump that are absent from the learning player hand are interchangeable
+    - the removed trump card is never played, it only weights a deal by the number of trumps left to remove
+    """
+
+    def __init__(
+        self,
+        learning_player_cards: Sequence[Card],
+        number_of_opponents: int,
+        number_of_cards_per_player: int,
+        trump_color: str = TRUMP_COLOR,
+    ):
+        self._learning_player_cards = list(learning_player_cards)
+        self._number_of_opponents = number_of_opponents
+        self._number_of_cards_per_player = number_of_cards_per_player
+        self._trump_color = trump_color
+        self._card_types = self._build_card_types()
+        self._interchangeable_colors = [
+            color
+            for color in BASE_COLORS
+            if color != trump_color and all(card.color != color for card in self._learning_player_cards)
+        ]
+
+    def enumerate(self) -> List[WeightedDeal]:
+        number_of_deals_per_canonical_deal: Dict[Tuple[Tuple[int, ...], ...], int] = Counter()
+        representatives: Dict[Tuple[Tuple[int, ...], ...], Tuple[Tuple[Card, ...], ...]] = {}
+        for hands, number_of_deals in self._enumerate_deal_patterns():
+            key, canonical_hands = self._canonicalize(hands)
+            number_of_deals_per_canonical_deal[key] += number_of_deals
+            representatives.setdefault(key, canonical_hands)
+
+        total_number_of_deals = self._total_number_of_deals()
+        return [
+            WeightedDeal(hands=representatives[key], probability=number_of_deals / total_number_of_deals)
+            for key, number_of_deals in number_of_deals_per_canonical_deal.items()
+        ]
+
+    def _build_card_types(self) -> List[_CardType]:
+        card_types = []
+        for special_card, number_of_copies in ((MAGICIAN_NAME, NUMBER_OF_MAGICIANS), (JESTER_NAME, NUMBER_OF_JESTERS)):
+            copies = number_of_copies - sum(card.special_card == special_card for card in self._learning_player_cards)
+            if copies:
+                card_types.append(_CardType(color=None, special_card=special_card, numbers=(), copies=copies))
+        for color in BASE_COLORS:
+            learning_player_numbers = {card.number for card in self._learning_player_cards if card.color == color}
+            for is_free, run in itertools.groupby(SUITS, key=lambda number: number not in learning_player_numbers):
+                if is_free:
+                    numbers = tuple(run)
+                    card_types.append(_CardType(color=color, special_card=None, numbers=numbers, copies=len(numbers)))
+        return card_types
+
+    def _enumerate_deal_patterns(self):
+        for type_indexes_per_hand in itertools.product(
+            itertools.combinations_with_replacement(range(len(self._card_types)), self._number_of_cards_per_player),
+            repeat=self._number_of_opponents,
+        ):
+            counts = Counter(itertools.chain.from_iterable(type_indexes_per_hand))
+            if any(count > self._card_types[type_index].copies for type_index, count in counts.items()):
+                continue
+            yield from self._expand_type_assignment(type_indexes_per_hand, counts)
+
+    def _expand_type_assignment(self, type_indexes_per_hand, counts: Counter):
+        # For each type, the hands holding its cards sorted by increasing number
+        orderings_per_type = []
+        number_of_deals = 1
+        for type_index, count in counts.items():
+            card_type = self._card_types[type_index]
+            hand_labels = [
+                hand
+                for hand, type_indexes in enumerate(type_indexes_per_hand)
+                for _ in range(type_indexes.count(type_index))
+            ]
+            if card_type.special_card is not None:
+                orderings_per_type.append([(type_index, tuple(hand_labels))])
+                copies_per_hand = Counter(hand_labels).values()
+                number_of_deals *= factorial(card_type.copies) // (
+                    prod(factorial(copies) for copies in copies_per_hand) * factorial(card_type.copies - count)
+                )
+            else:
+                orderings_per_type.append(
+                    [(type_index, ordering) for ordering in sorted(set(itertools.permutations(hand_labels)))]
+                )
+                number_of_deals *= comb(card_type.copies, count)
+
+        remaining_trump_cards = self._number_of_remaining_trump_cards
+        for orderings in itertools.product(*orderings_per_type):
+            hands: List[List[Card]] = [[] for _ in range(self._number_of_opponents)]
+            for type_index, ordering in orderings:
+                for rank, hand in enumerate(ordering):
+                    hands[hand].append(self._card_types[type_index].card(rank))
+            number_of_trump_cards_dealt = sum(card.color == self._trump_color for hand in hands for card in hand)
+            # The removed trump card must be one of the trump cards nobody received
+            if number_of_trump_cards_dealt < remaining_trump_cards:
+                yield hands, number_of_deals * (remaining_trump_cards - number_of_trump_cards_dealt)
+
+    def _canonicalize(self, hands: List[List[Card]]):
+        candidates = []
+        for permutation in itertools.permutations(self._interchangeable_colors):
+            color_mapping = dict(zip(self._interchangeable_colors, permutation))
+            relabeled_hands = tuple(
+                tuple(
+                    sorted(
+                        (
+                            (
+                                Card(color=color_mapping[card.color], number=card.number)
+                                if card.color in color_mapping
+                                else card
+                            )
+                            for card in hand
+                        ),
+                        key=lambda card: card.id,
+                    )
+                )
+                for hand in hands
+            )
+            candidates.append((tuple(tuple(card.id for card in hand) for hand in relabeled_hands), relabeled_hands))
+        return min(candidates, key=lambda candidate: candidate[0])
+
+    @property
+    def _number_of_remaining_trump_cards(self) -> int:
+        return len(SUITS) - sum(card.color == self._trump_color for card in self._learning_player_cards)
+
+    def _total_number_of_deals(self) -> int:
+        number_of_cards_left = NUMBER_OF_CARDS - len(self._learning_player_cards) - 1
+        return self._number_of_remaining_trump_cards * prod(
+            comb(number_of_cards_left - opponent * self._number_of_cards_per_player, self._number_of_cards_per_player)
+            for opponent in range(self._number_of_opponents)
+        )
@@ -0,0 +1,181 @@
+import itertools
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from wizard.base_game.batch_game import (
+    CARD_COLOR_INDEX_ARRAY,
+    TRICK_RANKS_BY_TRUMP_ARRAY,
+    playable_cards,
+)
+from wizard.base_game.card_id import NO_COLOR_INDEX
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG, GameConfig
+
+
+@dataclass(frozen=True)
+class PlayingOrderClass:
+    """
+    Priority combinations leading to the same cards being played: every combination taking for each player one of
+    its permutation_indexes_per_player
+    """
+
+    permutation_indexes_per_player: Tuple[Tuple[int, ...], ...]
+    number_of_turns_won: Tuple[int, ...]
+
+
+class PlayingOrdersEvaluator:
+    """
+    Plays every combination of card play priorities of a batch of deals at once, each player following its priority
+    like DefinedCardPlayPolicy does.
+    Combination k gives player p the priority permutations[permutation_indexes[k, p]] over the cards of its hand,
+    combinations being listed in the order of itertools.product(*(itertools.permutations(hand) for hand in hands)).
+    """
+
+    def __init__(self, config: GameConfig = DEFAULT_GAME_CONFIG):
+        self.number_of_players = config.number_of_players
+        self.number_of_cards_per_player = config.number_of_cards_per_player
+        self._trick_rank = TRICK_RANKS_BY_TRUMP_ARRAY[config.trump_color_index]
+        self.permutations = np.array(
+            list(itertools.permutations(range(self.number_of_cards_per_player))), dtype=np.int8
+        )
+        self.permutation_indexes = np.array(
+            list(itertools.product(range(len(self.permutations)), repeat=self.number_of_players)), dtype=np.int16
+        ).reshape(-1, self.number_of_players)
+        # priority_ranks[k, p, c]: position of card c of player p in its priority for combination k
+        self._priority_ranks = np.argsort(self.permutations, axis=1).astype(np.int8)[self.permutation_indexes]
+        # _first_choices[c, s, f]: permutation f ranks card c first among the cards of bitmask s
+        first_card_indexes = np.array(
+            [
+                [
+                    next((index for index in permutation if cards >> index & 1), -1)
+                    for permutation in self.permutations.tolist()
+                ]
+                for cards in range(1 << self.number_of_cards_per_player)
+            ]
+        )
+        self._first_choices = first_card_indexes[None] == np.arange(self.number_of_cards_per_player)[:, None, None]
+
+    @property
+    def number_of_combinations(self) -> int:
+        return len(self.permutation_indexes)
+
+    def tricks_won(self, hands: np.ndarray, starting_players: np.ndarray) -> np.ndarray:
+        """
+        hands: card ids of shape (number_of_deals, number_of_players, number_of_cards_per_player)
+        Returns the number of tricks won of shape (number_of_deals, number_of_combinations, number_of_players)
+        """
+        hands = np.asarray(hands, dtype=np.int8)
+        number_of_deals = hands.shape[0]
+        number_of_rows = number_of_deals * self.number_of_combinations
+        rows = np.arange(number_of_rows)
+        row_hands = np.repeat(hands, self.number_of_combinations, axis=0)
+        row_priority_ranks = np.tile(self._priority_ranks, (number_of_deals, 1, 1))
+        cards_in_hand = np.ones(row_hands.shape, dtype=bool)
+        starting = np.repeat(np.asarray(starting_players, dtype=np.int64), self.number_of_combinations)
+        number_of_turns_won = np.zeros((number_of_rows, self.number_of_players), dtype=np.int8)
+
+        for _ in range(self.number_of_cards_per_player):
+            lead_colors = np.full(number_of_rows, NO_COLOR_INDEX, dtype=np.int8)
+            cards_played_in_order = np.empty((number_of_rows, self.number_of_players), dtype=np.int8)
+            for card_position in range(self.number_of_players):
+                seats = (starting + card_position) % self.number_of_players
+                seat_hands = row_hands[rows, seats]
+                playable = playable_cards(seat_hands, cards_in_hand[rows, seats], lead_colors)
+                card_indexes = np.where(
+                    playable, row_priority_ranks[rows, seats], self.number_of_cards_per_player
+                ).argmin(axis=1)
+                cards_in_hand[rows, seats, card_indexes] = False
+                played_cards = seat_hands[rows, card_indexes]
+                cards_played_in_order[:, card_position] = played_cards
+                lead_colors = np.where(lead_colors == NO_COLOR_INDEX, CARD_COLOR_INDEX_ARRAY[played_cards], lead_colors)
+
+            winner_positions = self._trick_rank[lead_colors[:, None], cards_played_in_order].argmax(axis=1)
+            starting = (starting + winner_positions) % self.number_of_players
+            number_of_turns_won[rows, starting] += 1
+
+        return number_of_turns_won.reshape(number_of_deals, self.number_of_combinations, self.number_of_players)
+
+    def tricks_won_by_class(self, hands: np.ndarray, starting_players: np.ndarray) -> np.ndarray:
+        """
+        Same result as tricks_won, each class of equivalent priority combinations being played only once and then
+        copied to all of its combinations
+        """
+        number_of_deals = len(hands)
+        deals, consistent_permutations, class_number_of_turns_won = self._explore_plays(hands, starting_players)
+        # Combinations of a class are the product of its consistent permutations, built one player at a time
+        classes = np.arange(len(deals))
+        combinations = np.zeros(len(deals), dtype=np.int64)
+        for player in range(self.number_of_players):
+            parents, permutation_indexes = np.nonzero(consistent_permutations[classes, player])
+            classes = classes[parents]
+            combinations = combinations[parents] * len(self.permutations) + permutation_indexes
+
+        number_of_turns_won = np.empty(
+            (number_of_deals, self.number_of_combinations, self.number_of_players), dtype=np.int8
+        )
+        number_of_turns_won[deals[classes], combinations] = class_number_of_turns_won[classes]
+        return number_of_turns_won
+
+    def playing_order_classes(self, hands: Sequence[Sequence[int]], starting_player: int) -> List[PlayingOrderClass]:
+        _, consistent_permutations, number_of_turns_won = self._explore_plays([hands], [starting_player])
+        return [
+            PlayingOrderClass(
+                permutation_indexes_per_player=tuple(
+                    tuple(np.flatnonzero(mask).tolist()) for mask in class_consistent_permutations
+                ),
+                number_of_turns_won=tuple(class_turns_won.tolist()),
+            )
+            for class_consistent_permutations, class_turns_won in zip(consistent_permutations, number_of_turns_won)
+        ]
+
+    def _explore_plays(
+        self, hands: np.ndarray, starting_players: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Walks the tree of legal plays of every deal breadth first, a node only branching between the playable cards.
+        The permutations of a player consistent with a path are the ones ranking each card it chose first among the
+        cards it could play, so that each leaf is a class of priority combinations.
+        Returns for every class its deal, its consistent permutations per player and the number of tricks won.
+        """
+        hands = np.asarray(hands, dtype=np.int8)
+        deals = np.arange(len(hands))
+        starting = np.asarray(starting_players, dtype=np.int64)
+        cards_in_hand = np.ones(hands.shape, dtype=bool)
+        consistent_permutations = np.ones((len(hands), self.number_of_players, len(self.permutations)), dtype=bool)
+        number_of_turns_won = np.zeros((len(hands), self.number_of_players), dtype=np.int8)
+        card_bits = 1 << np.arange(self.number_of_cards_per_player)
+
+        for _ in range(self.number_of_cards_per_player):
+            lead_colors = np.full(len(deals), NO_COLOR_INDEX, dtype=np.int8)
+            cards_played_in_order = np.empty((len(deals), 0), dtype=np.int8)
+            for card_position in range(self.number_of_players):
+                seats = (starting + card_position) % self.number_of_players
+                seat_hands = hands[deals, seats]
+                playable = playable_cards(seat_hands, cards_in_hand[np.arange(len(deals)), seats], lead_colors)
+                parents, card_indexes = np.nonzero(playable)
+                playable_bits = playable[parents] @ card_bits
+
+                deals, seats, starting, lead_colors = (
+                    deals[parents],
+                    seats[parents],
+                    starting[parents],
+                    lead_colors[parents],
+                )
+                cards_played_in_order, number_of_turns_won = (
+                    cards_played_in_order[parents],
+                    number_of_turns_won[parents],
+                )
+                cards_in_hand, consistent_permutations = cards_in_hand[parents], consistent_permutations[parents]
+                rows = np.arange(len(deals))
+                cards_in_hand[rows, seats, card_indexes] = False
+                consistent_permutations[rows, seats] &= self._first_choices[card_indexes, playable_bits]
+                played_cards = seat_hands[parents, card_indexes]
+                cards_played_in_order = np.column_stack([cards_played_in_order, played_cards])
+                lead_colors = np.where(lead_colors == NO_COLOR_INDEX, CARD_COLOR_INDEX_ARRAY[played_cards], lead_colors)
+
+            winner_positions = self._trick_rank[lead_colors[:, None], cards_played_in_order].argmax(axis=1)
+            starting = (starting + winner_positions) % self.number_of_players
+            number_of_turns_won[np.arange(len(deals)), starting] += 1
+
+        return deals, consistent_permutations, number_of_turns_won
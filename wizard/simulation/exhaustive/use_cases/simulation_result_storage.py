@@ -1,18 +1,139 @@
+import dataclasses
+import json
 import os
-from enum import Enum
+import zipfile
 from pathlib import Path
+from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
-from config.common import NUMBER_OF_PLAYERS, NUMBER_OF_CARDS_PER_PLAYER
 from project_path import ABS_PATH_PROJECT
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG, GameConfig
 from wizard.simulation.exhaustive.constants import COMBINATION_INDEXES
-from wizard.simulation.exhaustive.simulation_result import SimulationResultMetadata
+from wizard.simulation.exhaustive.simulation_result import (
+    LEGACY_RESULT_EXTENSION,
+    RESULT_EXTENSION,
+    CombinationSimulationResults,
+    SimulationResultMetadata,
+    SimulationResultType,
+    most_relevant_surveyed_simulation_result_path,
+)
 
+METADATA_EXTENSION = ".json"
 
-class SimulationResultType(Enum):
-    ALL_OUTCOME = "all_outcome"
-    SURVEY = "survey"
+# How a column is stored: plain arrays, strings, or dicts sharing their keys stored as one 2D array
+ARRAY_COLUMN = "array"
+STRING_COLUMN = "string"
+DICT_COLUMN = "dict"
+
+
+class ColumnNotStored(Exception):
+    pass
+
+
+class ChunkNotMatchingColumns(Exception):
+    pass
+
+
+class SimulationResultWriter:
+    """
+    Writes a simulation result chunk by chunk in a .npz archive, one array per column and chunk, so that reading
+    a column never loads the others. Metadata and column layout go to a JSON sidecar written on close.
+    """
+
+    def __init__(
+        self, path: str, simulation_result_metadata: SimulationResultMetadata, simulation_type: SimulationResultType
+    ):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._path = path
+        self._simulation_result_metadata = simulation_result_metadata
+        self._simulation_type = simulation_type
+        self._archive = zipfile.ZipFile(path, mode="w", compression=zipfile.ZIP_STORED)
+        self._columns: Optional[Dict[str, dict]] = None
+        self._number_of_chunks = 0
+        self._number_of_rows = 0
+        # One entry per simulated copy of a combination, duplicated special cards sharing their representation
+        self._stopping_reasons: Dict[str, List[dict]] = {}
+
+    def __enter__(self) -> "SimulationResultWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, simulation_result: pd.DataFrame) -> None:
+        if not isinstance(simulation_result.index, pd.RangeIndex):
+            simulation_result = simulation_result.reset_index()
+        self._write_columns(
+            {column: simulation_result[column].to_numpy() for column in simulation_result.columns},
+            number_of_rows=len(simulation_result),
+        )
+
+    def write_combination_results(self, combination_simulation_results: CombinationSimulationResults) -> None:
+        # Same columns as a DataFrame of SimulationResult, without building the per-row dataclasses
+        results = combination_simulation_results
+        number_of_rows = len(results.trial_numbers)
+        self._write_columns(
+            {
+                "trial_number": results.trial_numbers,
+                "tested_combination": np.full(number_of_rows, results.tested_combination),
+                "combination_played_order": np.array(results.combination_played_orders, dtype=str).reshape(-1)[
+                    results.combination_played_order_indexes
+                ],
+                "number_of_turns_won": results.number_of_turns_won,
+                "weight": results.weights,
+            },
+            number_of_rows=number_of_rows,
+            dict_keys={"number_of_turns_won": results.player_identifiers},
+        )
+        if results.stopping_reason is not None:
+            self._stopping_reasons.setdefault(results.tested_combination, []).append(
+                {"stopping_reason": results.stopping_reason, "number_of_trials": results.number_of_trials}
+            )
+
+    def close(self) -> None:
+        if self._archive is None:
+            return
+        self._archive.close()
+        self._archive = None
+        with open(_metadata_path(self._path), "w") as metadata_file:
+            json.dump(
+                {
+                    "simulation_result_metadata": dataclasses.asdict(self._simulation_result_metadata),
+                    "simulation_type": self._simulation_type.value,
+                    "number_of_rows": self._number_of_rows,
+                    "number_of_chunks": self._number_of_chunks,
+                    "columns": self._columns or {},
+                    "stopping_reasons": self._stopping_reasons,
+                },
+                metadata_file,
+                indent=2,
+            )
+
+    def _write_columns(
+        self,
+        values_per_column: Dict[str, np.ndarray],
+        number_of_rows: int,
+        dict_keys: Optional[Dict[str, List]] = None,
+    ) -> None:
+        if number_of_rows == 0 and self._columns is not None:
+            return
+        encoded_columns = {
+            column: _encode_column(values, (dict_keys or {}).get(column))
+            for column, values in values_per_column.items()
+        }
+        columns = {column: layout for column, (_, layout) in encoded_columns.items()}
+        if self._columns is None:
+            self._columns = columns
+        elif columns != self._columns:
+            raise ChunkNotMatchingColumns
+
+        for column, (array, _) in encoded_columns.items():
+            with self._archive.open(_array_name(column, self._number_of_chunks), mode="w") as array_file:
+                np.lib.format.write_array(array_file, array, allow_pickle=False)
+        self._number_of_chunks += 1
+        self._number_of_rows += number_of_rows
 
 
 class SimulationResultStorage:
@@ -24,26 +145,39 @@ class SimulationResultStorage:
         simulation_result_metadata: SimulationResultMetadata,
         simulation_type: SimulationResultType,
     ):
-        path = self._get_path_from_metadata(simulation_result_metadata, simulation_type)
-        Path(path).parent.mkdir(parents=True, exist_ok=True)
-        simulation_result.to_csv(path)
+        with self.open_writer(simulation_result_metadata, simulation_type) as writer:
+            writer.write(simulation_result)
 
-    def read_given_simulation_result(
+    def open_writer(
         self, simulation_result_metadata: SimulationResultMetadata, simulation_type: SimulationResultType
+    ) -> SimulationResultWriter:
+        return SimulationResultWriter(
+            path=self._get_path_from_metadata(simulation_result_metadata, simulation_type),
+            simulation_result_metadata=simulation_result_metadata,
+            simulation_type=simulation_type,
+        )
+
+    def read_given_simulation_result(
+        self,
+        simulation_result_metadata: SimulationResultMetadata,
+        simulation_type: SimulationResultType,
+        columns: Optional[List[str]] = None,
     ):
-        return pd.read_csv(self._get_path_from_metadata(simulation_result_metadata, simulation_type))
+        return self._read(self._get_path_from_metadata(simulation_result_metadata, simulation_type), columns)
 
-    def read_most_relevant_surveyed_simulation_result_based_on_current_configuration(self, player_position: int):
-        folder_path = (
-            f"{self.BASE_PATH}"
-            f"number_of_players={NUMBER_OF_PLAYERS}/"
-            f"number_cards_per_player={NUMBER_OF_CARDS_PER_PLAYER}/"
-            f"learning_player_position={player_position}/"
-            f"{SimulationResultType.SURVEY.value}/"
+    def read_simulation_result_metadata(
+        self, simulation_result_metadata: SimulationResultMetadata, simulation_type: SimulationResultType
+    ) -> dict:
+        with open(_metadata_path(self._get_path_from_metadata(simulation_result_metadata, simulation_type))) as file:
+            return json.load(file)
+
+    def read_most_relevant_surveyed_simulation_result_based_on_current_configuration(
+        self, player_position: int, config: GameConfig = DEFAULT_GAME_CONFIG
+    ):
+        return self._set_surveyed_df_predictions_as_index(
+            self._read(most_relevant_surveyed_simulation_result_path(self.BASE_PATH, player_position, config)),
+            config.number_of_cards_per_player,
         )
-        file_paths = os.listdir(folder_path)
-        selected_file_path = max(file_paths, key=lambda file_path: int(file_path.split("_")[0]))
-        return self._set_surveyed_df_predictions_as_index(pd.read_csv(folder_path + selected_file_path))
 
     def _get_path_from_metadata(
         self, simulation_result_metadata: SimulationResultMetadata, simulation_type: SimulationResultType
@@ -55,15 +189,70 @@ class SimulationResultStorage:
             f"learning_player_position={simulation_result_metadata.learning_player_id}/"
             f"{simulation_type.value}/"
             f"{simulation_result_metadata.total_number_trial}_trials_"
-            f"id_{simulation_result_metadata.simulation_id}.csv"
+            f"id_{simulation_result_metadata.simulation_id}{RESULT_EXTENSION}"
         )
 
     @staticmethod
-    def _set_surveyed_df_predictions_as_index(df: pd.DataFrame):
+    def _read(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        legacy_path = str(Path(path).with_suffix(LEGACY_RESULT_EXTENSION))
+        if path.endswith(LEGACY_RESULT_EXTENSION) or (not os.path.exists(path) and os.path.exists(legacy_path)):
+            return pd.read_csv(legacy_path, usecols=columns)
+
+        with open(_metadata_path(path)) as metadata_file:
+            metadata = json.load(metadata_file)
+        stored_columns = metadata["columns"]
+        selected_columns = list(stored_columns) if columns is None else columns
+        for column in selected_columns:
+            if column not in stored_columns:
+                raise ColumnNotStored(column)
+
+        with np.load(path, allow_pickle=False) as archive:
+            return pd.DataFrame(
+                {
+                    column: _decode_column(
+                        [archive[_array_name(column, chunk)] for chunk in range(metadata["number_of_chunks"])],
+                        stored_columns[column],
+                    )
+                    for column in selected_columns
+                },
+                index=pd.RangeIndex(metadata["number_of_rows"]),
+            )
+
+    @staticmethod
+    def _set_surveyed_df_predictions_as_index(df: pd.DataFrame, number_of_cards_per_player: int):
         return pd.melt(
-            df.rename(columns={f"score_prediction_{i}": i for i in range(NUMBER_OF_CARDS_PER_PLAYER + 1)}),
+            df.rename(columns={f"score_prediction_{i}": i for i in range(number_of_cards_per_player + 1)}),
             id_vars=COMBINATION_INDEXES,
-            value_vars=range(NUMBER_OF_CARDS_PER_PLAYER + 1),
+            value_vars=range(number_of_cards_per_player + 1),
             var_name="prediction",
             value_name="score",
         ).set_index(COMBINATION_INDEXES + ["prediction"])
+
+
+def _metadata_path(path: str) -> str:
+    return str(Path(path).with_suffix(METADATA_EXTENSION))
+
+
+def _array_name(column: str, chunk: int) -> str:
+    # np.load exposes the entry without its .npy suffix
+    return f"{column}/{chunk:06d}.npy"
+
+
+def _encode_column(values: np.ndarray, dict_keys: Optional[List] = None):
+    if dict_keys is not None:
+        return np.asarray(values), {"kind": DICT_COLUMN, "keys": list(dict_keys)}
+    if values.dtype.kind in "OUT" and len(values) and isinstance(values[0], dict):
+        keys = list(values[0])
+        return np.array([[row[key] for key in keys] for row in values]), {"kind": DICT_COLUMN, "keys": keys}
+    if values.dtype.kind in "OUT":
+        return values.astype(str), {"kind": STRING_COLUMN}
+    return values, {"kind": ARRAY_COLUMN}
+
+
+def _decode_column(chunks: List[np.ndarray], layout: dict):
+    values = np.concatenate(chunks) if chunks else np.empty(0)
+    if layout["kind"] == DICT_COLUMN:
+        return [dict(zip(layout["keys"], row)) for row in values.tolist()]
+    if layout["kind"] == STRING_COLUMN:
+        return values.astype(object)
+    return values
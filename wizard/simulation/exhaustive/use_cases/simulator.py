@@ -1,19 +1,34 @@
 # mypy: disable-error-code="union-attr"
 import abc
+import contextlib
 import datetime as dt
 import itertools
-from copy import deepcopy
-from typing import List, Optional
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
 
-from config.common import NUMBER_OF_CARDS_PER_PLAYER
 from wizard.base_game.card import Card
 from wizard.base_game.deck import Deck
 from wizard.base_game.game import Game
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG, GameConfig
 from wizard.base_game.hand import Hand
 from wizard.base_game.player.player import DefinedStrategyPlayer
-from wizard.simulation.utils import iterator_to_list_of_list
+from wizard.base_game.random_streams import Seed, stream_generator, stream_seed_sequence
+from wizard.simulation.exhaustive.simulation_result import CombinationSimulationResults, SimulationResult
+from wizard.simulation.exhaustive.use_cases.adaptive_trials import (
+    AdaptiveTrials,
+    StoppingReason,
+    is_settled,
+    trial_scores,
+)
 from wizard.simulation.exhaustive.use_cases.hand_combinations import IMPLEMENTED_COMBINATIONS
-from wizard.simulation.exhaustive.simulation_result import SimulationResult
+from wizard.simulation.exhaustive.use_cases.opponent_deals import OpponentDeals
+from wizard.simulation.exhaustive.use_cases.playing_orders import PlayingOrdersEvaluator
+
+# Several shards per worker so that slow combinations do not leave the other workers idle at the end
+NUMBER_OF_SHARDS_PER_WORKER = 4
 
 
 class CombinationNotImplemented(Exception):
@@ -24,6 +39,10 @@ class LearningPlayerNotPlaying(Exception):
     pass
 
 
+class InitialTrialsExceedBudget(Exception):
+    pass
+
+
 class Simulator(abc.ABC):
     def __init__(
         self,
@@ -46,80 +65,258 @@ class SimulatorWithOneLearningPlayer(Simulator):
         learning_player: DefinedStrategyPlayer,
         initial_deck: Deck,
         number_trial_each_combination: int,
+        seed: Seed = None,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+        adaptive_trials: Optional[AdaptiveTrials] = None,
     ):
-        if NUMBER_OF_CARDS_PER_PLAYER not in IMPLEMENTED_COMBINATIONS:
+        if config.number_of_cards_per_player not in IMPLEMENTED_COMBINATIONS:
             raise CombinationNotImplemented
         if learning_player not in players:
             raise LearningPlayerNotPlaying
+        if adaptive_trials is not None and adaptive_trials.initial_number_of_trials > number_trial_each_combination:
+            raise InitialTrialsExceedBudget
         super().__init__(players=players, initial_deck=initial_deck)
         self._learning_player = learning_player
         self._number_trial_each_combination = number_trial_each_combination
-        self._hand_combinations_class = IMPLEMENTED_COMBINATIONS[NUMBER_OF_CARDS_PER_PLAYER]
+        self._seed = seed
+        self._config = config
+        self._adaptive_trials = adaptive_trials
+        self._hand_combinations_class = IMPLEMENTED_COMBINATIONS[config.number_of_cards_per_player]
+        self._playing_orders_evaluator = PlayingOrdersEvaluator(config=config)
 
-    def simulate(self):
-        result_logger: List[SimulationResult] = []
-        hand_combinations = self._hand_combinations_class(
-            deck=self._initial_deck
+    def simulate(self, number_of_workers: int = 1) -> List[SimulationResult]:
+        return [
+            result
+            for combination_result in self.iterate_combination_results(number_of_workers=number_of_workers)
+            for result in combination_result.to_simulation_results()
+        ]
+
+    def iterate_combination_results(self, number_of_workers: int = 1) -> Iterator[CombinationSimulationResults]:
+        """
+        Results of each combination as soon as they are available, in combination order, or with adaptive trials in
+        the order the combinations stop being sampled
+        """
+        indexed_combinations = list(enumerate(self._build_hand_combinations()))
+        if self._adaptive_trials is not None:
+            yield from self._iterate_adaptive_combination_results(indexed_combinations, number_of_workers)
+        elif number_of_workers > 1:
+            yield from self._simulate_combinations_in_parallel(indexed_combinations, number_of_workers)
+        else:
+            for combination_index, combination in indexed_combinations:
+                yield self._simulate_combination(combination_index, combination)
+
+    def _build_hand_combinations(self) -> List[List[Card]]:
+        return self._hand_combinations_class(
+            deck=self._initial_deck, trump_color=self._config.trump_color
         ).build_all_possible_hand_combinations()
-        for combination in hand_combinations:
-            deck = deepcopy(self._initial_deck)
-            deck.remove_cards(cards_to_remove=combination)
-            self._learning_player.receive_cards(combination)
-            for trial_number in range(self._number_trial_each_combination):
-                self._learning_player.reset_hand()
-                deck.shuffle()
-                game = Game()
-                game.initialize_game(
-                    deck=deck,
-                    players=self._players,
-                    starting_player=self._players[0],
-                )
-                self._simulate_all_outcome_one_round(
-                    game=game,
-                    trial_number=trial_number,
-                    result_logger=result_logger,
-                )
-                game.definition.deck.reset_deck()
-        return result_logger
 
-    def _simulate_all_outcome_one_round(self, game: Game, trial_number: int, result_logger: List[SimulationResult]):
-        all_playing_order_per_player: List[List[List[Card]]] = [
-            iterator_to_list_of_list(itertools.permutations(player.cards)) for player in self._players
+    def _simulate_combinations_in_parallel(
+        self, indexed_combinations: List[Tuple[int, List[Card]]], number_of_workers: int
+    ) -> Iterator[CombinationSimulationResults]:
+        with ProcessPoolExecutor(max_workers=number_of_workers) as executor:
+            for shard_results in executor.map(
+                self._simulate_combinations, _shards(indexed_combinations, number_of_workers)
+            ):
+                yield from shard_results
+
+    def _simulate_combinations(
+        self, indexed_combinations: List[Tuple[int, List[Card]]]
+    ) -> List[CombinationSimulationResults]:
+        return [
+            self._simulate_combination(combination_index, combination)
+            for combination_index, combination in indexed_combinations
         ]
-        all_playing_order: List[List[List[Card]]] = iterator_to_list_of_list(
-            itertools.product(*all_playing_order_per_player)
+
+    def _iterate_adaptive_combination_results(
+        self, indexed_combinations: List[Tuple[int, List[Card]]], number_of_workers: int
+    ) -> Iterator[CombinationSimulationResults]:
+        """
+        Rounds of batches over the combinations still sampled, each combination being yielded as soon as it stops.
+        Batches are drawn in combination order while the budget lasts, hence the budget saved on settled combinations
+        is spent on the unsettled ones.
+        """
+        adaptive_trials = self._adaptive_trials
+        remaining_budget = self._number_trial_each_combination * len(indexed_combinations)
+        batches: Dict[int, List[CombinationSimulationResults]] = {}
+        pending_batches = [
+            (combination_index, combination, 0, adaptive_trials.initial_number_of_trials)
+            for combination_index, combination in indexed_combinations
+        ]
+        remaining_budget -= adaptive_trials.initial_number_of_trials * len(pending_batches)
+        with (
+            ProcessPoolExecutor(max_workers=number_of_workers) if number_of_workers > 1 else contextlib.nullcontext()
+        ) as executor:
+            while pending_batches:
+                if executor is None:
+                    batch_results = self._simulate_batches(pending_batches)
+                else:
+                    batch_results = itertools.chain.from_iterable(
+                        executor.map(self._simulate_batches, _shards(pending_batches, number_of_workers))
+                    )
+                next_pending_batches = []
+                for (combination_index, combination, _, _), batch_result in zip(pending_batches, batch_results):
+                    batches.setdefault(combination_index, []).append(batch_result)
+                    combination_results = CombinationSimulationResults.concatenate(batches[combination_index])
+                    stopping_reason = self._stopping_reason(combination_results)
+                    if stopping_reason is None:
+                        number_of_trials = min(
+                            adaptive_trials.batch_number_of_trials,
+                            adaptive_trials.max_number_of_trials - combination_results.number_of_trials,
+                        )
+                        if number_of_trials > remaining_budget:
+                            stopping_reason = StoppingReason.BUDGET_EXHAUSTED
+                        else:
+                            remaining_budget -= number_of_trials
+                            next_pending_batches.append(
+                                (combination_index, combination, combination_results.number_of_trials, number_of_trials)
+                            )
+                    if stopping_reason is not None:
+                        del batches[combination_index]
+                        combination_results.stopping_reason = stopping_reason.value
+                        yield combination_results
+                pending_batches = next_pending_batches
+
+    def _stopping_reason(self, combination_results: CombinationSimulationResults) -> Optional[StoppingReason]:
+        scores = trial_scores(
+            combination_results,
+            learning_player_id=self._learning_player.identifier,
+            predictions=np.arange(self._config.number_of_cards_per_player + 1),
+        )
+        if is_settled(scores, z_score=self._adaptive_trials.z_score, tolerance=self._adaptive_trials.tolerance):
+            return StoppingReason.SETTLED
+        if combination_results.number_of_trials >= self._adaptive_trials.max_number_of_trials:
+            return StoppingReason.MAX_TRIALS_REACHED
+        return None
+
+    def _simulate_batches(self, batches: List[Tuple[int, List[Card], int, int]]) -> List[CombinationSimulationResults]:
+        return [
+            self._simulate_batch(combination_index, combination, first_trial_number, number_of_trials)
+            for combination_index, combination, first_trial_number, number_of_trials in batches
+        ]
+
+    def _simulate_batch(
+        self, combination_index: int, combination: List[Card], first_trial_number: int, number_of_trials: int
+    ) -> CombinationSimulationResults:
+        # Batches of a combination are children of its stream, indexed by their first trial, whoever simulates them
+        rng = stream_generator(stream_seed_sequence(self._seed, combination_index), first_trial_number)
+        return self._simulate_trials(
+            combination, rng, trial_numbers=np.arange(first_trial_number, first_trial_number + number_of_trials)
         )
-        for playing_order in all_playing_order:
-            self._simulate_one_outcome_one_round(
-                game=game,
-                playing_order=playing_order,
-                trial_number=trial_number,
-                result_logger=result_logger,
+
+    def _simulate_combination(self, combination_index: int, combination: List[Card]) -> CombinationSimulationResults:
+        # One stream per combination so that the draws depend neither on the other combinations nor on the sharding
+        return self._simulate_trials(
+            combination,
+            stream_generator(self._seed, combination_index),
+            trial_numbers=np.arange(self._number_trial_each_combination),
+        )
+
+    def _simulate_trials(
+        self, combination: List[Card], rng: np.random.Generator, trial_numbers: np.ndarray
+    ) -> CombinationSimulationResults:
+        deck = self._initial_deck.copy()
+        deck.rng = rng
+        deck.remove_cards(cards_to_remove=combination)
+        self._learning_player.receive_cards(combination)
+        hands = []
+        for _ in trial_numbers:
+            self._learning_player.reset_hand()
+            deck.shuffle()
+            game = Game(rng=rng, config=self._config)
+            game.initialize_game(
+                deck=deck,
+                players=self._players,
+                starting_player=self._players[0],
             )
+            hands.append([[card.id for card in player.cards] for player in self._players])
+            # Hands are read without being played, they must be emptied for the next dealing
+            for player in self._players:
+                player.drop_hand()
+            game.definition.deck.reset_deck()
+        return self._evaluate_playing_orders(
+            combination=combination,
+            hands=np.array(hands, dtype=np.int8),
+            trial_numbers=trial_numbers,
+            weights=np.ones(len(trial_numbers)),
+        )
+
+    def _evaluate_playing_orders(
+        self, combination: List[Card], hands: np.ndarray, trial_numbers: np.ndarray, weights: np.ndarray
+    ) -> CombinationSimulationResults:
+        # The learning player holds its cards in the order of combination, which indexes its priorities
+        number_of_trials = len(trial_numbers)
+        number_of_combinations = self._playing_orders_evaluator.number_of_combinations
+        learning_player_position = self._players.index(self._learning_player)
+        number_of_turns_won = self._playing_orders_evaluator.tricks_won_by_class(
+            hands=hands.reshape(number_of_trials, len(self._players), self._config.number_of_cards_per_player),
+            starting_players=np.zeros(number_of_trials, dtype=np.int64),
+        )
+        return CombinationSimulationResults(
+            tested_combination=Hand(cards=list(combination)).to_single_representation(sort=True),
+            combination_played_orders=[
+                Hand(cards=[combination[card_index] for card_index in permutation]).to_single_representation(sort=False)
+                for permutation in self._playing_orders_evaluator.permutations.tolist()
+            ],
+            player_identifiers=[player.identifier for player in self._players],
+            trial_numbers=np.repeat(trial_numbers, number_of_combinations).astype(np.int32),
+            combination_played_order_indexes=np.tile(
+                self._playing_orders_evaluator.permutation_indexes[:, learning_player_position], number_of_trials
+            ),
+            number_of_turns_won=number_of_turns_won.reshape(number_of_trials * number_of_combinations, -1),
+            weights=np.repeat(weights, number_of_combinations).astype(np.float64),
+        )
+
 
-    def _simulate_one_outcome_one_round(
+class ExactSimulatorWithOneLearningPlayer(SimulatorWithOneLearningPlayer):
+    """
+    Replaces the random trials by every distinct deal of the opponents, trial_number being the index of the deal
+    and weight its probability. Surveys then give the expected scores without sampling noise.
+    """
+
+    def __init__(
         self,
-        game: Game,
-        playing_order: List[List[Card]],
-        trial_number: int,
-        result_logger: List[SimulationResult],
+        players: List[DefinedStrategyPlayer],
+        learning_player: DefinedStrategyPlayer,
+        initial_deck: Deck,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
     ):
-        for i, player in enumerate(self._players):
-            player.provide_strategy(set_card_play_priority=playing_order[i])
-        game.reset_game()
-        game.play_game()
-        result_logger.append(
-            SimulationResult(
-                trial_number=trial_number,
-                tested_combination=Hand(
-                    cards=playing_order[self._players.index(self._learning_player)]
-                ).to_single_representation(sort=True),
-                combination_played_order=Hand(
-                    cards=playing_order[self._players.index(self._learning_player)]
-                ).to_single_representation(sort=False),
-                number_of_turns_won={
-                    player.identifier: game.state.number_of_turns_won[player] for player in self._players
-                },
-            )
+        super().__init__(
+            players=players,
+            learning_player=learning_player,
+            initial_deck=initial_deck,
+            number_trial_each_combination=0,
+            config=config,
         )
 
+    def _simulate_combination(self, combination_index: int, combination: List[Card]) -> CombinationSimulationResults:
+        opponent_deals = OpponentDeals(
+            learning_player_cards=combination,
+            number_of_opponents=len(self._players) - 1,
+            number_of_cards_per_player=self._config.number_of_cards_per_player,
+            trump_color=self._config.trump_color,
+        ).enumerate()
+        # The learning player keeps its seat, the opponents receive the hands of the deal in seating order
+        learning_player_position = self._players.index(self._learning_player)
+        hands = [
+            [
+                [card.id for card in hand]
+                for hand in (
+                    opponent_deal.hands[:learning_player_position]
+                    + (tuple(combination),)
+                    + opponent_deal.hands[learning_player_position:]
+                )
+            ]
+            for opponent_deal in opponent_deals
+        ]
+        return self._evaluate_playing_orders(
+            combination=combination,
+            hands=np.array(hands, dtype=np.int8),
+            trial_numbers=np.arange(len(opponent_deals)),
+            weights=np.array([opponent_deal.probability for opponent_deal in opponent_deals], dtype=np.float64),
+        )
+
+
+def _shards(items: list, number_of_workers: int) -> List[list]:
+    # Contiguous shards are mapped in order, hence the merged results come in the same order as a serial run
+    shard_size = math.ceil(len(items) / (number_of_workers * NUMBER_OF_SHARDS_PER_WORKER)) or 1
+    return [items[start : start + shard_size] for start in range(0, len(items), shard_size)]
@@ -0,0 +1,233 @@
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from project_path import ABS_PATH_PROJECT
+from wizard.base_game.card import Card
+from wizard.base_game.deck import Deck
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG, GameConfig
+from wizard.base_game.hand import Hand
+from wizard.simulation.exhaustive.simulation_result import (
+    most_relevant_surveyed_simulation_result_path,
+)
+from wizard.simulation.exhaustive.use_cases.hand_combinations import (
+    IMPLEMENTED_COMBINATIONS,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+NO_STRATEGY = -1
+SURVEY_SOURCES_EXTENSION = ".json"
+
+
+class StrategyNotFound(Exception):
+    pass
+
+
+class InvalidStrategyTable(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Strategy:
+    prediction: int
+    card_play_priority: Tuple[Card, ...]  # Cards of the player's hand, by decreasing priority
+
+
+def hand_key(cards: Sequence[Card]) -> Tuple[int, ...]:
+    return tuple(sorted(card.id for card in cards))
+
+
+def survey_source(base_path: str, position: int, config: GameConfig) -> Optional[Tuple[str, int]]:
+    """Survey read for the position, relative to base_path, with its modification time, None if nothing is surveyed"""
+    try:
+        path = most_relevant_surveyed_simulation_result_path(base_path, position, config)
+    except (FileNotFoundError, ValueError):
+        return None
+    return os.path.relpath(path, base_path), os.stat(path).st_mtime_ns
+
+
+def strategy_table_dtype(config: GameConfig) -> np.dtype:
+    """One record per hand combination, the layout only depending on the configuration"""
+    return np.dtype(
+        [
+            ("hand_key", np.int8, (config.number_of_cards_per_player,)),
+            ("best_predictions", np.int8, (config.number_of_players,)),
+            ("best_card_play_priorities", np.int8, (config.number_of_players, config.number_of_cards_per_player)),
+        ]
+    )
+
+
+class StrategyIndex:
+    """
+    Best surveyed strategy of every hand combination, compiled into arrays indexed by (hand id, position):
+    best_predictions[h, p] and best_card_play_priorities[h, p] holding the ids of the cards of the combination by
+    decreasing priority. The surveyed result of a position is read the first time the position is requested, unless
+    the index comes from a compiled strategy table. survey_sources[p] is the survey_source position p was read from.
+    """
+
+    def __init__(
+        self,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+        table: Optional[np.ndarray] = None,
+        survey_sources: Optional[List[Optional[Tuple[str, int]]]] = None,
+    ):
+        self.config = config
+        self.survey_sources = survey_sources or [None] * config.number_of_players
+        self._hand_combinations = IMPLEMENTED_COMBINATIONS[config.number_of_cards_per_player](
+            deck=Deck(shuffle=False), trump_color=config.trump_color
+        )
+        if table is None:
+            hand_keys = sorted(
+                {hand_key(hand) for hand in self._hand_combinations.build_all_possible_hand_combinations()}
+            )
+            table = np.full(len(hand_keys), NO_STRATEGY, dtype=strategy_table_dtype(config))
+            table["hand_key"] = hand_keys
+            self._loaded_positions: Set[int] = set()
+        else:
+            self._loaded_positions = set(range(config.number_of_players))
+        self.table = table
+        self.hand_ids: Dict[Tuple[int, ...], int] = {
+            tuple(key): hand_id for hand_id, key in enumerate(table["hand_key"].tolist())
+        }
+        self.best_predictions = table["best_predictions"]
+        self.best_card_play_priorities = table["best_card_play_priorities"]
+        self._strategies: Dict[Tuple[Tuple[Card, ...], int], Strategy] = {}
+
+    def compile(self) -> "StrategyIndex":
+        """Reads the surveyed result of every position not loaded yet"""
+        for position in range(self.config.number_of_players):
+            if position not in self._loaded_positions:
+                self._load_position(position)
+        return self
+
+    def strategy(self, cards: Sequence[Card], position: int) -> Strategy:
+        key = (tuple(cards), position)
+        strategy = self._strategies.get(key)
+        if strategy is None:
+            strategy = self._strategies[key] = self._compute_strategy(list(cards), position)
+        return strategy
+
+    def compile_position(self, surveyed_simulation_result: "pd.DataFrame", position: int) -> None:
+        """surveyed_simulation_result is indexed by tested_combination, combination_played_order and prediction"""
+        surveyed = surveyed_simulation_result.reset_index()
+        # First row of highest score of each combination, like idxmax on the combination rows
+        best_rows = surveyed.loc[surveyed.groupby("tested_combination", sort=False)["score"].idxmax()]
+        for tested_combination, combination_played_order, prediction in zip(
+            best_rows["tested_combination"], best_rows["combination_played_order"], best_rows["prediction"]
+        ):
+            hand_id = self.hand_ids[hand_key(Hand.from_single_representation(tested_combination).cards)]
+            self.best_predictions[hand_id, position] = prediction
+            self.best_card_play_priorities[hand_id, position] = [
+                card.id for card in Hand.from_single_representation(combination_played_order, sort=False).cards
+            ]
+        self._loaded_positions.add(position)
+        self._strategies = {key: value for key, value in self._strategies.items() if key[1] != position}
+
+    def _compute_strategy(self, cards: List[Card], position: int) -> Strategy:
+        if position not in self._loaded_positions:
+            self._load_position(position)
+        # The combination holds the cards of the hand up to a color relabelling, in the same order
+        hand_combination = self._hand_combinations.list_cards_to_hand_combination(cards)
+        hand_id = self.hand_ids.get(hand_key(hand_combination))
+        if hand_id is None or self.best_predictions[hand_id, position] == NO_STRATEGY:
+            raise StrategyNotFound(Hand(cards=list(hand_combination)).to_single_representation())
+
+        combination_card_ids = [card.id for card in hand_combination]
+        return Strategy(
+            prediction=int(self.best_predictions[hand_id, position]),
+            card_play_priority=tuple(
+                cards[combination_card_ids.index(card_id)]
+                for card_id in self.best_card_play_priorities[hand_id, position].tolist()
+            ),
+        )
+
+    def _load_position(self, position: int) -> None:
+        from wizard.simulation.exhaustive.use_cases.simulation_result_storage import (
+            SimulationResultStorage,
+        )
+
+        survey_source_before_reading = survey_source(SimulationResultStorage.BASE_PATH, position, self.config)
+        self.compile_position(
+            SimulationResultStorage().read_most_relevant_surveyed_simulation_result_based_on_current_configuration(
+                position, self.config
+            ),
+            position,
+        )
+        self.survey_sources[position] = survey_source_before_reading
+
+
+class StrategyTableStorage:
+    """
+    Compiled strategy tables are plain .npy files of strategy_table_dtype records, memory-mapped read-only so that
+    every worker process shares the same physical pages and never parses the surveyed results. The survey sources
+    of the table go to a JSON sidecar: a table compiled from other surveys than the current ones is stale.
+    """
+
+    BASE_PATH = f"{ABS_PATH_PROJECT}/simulation_result/"
+
+    def save(self, strategy_index: StrategyIndex) -> str:
+        path = self.path(strategy_index.config)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, strategy_index.table, allow_pickle=False)
+        with open(_survey_sources_path(path), "w") as survey_sources_file:
+            json.dump({"survey_sources": strategy_index.survey_sources}, survey_sources_file, indent=2)
+        return path
+
+    def load(self, config: GameConfig = DEFAULT_GAME_CONFIG) -> Optional[StrategyIndex]:
+        """None when no table is compiled or when it is stale"""
+        path = self.path(config)
+        if not os.path.exists(path):
+            return None
+        survey_sources = self._read_survey_sources(path, config)
+        if self.is_stale(survey_sources, config):
+            return None
+        table = np.load(path, mmap_mode="r", allow_pickle=False)
+        if table.dtype != strategy_table_dtype(config):
+            raise InvalidStrategyTable(path)
+        return StrategyIndex(config, table=table, survey_sources=survey_sources)
+
+    def is_stale(self, survey_sources: List[Optional[Tuple[str, int]]], config: GameConfig) -> bool:
+        """A position surveyed since the compilation makes the table stale, one no longer surveyed does not"""
+        for position, compiled_survey_source in enumerate(survey_sources):
+            current_survey_source = survey_source(self.BASE_PATH, position, config)
+            if current_survey_source is not None and current_survey_source != compiled_survey_source:
+                return True
+        return False
+
+    def path(self, config: GameConfig) -> str:
+        return (
+            f"{self.BASE_PATH}"
+            f"number_of_players={config.number_of_players}/"
+            f"number_cards_per_player={config.number_of_cards_per_player}/"
+            f"strategy_table/"
+            f"trump_color={config.trump_color}.npy"
+        )
+
+    @staticmethod
+    def _read_survey_sources(path: str, config: GameConfig) -> List[Optional[Tuple[str, int]]]:
+        # Tables compiled before their survey sources were recorded are treated as compiled from unknown surveys
+        if not os.path.exists(_survey_sources_path(path)):
+            return [None] * config.number_of_players
+        with open(_survey_sources_path(path)) as survey_sources_file:
+            survey_sources = json.load(survey_sources_file)["survey_sources"]
+        return [None if source is None else tuple(source) for source in survey_sources]
+
+
+@lru_cache
+def get_strategy_index(config: GameConfig = DEFAULT_GAME_CONFIG) -> StrategyIndex:
+    """
+    Process-wide index shared by every statistical policy of a configuration, from its compiled table if any and not
+    stale, otherwise from the surveys
+    """
+    return StrategyTableStorage().load(config) or StrategyIndex(config)
+
+
+def _survey_sources_path(path: str) -> str:
+    return str(Path(path).with_suffix(SURVEY_SOURCES_EXTENSION))
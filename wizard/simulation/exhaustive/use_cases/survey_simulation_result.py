@@ -1,11 +1,15 @@
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from config.common import NUMBER_OF_CARDS_PER_PLAYER
+from wizard.base_game.card_id import CARD_RANK
 from wizard.base_game.count_points import CountPoints
 from wizard.base_game.hand import Hand
-from wizard.simulation.exhaustive.constants import COMBINATION_INDEXES
+from wizard.simulation.exhaustive.simulation_result import CombinationSimulationResults
+
+CARD_RANK_BASE = max(CARD_RANK) + 1
 
 
 class SurveySimulationResult:
@@ -20,51 +24,142 @@ class SurveySimulationResult:
         self.number_of_cards_per_player = number_of_cards_per_player
 
     def compute_optimal_strategy(self):
-        return self._sort_per_combination(
-            pd.concat(
-                [
-                    self._evaluate_optimal_strategy_for_given_prediction(evaluated_prediction=prediction)
-                    .rename(columns={"score": f"score_prediction_{prediction}"})
-                    .set_index(COMBINATION_INDEXES)
-                    for prediction in self._evaluated_predictions
-                ],
-                axis=1,
-                join="inner",
-            ).reset_index()
-        ).set_index(["tested_combination"])
-
-    def _evaluate_optimal_strategy_for_given_prediction(self, evaluated_prediction: int):
-        simulation_results_with_score = self._simulation_results_with_score_for_given_prediction(
-            prediction=evaluated_prediction
+        tested_combination_codes, tested_combinations = pd.factorize(self.simulation_results["tested_combination"])
+        played_order_codes, played_orders = pd.factorize(self.simulation_results["combination_played_order"])
+        keys, key_codes = np.unique(
+            np.stack([tested_combination_codes, played_order_codes], axis=1), axis=0, return_inverse=True
         )
-        worst_outcome_per_trial_per_order = (
-            simulation_results_with_score.groupby(COMBINATION_INDEXES + ["trial_number"]).score.min().reset_index()
+        # Trials are weighted by their probability when opponent deals are enumerated exactly, and by 1 otherwise
+        weights = (
+            self.simulation_results["weight"].to_numpy(dtype=np.float64)
+            if "weight" in self.simulation_results
+            else np.ones(len(self.simulation_results))
         )
-
-        mean_worst_outcome_per_order = (
-            worst_outcome_per_trial_per_order.groupby(COMBINATION_INDEXES).score.mean().reset_index()
+        weighted_score_sums, weight_sums = weighted_worst_scores_per_key(
+            key_codes=key_codes.reshape(-1),
+            trial_numbers=self.simulation_results["trial_number"].to_numpy(),
+            number_of_turns_won=np.fromiter(
+                (row[self.learning_player_id] for row in self.simulation_results["number_of_turns_won"]),
+                dtype=np.int64,
+                count=len(self.simulation_results),
+            ),
+            weights=weights,
+            number_of_keys=len(keys),
+            predictions=self._evaluated_predictions,
+        )
+        return _survey_frame(
+            tested_combinations=np.asarray(tested_combinations, dtype=object)[keys[:, 0]],
+            played_orders=np.asarray(played_orders, dtype=object)[keys[:, 1]],
+            mean_scores=weighted_score_sums / weight_sums[:, None],
         )
 
-        return mean_worst_outcome_per_order
+    @property
+    def _evaluated_predictions(self) -> np.ndarray:
+        return np.arange(self.number_of_cards_per_player + 1)
 
-    def _simulation_results_with_score_for_given_prediction(self, prediction: int):
-        simulation_results = self.simulation_results.copy()
-        simulation_results["score"] = simulation_results["number_of_turns_won"].apply(
-            lambda row: CountPoints().count_points_single_prediction(
-                prediction=prediction, number_of_turns_won=row[self.learning_player_id]
-            ),
-        )
-        return simulation_results
 
-    @staticmethod
-    def _sort_per_combination(simulation_results: pd.DataFrame):
-        simulation_results["tested_combination_in_card_format"] = simulation_results["tested_combination"].apply(
-            lambda representation: Hand.from_single_representation(representation=representation).cards
+class StreamingSurveySimulationResult:
+    """
+    Same survey as SurveySimulationResult, reduced while the simulation runs: each CombinationSimulationResults is
+    folded into running sums per COMBINATION_INDEXES key and dropped, so that memory grows with the number of
+    combinations and not with the number of outcomes.
+    Every outcome of a trial must come in the same batch, which holds for the results of one combination.
+    """
+
+    def __init__(
+        self,
+        learning_player_id: int,
+        number_of_cards_per_player: Optional[int] = NUMBER_OF_CARDS_PER_PLAYER,
+    ):
+        self.learning_player_id = learning_player_id
+        self.number_of_cards_per_player = number_of_cards_per_player
+        self._predictions = np.arange(number_of_cards_per_player + 1)
+        self._weighted_score_sums: Dict[Tuple[str, str], np.ndarray] = {}
+        self._weight_sums: Dict[Tuple[str, str], float] = {}
+
+    def add(self, combination_simulation_results: CombinationSimulationResults) -> None:
+        results = combination_simulation_results
+        if not len(results.trial_numbers):
+            return
+        # Identical orders, e.g. with two magicians, are one key like in a groupby on the representations
+        played_orders, played_order_codes = np.unique(results.combination_played_orders, return_inverse=True)
+        row_orders = played_order_codes.reshape(-1)[results.combination_played_order_indexes]
+        weighted_score_sums, weight_sums = weighted_worst_scores_per_key(
+            key_codes=row_orders,
+            trial_numbers=results.trial_numbers,
+            number_of_turns_won=results.number_of_turns_won[
+                :, results.player_identifiers.index(self.learning_player_id)
+            ],
+            weights=results.weights,
+            number_of_keys=len(played_orders),
+            predictions=self._predictions,
         )
-        return simulation_results.sort_values("tested_combination_in_card_format", ascending=False).drop(
-            columns="tested_combination_in_card_format"
+        for order_code in np.unique(row_orders).tolist():
+            key = (results.tested_combination, str(played_orders[order_code]))
+            self._weighted_score_sums[key] = self._weighted_score_sums.get(key, 0.0) + weighted_score_sums[order_code]
+            self._weight_sums[key] = self._weight_sums.get(key, 0.0) + weight_sums[order_code]
+
+    def compute_optimal_strategy(self):
+        keys = sorted(self._weighted_score_sums)
+        return _survey_frame(
+            tested_combinations=np.array([key[0] for key in keys], dtype=object),
+            played_orders=np.array([key[1] for key in keys], dtype=object),
+            mean_scores=np.array([self._weighted_score_sums[key] / self._weight_sums[key] for key in keys]).reshape(
+                len(keys), len(self._predictions)
+            ),
         )
 
-    @property
-    def _evaluated_predictions(self):
-        return list(range(self.number_of_cards_per_player + 1))
\ No newline at end of file
+
+def weighted_worst_scores_per_key(
+    key_codes: np.ndarray,
+    trial_numbers: np.ndarray,
+    number_of_turns_won: np.ndarray,
+    weights: np.ndarray,
+    number_of_keys: int,
+    predictions: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scores every outcome for all predictions at once, keeps the worst one of each (key, trial) and sums it over the
+    trials of each key weighted by the trial weight.
+    Returns the weighted score sums of shape (number_of_keys, number_of_predictions) and the weight sums per key.
+    """
+    weighted_score_sums = np.zeros((number_of_keys, len(predictions)))
+    weight_sums = np.zeros(number_of_keys)
+    if not len(key_codes):
+        return weighted_score_sums, weight_sums
+
+    order = np.lexsort((trial_numbers, key_codes))
+    sorted_key_codes = key_codes[order]
+    sorted_trial_numbers = trial_numbers[order]
+    is_first_of_trial = np.ones(len(order), dtype=bool)
+    is_first_of_trial[1:] = (sorted_key_codes[1:] != sorted_key_codes[:-1]) | (
+        sorted_trial_numbers[1:] != sorted_trial_numbers[:-1]
+    )
+    trial_starts = np.flatnonzero(is_first_of_trial)
+
+    scores = CountPoints.count_points_arrays(predictions[None, :], number_of_turns_won[order][:, None])
+    worst_scores = np.minimum.reduceat(scores, trial_starts, axis=0)
+    trial_key_codes = sorted_key_codes[trial_starts]
+    trial_weights = weights[order][trial_starts]
+
+    np.add.at(weighted_score_sums, trial_key_codes, worst_scores * trial_weights[:, None])
+    weight_sums += np.bincount(trial_key_codes, weights=trial_weights, minlength=number_of_keys)
+    return weighted_score_sums, weight_sums
+
+
+def _survey_frame(tested_combinations: np.ndarray, played_orders: np.ndarray, mean_scores: np.ndarray):
+    survey = pd.DataFrame({"tested_combination": tested_combinations, "combination_played_order": played_orders})
+    for prediction in range(mean_scores.shape[1]):
+        survey[f"score_prediction_{prediction}"] = mean_scores[:, prediction]
+    # Strongest hands first, hands being compared card by card like lists of Card
+    combination_codes, unique_combinations = pd.factorize(survey["tested_combination"])
+    sort_keys = np.array([_hand_sort_key(representation) for representation in unique_combinations], dtype=np.int64)
+    order = np.argsort(-sort_keys[combination_codes], kind="stable")
+    return survey.iloc[order].set_index(["tested_combination"])
+
+
+def _hand_sort_key(representation: str) -> int:
+    sort_key = 0
+    for card in Hand.from_single_representation(representation=representation).cards:
+        sort_key = sort_key * CARD_RANK_BASE + CARD_RANK[card.id]
+    return sort_key
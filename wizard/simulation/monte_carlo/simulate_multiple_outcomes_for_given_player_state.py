@@ -1,14 +1,170 @@
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Type
+
+import numpy as np
+
+from wizard.base_game.bitboard import SLOT_CARD_ID
+from wizard.base_game.card import Card
+from wizard.base_game.count_points import CountPoints
 from wizard.base_game.game import Game
+from wizard.base_game.player.card_play_policy import (
+    BaseCardPlayPolicy,
+    RandomCardPlayPolicy,
+)
 from wizard.base_game.player.player import Player
+from wizard.base_game.random_streams import Seed, stream_generator
+from wizard.search.hidden_hand_sampler import HiddenHandSampler, NoConsistentDeal
+
+NUMBER_OF_DETERMINIZATIONS = 100
 
 
 class GameMustHaveBeenInitialized(Exception):
     pass
 
 
+class PlayerMustBeNextToPlay(Exception):
+    pass
+
+
+class NoConsistentDeterminization(Exception):
+    pass
+
+
+@dataclass
+class ActionOutcomes:
+    card: Card
+    number_of_rollouts: int
+    turns_won_distribution: np.ndarray  # Probability of each final number of turns won by the player
+    mean_score: float
+
+
 class SimulateMultipleOutcomesForGivenPlayerState:
-    def __init__(self, game: Game, learning_player: Player):
+    """
+    Evaluates every card the player can play from a mid-deal position. Each determinization deals the cards the
+    player has not seen to the other players, consistently with the colors they are known to miss, then every
+    action is rolled out on it until the end of the deal, with rollout_card_play_policy for all the players.
+    Determinization k draws from stream k of the seed, hence the outcomes do not depend on the number of workers.
+    """
+
+    def __init__(
+        self,
+        game: Game,
+        learning_player: Player,
+        number_of_determinizations: int = NUMBER_OF_DETERMINIZATIONS,
+        seed: Seed = None,
+        rollout_card_play_policy: Optional[Type[BaseCardPlayPolicy]] = RandomCardPlayPolicy,
+    ):
         if game.definition is None:
             raise GameMustHaveBeenInitialized
+        if game.next_player_playing is not learning_player:
+            raise PlayerMustBeNextToPlay
         self._game = game
         self._learning_player = learning_player
+        self._number_of_determinizations = number_of_determinizations
+        self._seed = seed
+        self._rollout_card_play_policy = rollout_card_play_policy
+        self._actions = list(dict.fromkeys(learning_player.card_play_policy(learning_player).playable_cards()))
+        self._hidden_hand_sampler = HiddenHandSampler.from_game(game, learning_player)
+
+    def execute(self, time_budget: Optional[float] = None, number_of_workers: int = 1) -> Dict[Card, ActionOutcomes]:
+        """
+        time_budget in seconds stops drawing new determinizations once elapsed, at least one being rolled out.
+        The game is left as it was given.
+        """
+        determinization_indexes = list(range(self._number_of_determinizations))
+        if number_of_workers > 1:
+            shard_size = math.ceil(len(determinization_indexes) / number_of_workers)
+            shards = [
+                determinization_indexes[start : start + shard_size]
+                for start in range(0, len(determinization_indexes), shard_size)
+            ]
+            with ProcessPoolExecutor(max_workers=number_of_workers) as executor:
+                turns_won_counts = sum(
+                    executor.map(self._roll_out_determinizations, shards, [time_budget] * len(shards))
+                )
+        else:
+            turns_won_counts = self._roll_out_determinizations(determinization_indexes, time_budget)
+        return self._to_action_outcomes(turns_won_counts)
+
+    def _roll_out_determinizations(
+        self, determinization_indexes: List[int], time_budget: Optional[float]
+    ) -> np.ndarray:
+        """Counts of [action, final number of turns won by the player] over the rolled out determinizations"""
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        turns_won_counts = np.zeros(
+            (len(self._actions), self._game.config.number_of_cards_per_player + 1), dtype=np.int64
+        )
+        players = self._game.definition.players
+        initial_snapshot = self._game.snapshot()
+        initial_policies = {player: (player.card_play_policy, player.rng) for player in players}
+        try:
+            for determinization_index in determinization_indexes:
+                if deadline is not None and turns_won_counts.any() and time.perf_counter() > deadline:
+                    break
+                rng = stream_generator(self._seed, determinization_index)
+                for player in players:
+                    player.rng = rng
+                    if self._rollout_card_play_policy is not None:
+                        player.card_play_policy = self._rollout_card_play_policy
+                self._game.restore(initial_snapshot)
+                self._deal_hidden_cards(rng)
+                determinized_snapshot = self._game.snapshot()
+                for action_index, action in enumerate(self._actions):
+                    self._game.restore(determinized_snapshot)
+                    turns_won_counts[action_index, self._roll_out(action)] += 1
+        finally:
+            self._game.restore(initial_snapshot)
+            for player, (card_play_policy, rng) in initial_policies.items():
+                player.card_play_policy, player.rng = card_play_policy, rng
+        return turns_won_counts
+
+    def _roll_out(self, action: Card) -> int:
+        terminal = self._game.get_to_next_play_afterstate_for_given_player(
+            self._learning_player, action=action.representation
+        )
+        if not terminal:
+            self._game.play_game()
+        return self._game.state.number_of_turns_won[self._learning_player]
+
+    def _deal_hidden_cards(self, rng: np.random.Generator) -> None:
+        try:
+            deal = self._hidden_hand_sampler.sample(rng, number_of_deals=1)[0]
+        except NoConsistentDeal as error:
+            raise NoConsistentDeterminization from error
+        for seat, player in enumerate(self._game.definition.players):
+            if player is not self._learning_player:
+                cards_already_played = self._cards_played_by(player)
+                player.cards = [
+                    Card.from_id(SLOT_CARD_ID[slot]) for slot in deal[self._hidden_hand_sampler.columns(seat)]
+                ]
+                player.initial_cards = cards_already_played + player.cards
+
+    def _cards_played_by(self, player: Player) -> List[Card]:
+        return [played_card.card for played_card in self._played_cards if played_card.player is player]
+
+    @property
+    def _played_cards(self):
+        state = self._game.state
+        return [
+            played_card for turn in state.previous_turns_history for played_card in turn
+        ] + state.round_specifics.turn_history
+
+    def _to_action_outcomes(self, turns_won_counts: np.ndarray) -> Dict[Card, ActionOutcomes]:
+        number_of_rollouts = turns_won_counts.sum(axis=1)
+        turns_won_distributions = turns_won_counts / number_of_rollouts[:, None]
+        prediction = self._game.state.predictions[self._learning_player]
+        scores = CountPoints.count_points_arrays(
+            np.full(turns_won_counts.shape[1], prediction), np.arange(turns_won_counts.shape[1])
+        )
+        return {
+            action: ActionOutcomes(
+                card=action,
+                number_of_rollouts=int(number_of_rollouts[action_index]),
+                turns_won_distribution=turns_won_distributions[action_index],
+                mean_score=float(turns_won_distributions[action_index] @ scores),
+            )
+            for action_index, action in enumerate(self._actions)
+        }
@@ -1,30 +1,34 @@
-from copy import deepcopy
-
 import numpy as np
 
-from config.common import NUMBER_OF_PLAYERS
 from wizard.base_game.count_points import CountPoints
 from wizard.base_game.deck import Deck
 from wizard.base_game.game import Game
+from wizard.base_game.game_config import DEFAULT_GAME_CONFIG, GameConfig
 from wizard.base_game.player.player import Player
 
 
 class SimulatePreDefinedGames:
     def __init__(
-        self, decks: list[Deck], players: list[Player], learning_player: Player, starting_player: Player | None
+        self,
+        decks: list[Deck],
+        players: list[Player],
+        learning_player: Player,
+        starting_player: Player | None,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
     ):
-        self._decks = deepcopy(decks)
+        self._decks = [deck.copy() for deck in decks]
         self._players = players
         self._learning_player = learning_player
         self._starting_player = starting_player
+        self._config = config
 
     def execute(self) -> float:
         rewards = []
         for i, deck in enumerate(self._decks):
             starting_player = (
-                self._starting_player if self._starting_player else self._players[i % NUMBER_OF_PLAYERS]
+                self._starting_player if self._starting_player else self._players[i % self._config.number_of_players]
             )  # Ensures no changes between different runs for static policies
-            game = Game()
+            game = Game(config=self._config)
             game.initialize_game(deck=deck, players=self._players, starting_player=starting_player, deterministic=True)
             game.request_predictions()
             game.play_game()